@@ -1,6 +1,9 @@
 import os
+import re
 import subprocess
 import shutil
+import hashlib
+from debugger import GdbSession, find_imported_calls, format_trace
 
 # Constants
 # Constants
@@ -8,6 +11,17 @@ SOURCE_FILE_C = "source_code/hello.c"
 SOURCE_FILE_JAVA = "source_code/Hello.java"
 GCC_CMD = "gcc"
 
+# "  3 .text  00000103  0000000000001040  0000000000001040  00001040  2**4" (objdump -h)
+_SECTION_RE = re.compile(r"^\s*\d+\s+(\S+)\s+([0-9a-fA-F]+)\s+([0-9a-fA-F]+)\s+[0-9a-fA-F]+\s+([0-9a-fA-F]+)\s+2\*\*\d+")
+
+def file_hash(path, chunk_size=1 << 20):
+    # Streamed SHA-1 of a file, used to tell whether an artifact changed
+    h = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
 class CompilerBackend:
     def __init__(self):
         # Check specific common paths FIRST to help user, then fallback to PATH
@@ -17,8 +31,14 @@ class CompilerBackend:
         self.java_path = shutil.which("javac")
         self.java_runtime = shutil.which("java")
         
+        self.gdb_path = shutil.which("gdb")
+        self.clang_path = shutil.which("clang") # Optional: only used for -ftime-trace
+        
         self.has_gcc = self.gcc_path is not None
         self.has_java = self.java_path is not None
+        self.has_gdb = self.gdb_path is not None
+        self.has_clang = self.clang_path is not None
+        self._gdb = None # Persistent GdbSession, started on first use
 
     def _add_common_paths(self):
         # Add common installation paths to env just in case
@@ -41,6 +61,9 @@ class CompilerBackend:
     def check_java(self):
         return self.has_java
 
+    def check_gdb(self):
+        return self.has_gdb
+
     def clean_artifacts(self):
         # Clean paths in source_code/ directory
         base = "source_code"
@@ -54,16 +77,55 @@ class CompilerBackend:
 
     def extract_strings(self, filename):
         if not os.path.exists(filename): return "File not found."
-        import re
         try:
-            with open(filename, "rb") as f:
-                data = f.read()
-            # Find ASCII strings > 4 chars
-            strings = re.findall(b"[ -~]{4,}", data)
-            return "\n".join([s.decode("utf-8", errors="ignore") for s in strings])
+            return "\n".join([s for _, s in self.iter_strings(filename)])
         except Exception as e:
             return f"Error extracting strings: {e}"
 
+    def iter_strings(self, filename, min_len=4):
+        # Yields (file offset, text) for every printable ASCII run
+        with open(filename, "rb") as f:
+            data = f.read()
+        # Find ASCII strings > 4 chars
+        for m in re.finditer(b"[ -~]{%d,}" % min_len, data):
+            yield m.start(), m.group().decode("utf-8", errors="ignore")
+
+    def section_table(self, filename):
+        # [{"name", "size", "vma", "offset", "contents"}] from objdump -h; [] if unavailable
+        success, out = self.run_cmd(f'objdump -h "{filename}"')
+        if not success: return []
+        sections = []
+        lines = out.splitlines()
+        for i, line in enumerate(lines):
+            m = _SECTION_RE.match(line)
+            if not m: continue
+            flags = lines[i + 1] if i + 1 < len(lines) else ""
+            sections.append({"name": m.group(1), "size": int(m.group(2), 16), "vma": int(m.group(3), 16),
+                             "offset": int(m.group(4), 16), "contents": "CONTENTS" in flags})
+        return sections
+
+    def debug_trace(self, exe):
+        # Same (success, text) contract as run_cmd
+        # STRICT MODE: No gdb -> fail with a message, caller falls back to a plain run
+        if not self.has_gdb:
+            return False, "ERROR: GDB is not installed or not found in PATH.\nPlease install GDB to attach the debugger."
+        if not os.path.exists(exe):
+            return False, f"Executable {exe} not found."
+
+        # Break on main plus every imported call (printf, puts, ...)
+        success, disasm = self.run_cmd(f"objdump -d {exe}")
+        breakpoints = ["main"] + (find_imported_calls(disasm) if success else [])
+
+        try:
+            if self._gdb is None: self._gdb = GdbSession(self.gdb_path)
+            trace = self._gdb.trace(exe, breakpoints)
+            return True, format_trace(trace)
+        except Exception as e:
+            # Session is in an unknown state; drop it so the next run respawns cleanly
+            if self._gdb: self._gdb.close()
+            self._gdb = None
+            return False, f"Debugger Error: {e}"
+
     def run_cmd(self, cmd, mock_preview=None, binary=False, filename=None):
         tool = cmd.split()[0].lower()
         
@@ -0,0 +1,256 @@
+import os
+import gc
+import sys
+import json
+import time
+import tempfile
+import statistics
+import subprocess
+
+# Micro-benchmark harness for the Execution steps. Every run is a fresh process with
+# its output discarded; per run we keep wall time, user/sys CPU and peak RSS.
+# Results are stored per lane (.bench.json in the workspace) to compare builds; the
+# launcher is built under <workspace>/.bench/ so it never sits among the user's sources.
+
+RUNS = 20
+WARMUP = 3
+HISTORY = 20  # Stored results per lane
+
+# Java steady state: a tiny harness calls main() repeatedly inside one JVM
+_HARNESS = "CompSimBench"
+_HARNESS_SRC = """import java.io.OutputStream;
+import java.io.PrintStream;
+import java.lang.reflect.Method;
+
+public class CompSimBench {
+    public static void main(String[] args) throws Exception {
+        if (args.length == 0) return; // Empty run = JVM start-up baseline
+        int n = Integer.parseInt(args[1]);
+        Method m = Class.forName(args[0]).getMethod("main", String[].class);
+        PrintStream out = System.out;
+        System.setOut(new PrintStream(OutputStream.nullOutputStream()));
+        long[] t = new long[n];
+        for (int i = 0; i < n; i++) {
+            long s = System.nanoTime();
+            m.invoke(null, (Object) new String[0]);
+            t[i] = System.nanoTime() - s;
+        }
+        System.setOut(out);
+        for (long x : t) out.println(x);
+    }
+}
+"""
+
+# POSIX launcher. Linux carries the parent's peak RSS over exec, so a child of this
+# (large) Python process would report at least our own footprint as its max RSS.
+# A tiny C launcher forks the program from a small address space instead.
+_RUNNER = "bench_runner"
+_RUNNER_SRC = """#include <stdio.h>
+#include <fcntl.h>
+#include <time.h>
+#include <unistd.h>
+#include <sys/wait.h>
+#include <sys/resource.h>
+
+int main(int argc, char **argv) {
+    struct timespec a, b;
+    struct rusage ru;
+    int status, code;
+    if (argc < 2) return 2;
+    clock_gettime(CLOCK_MONOTONIC, &a);
+    pid_t pid = fork();
+    if (pid == 0) {
+        int null = open("/dev/null", O_RDWR);
+        dup2(null, 0); dup2(null, 1); dup2(null, 2);
+        execvp(argv[1], argv + 1);
+        _exit(127);
+    }
+    if (pid < 0 || wait4(pid, &status, 0, &ru) < 0) return 2;
+    clock_gettime(CLOCK_MONOTONIC, &b);
+    code = WIFEXITED(status) ? WEXITSTATUS(status) : -WTERMSIG(status);
+    printf("%.9f %ld.%06ld %ld.%06ld %ld %d\\n", (b.tv_sec - a.tv_sec) + (b.tv_nsec - a.tv_nsec) / 1e9,
+           (long)ru.ru_utime.tv_sec, (long)ru.ru_utime.tv_usec, (long)ru.ru_stime.tv_sec, (long)ru.ru_stime.tv_usec,
+           ru.ru_maxrss, code);
+    return 0;
+}
+"""
+
+def build_runner(gcc, workspace_dir):
+    # Compiles the launcher once per workspace; None where it cannot be used
+    if os.name == 'nt' or not gcc: return None
+    directory = os.path.join(workspace_dir, ".bench")
+    os.makedirs(directory, exist_ok=True)
+    exe = os.path.join(directory, _RUNNER)
+    src = exe + ".c"
+    if os.path.exists(exe) and os.path.exists(src):
+        with open(src, "r") as f:
+            if f.read() == _RUNNER_SRC: return exe
+    with open(src, "w") as f: f.write(_RUNNER_SRC)
+    proc = subprocess.run([gcc, "-O2", src, "-o", exe], capture_output=True)
+    return exe if proc.returncode == 0 else None
+
+def _maxrss_kb(value):
+    return value // 1024 if sys.platform == "darwin" else value  # Bytes on macOS
+
+def run_once(cmd, runner=None):
+    # -> {"wall", "user", "sys", "rss_kb", "code"} (CPU/RSS None where the OS cannot tell)
+    if runner:
+        out = subprocess.run([runner] + list(cmd), stdin=subprocess.DEVNULL, capture_output=True, text=True).stdout.split()
+        if len(out) == 5:
+            return {"wall": float(out[0]), "user": float(out[1]), "sys": float(out[2]),
+                    "rss_kb": _maxrss_kb(int(out[3])), "code": int(out[4])}
+
+    startupinfo = None
+    if os.name == 'nt':
+        startupinfo = subprocess.STARTUPINFO()
+        startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
+        startupinfo.wShowWindow = subprocess.SW_HIDE
+
+    t0 = time.perf_counter()
+    proc = subprocess.Popen(cmd, stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL,
+                            stderr=subprocess.DEVNULL, startupinfo=startupinfo)
+    if hasattr(os, "wait4"):
+        # rusage of exactly this child, collected when it is reaped (RSS is an upper bound, see above)
+        _, status, ru = os.wait4(proc.pid, 0)
+        wall = time.perf_counter() - t0
+        proc.returncode = os.waitstatus_to_exitcode(status)
+        return {"wall": wall, "user": ru.ru_utime, "sys": ru.ru_stime, "rss_kb": _maxrss_kb(ru.ru_maxrss), "code": proc.returncode}
+
+    proc.wait()
+    wall = time.perf_counter() - t0
+    sample = {"wall": wall, "user": None, "sys": None, "rss_kb": None, "code": proc.returncode}
+    if os.name == 'nt': sample.update(_win_usage(proc))
+    return sample
+
+def _win_usage(proc):
+    # GetProcessTimes / GetProcessMemoryInfo on the (still open) process handle
+    import ctypes
+    from ctypes import wintypes
+
+    class PMC(ctypes.Structure):
+        _fields_ = [("cb", wintypes.DWORD), ("PageFaultCount", wintypes.DWORD),
+                    ("PeakWorkingSetSize", ctypes.c_size_t), ("WorkingSetSize", ctypes.c_size_t),
+                    ("QuotaPeakPagedPoolUsage", ctypes.c_size_t), ("QuotaPagedPoolUsage", ctypes.c_size_t),
+                    ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t), ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+                    ("PagefileUsage", ctypes.c_size_t), ("PeakPagefileUsage", ctypes.c_size_t)]
+    try:
+        handle = wintypes.HANDLE(int(proc._handle))
+        times = [wintypes.FILETIME() for _ in range(4)]
+        out = {}
+        if ctypes.windll.kernel32.GetProcessTimes(handle, *[ctypes.byref(t) for t in times]):
+            ft = lambda t: ((t.dwHighDateTime << 32) | t.dwLowDateTime) / 1e7
+            out["sys"], out["user"] = ft(times[2]), ft(times[3])
+        pmc = PMC()
+        pmc.cb = ctypes.sizeof(PMC)
+        if ctypes.windll.psapi.GetProcessMemoryInfo(handle, ctypes.byref(pmc), pmc.cb):
+            out["rss_kb"] = pmc.PeakWorkingSetSize // 1024
+        return out
+    except (AttributeError, OSError):
+        return {}
+
+
+def summarize(values):
+    # mean/median/stddev/min/max + Tukey outliers (outside 1.5 IQR)
+    vals = [v for v in values if v is not None]
+    if not vals: return None
+    s = sorted(vals)
+    q1, q3 = (statistics.quantiles(s, n=4)[0], statistics.quantiles(s, n=4)[2]) if len(s) >= 4 else (s[0], s[-1])
+    lo, hi = q1 - 1.5 * (q3 - q1), q3 + 1.5 * (q3 - q1)
+    return {"n": len(s), "mean": statistics.fmean(s), "median": statistics.median(s),
+            "stdev": statistics.stdev(s) if len(s) > 1 else 0.0, "min": s[0], "max": s[-1],
+            "outliers": [v for v in vals if v < lo or v > hi]}
+
+def benchmark(cmd, runs=RUNS, warmup=WARMUP, runner=None):
+    for _ in range(warmup): run_once(cmd, runner)  # Page cache, dynamic loader, CPU clocks
+    gc_was = gc.isenabled()
+    gc.disable()  # Keep the harness's own pauses out of the samples
+    try:
+        samples = [run_once(cmd, runner) for _ in range(runs)]
+    finally:
+        if gc_was: gc.enable()
+    return {"cmd": cmd, "runs": runs, "warmup": warmup, "isolated_rss": bool(runner) or os.name == 'nt',
+            "failed_runs": sum(1 for s in samples if s["code"] != 0),
+            "wall": summarize([s["wall"] for s in samples]), "user": summarize([s["user"] for s in samples]),
+            "sys": summarize([s["sys"] for s in samples]), "rss_kb": summarize([s["rss_kb"] for s in samples])}
+
+
+def benchmark_java(java, javac, class_dir, class_name, runs=RUNS, warmup=WARMUP, iterations=50, runner=None):
+    # Whole-process runs, plus JVM start-up (empty harness run) and steady-state main()
+    # time measured inside one warm JVM
+    result = benchmark([java, "-cp", class_dir, class_name], runs, warmup, runner)
+    with tempfile.TemporaryDirectory() as tmp:
+        src = os.path.join(tmp, _HARNESS + ".java")
+        with open(src, "w") as f: f.write(_HARNESS_SRC)
+        subprocess.run([javac, "-d", tmp, src], check=True, capture_output=True)
+        cp = os.pathsep.join([tmp, class_dir])
+
+        result["jvm_startup"] = benchmark([java, "-cp", cp, _HARNESS], runs, warmup, runner)["wall"]
+        out = subprocess.run([java, "-cp", cp, _HARNESS, class_name, str(iterations)],
+                             capture_output=True, text=True, check=True).stdout
+    times = [int(x) / 1e9 for x in out.split()]
+    skip = min(max(iterations // 5, 1), len(times) - 1)  # JIT warm-up iterations
+    result["first_call"] = times[0] if times else None
+    result["steady_state"] = summarize(times[skip:])
+    return result
+
+
+# --- History ---
+def _history_path(workspace_dir):
+    return os.path.join(workspace_dir, ".bench.json")
+
+def record(workspace_dir, lane, source_hash, binary_hash, result):
+    # Stores this result; returns the latest earlier one for a different build of the same source
+    path = _history_path(workspace_dir)
+    try:
+        with open(path, "r") as f: data = json.load(f)
+    except (OSError, ValueError):
+        data = {}
+    entries = data.setdefault(lane, [])
+    previous = next((e for e in reversed(entries) if e["source_hash"] == source_hash and e["binary_hash"] != binary_hash), None)
+    if previous is None:  # Same build benchmarked again: compare with that run instead
+        previous = next((e for e in reversed(entries) if e["source_hash"] == source_hash), None)
+    entries.append({"time": time.strftime("%Y-%m-%d %H:%M:%S"), "source_hash": source_hash,
+                    "binary_hash": binary_hash, "result": result})
+    data[lane] = entries[-HISTORY:]
+    tmp = path + ".tmp"
+    with open(tmp, "w") as f: json.dump(data, f)
+    os.replace(tmp, path)
+    return previous
+
+
+# --- Display ---
+def _row(label, st, scale=1e3, unit="ms"):
+    if not st: return f"  {label:<14} n/a"
+    out = f" ({len(st['outliers'])} outlier(s))" if st["outliers"] else ""
+    return (f"  {label:<14} mean {st['mean'] * scale:9.3f} {unit}  median {st['median'] * scale:9.3f}  "
+            f"stdev {st['stdev'] * scale:8.3f}  min {st['min'] * scale:9.3f}  max {st['max'] * scale:9.3f}{out}")
+
+def format_bench(result, previous=None):
+    lines = [f"Benchmark: {' '.join(result['cmd'])}",
+             f"{result['runs']} runs after {result['warmup']} warm-up run(s)"
+             + (f", {result['failed_runs']} exited non-zero" if result["failed_runs"] else ""), "",
+             _row("wall", result["wall"]), _row("user CPU", result["user"]), _row("sys CPU", result["sys"]),
+             _row("max RSS", result["rss_kb"], 1, "KB")]
+    if result["rss_kb"] and not result.get("isolated_rss"):
+        lines.append("  (max RSS includes the simulator's own footprint; no C compiler for the launcher)")
+
+    if "steady_state" in result:
+        lines += ["", "JVM split:", _row("start-up", result["jvm_startup"]),
+                  _row("steady main()", result["steady_state"])]
+        if result.get("first_call") is not None:
+            lines.append(f"  first main() call {result['first_call'] * 1e3:.3f} ms (class loading + interpreter)")
+
+    if previous:
+        was, now = previous["result"]["wall"], result["wall"]
+        diff = now["mean"] - was["mean"]
+        # Rough significance: difference beyond two standard errors
+        se = ((now["stdev"] ** 2) / now["n"] + (was["stdev"] ** 2) / was["n"]) ** 0.5
+        verdict = "faster" if diff < 0 else "slower"
+        verdict = verdict if abs(diff) > 2 * se else "no significant change"
+        same = " (same binary)" if previous.get("binary_hash") and previous["binary_hash"] == result.get("binary_hash") else ""
+        lines += ["", f"vs previous build ({previous['time']}){same}:",
+                  f"  wall mean {was['mean'] * 1e3:.3f} -> {now['mean'] * 1e3:.3f} ms "
+                  f"({diff * 1e3:+.3f} ms, {diff / was['mean'] * 100 if was['mean'] else 0:+.1f}%) - {verdict}"]
+    else:
+        lines += ["", "No earlier benchmark of this source to compare with."]
+    return "\n".join(lines)
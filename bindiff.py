@@ -0,0 +1,162 @@
+import os
+import sys
+import bisect
+import argparse
+import numpy as np
+
+# Byte-level compare of an original binary and its patched variant.
+# Both files are memory-mapped and compared chunk by chunk with NumPy, so there are
+# no per-byte Python loops and memory use stays flat for multi-hundred-MB files.
+
+CHUNK = 1 << 22  # 4 MB per vectorised compare (bounds the run arrays a dense diff makes)
+ROW = 16         # Bytes per hex view row
+MAX_RANGES = 256 # Ranges annotated and listed; the rest are only counted
+
+def _map(path):
+    # np.memmap cannot map empty files
+    if os.path.getsize(path) == 0: return np.zeros(0, dtype=np.uint8)
+    return np.memmap(path, dtype=np.uint8, mode="r")
+
+
+class SectionMap:
+    # File offset -> section name, from backend.section_table() rows
+    def __init__(self, sections):
+        rows = sorted((s["offset"], s["offset"] + s["size"], s["name"]) for s in sections if s["size"] and s["contents"])
+        self.starts = [r[0] for r in rows]
+        self.rows = rows
+        # Every section edge; offsets between the same two edges share a section
+        self.edges = np.unique(np.array([e for r in rows for e in r[:2]], dtype=np.int64))
+
+    def lookup(self, offset):
+        i = bisect.bisect_right(self.starts, offset) - 1
+        if i >= 0 and offset < self.rows[i][1]: return self.rows[i][2]
+        if not self.rows: return "(unknown)"  # No section table for this file
+        if offset < self.starts[0]: return "(headers)"
+        return "(no section)"
+
+    def slots(self, offsets):
+        # Vectorised: offsets -> ids that are equal only for offsets in the same section
+        return np.searchsorted(self.edges, offsets, side="right")
+
+
+def _merge(starts, ends, lens, smap, gap):
+    # Joins touching runs (split by a chunk edge), and runs less than gap bytes apart
+    # within one section -> (starts, ends, changed)
+    space = starts[1:] - ends[:-1]
+    join = (space == 0) | ((space < gap) & (smap.slots(starts[1:]) == smap.slots(ends[:-1] - 1)))
+    heads = np.flatnonzero(np.concatenate(([True], ~join)))
+    lasts = np.concatenate((heads[1:] - 1, [len(starts) - 1]))
+    return starts[heads], ends[lasts], np.add.reduceat(lens, heads)
+
+def diff_runs(original, patched, sections=(), gap=ROW, chunk=CHUNK):
+    # Returns (starts, ends, changed) int64 arrays: half-open ranges of differing bytes,
+    # with runs less than gap bytes apart in the same section merged (gap=1: exact runs).
+    # Bytes past the end of the shorter file count as one trailing run. Merging happens
+    # per chunk in NumPy, so a dense diff never becomes a per-byte Python list.
+    a, b = _map(original), _map(patched)
+    smap = SectionMap(sections)
+    common = min(len(a), len(b))
+    out, pending = [], None
+
+    def feed(starts, ends):
+        nonlocal pending
+        lens = ends - starts
+        if pending is not None:
+            # The last range of the previous chunk may continue into this one
+            starts, ends, lens = (np.concatenate(([p], x)) for p, x in zip(pending, (starts, ends, lens)))
+        starts, ends, lens = _merge(starts, ends, lens, smap, gap)
+        out.append((starts[:-1], ends[:-1], lens[:-1]))
+        pending = (starts[-1], ends[-1], lens[-1])
+
+    for lo in range(0, common, chunk):
+        hi = min(lo + chunk, common)
+        # +1 / -1 steps of the difference mask are where runs start / end
+        step = np.diff((a[lo:hi] != b[lo:hi]).view(np.int8), prepend=np.int8(0), append=np.int8(0))
+        starts = np.flatnonzero(step == 1) + lo
+        if len(starts): feed(starts, np.flatnonzero(step == -1) + lo)
+    if len(a) != len(b): feed(np.array([common]), np.array([max(len(a), len(b))]))
+    if pending is not None: out.append(tuple(np.array([x]) for x in pending))
+    if not out: return tuple(np.zeros(0, dtype=np.int64) for _ in range(3))
+    return tuple(np.concatenate([o[i] for o in out]).astype(np.int64) for i in range(3))
+
+
+def group_ranges(runs, sections=(), limit=MAX_RANGES):
+    # First `limit` runs from diff_runs as annotated ranges for display
+    smap = SectionMap(sections)
+    starts, ends, changed = (x[:limit].tolist() for x in runs)
+    return [{"start": s, "end": e, "section": smap.lookup(s), "changed": c} for s, e, c in zip(starts, ends, changed)]
+
+
+def _hex_row(data, off, mask):
+    # mask: set of in-row indices that differ
+    hexes = " ".join(f"{b:02x}" for b in data).ljust(ROW * 3 - 1)
+    text = "".join(chr(b) if 32 <= b < 127 else "." for b in data)
+    cols = [(i * 3, i * 3 + 2) for i in sorted(mask)]
+    return f"{off:08x}  {hexes}  {text}", cols
+
+def render_hex(original, patched, ranges, max_ranges=64, max_rows=8):
+    # Side-by-side hex dump ("-" original, "+" patched rows) of each range.
+    # Returns (text, marks) where marks are [line, col_start, col_end] spans of changed bytes.
+    a, b = _map(original), _map(patched)
+    lines, marks = [], []
+    prefix = len("- ") + len("00000000  ")
+
+    for r in ranges[:max_ranges]:
+        lines.append(f"@ {r['start']:#x}-{r['end']:#x} in {r['section']} ({r['changed']} byte(s) changed)")
+        row_lo = r["start"] - r["start"] % ROW
+        row_hi = min(r["end"], row_lo + max_rows * ROW)
+        for off in range(row_lo, row_hi, ROW):
+            old, new = bytes(a[off:off + ROW]), bytes(b[off:off + ROW])
+            mask = {i for i in range(max(len(old), len(new)))
+                    if i >= len(old) or i >= len(new) or old[i] != new[i]}
+            for sign, data in (("-", old), ("+", new)):
+                row, cols = _hex_row(data, off, {i for i in mask if i < len(data)})
+                marks.extend([len(lines), prefix + c0, prefix + c1] for c0, c1 in _merge_cols(cols))
+                lines.append(f"{sign} {row}")
+        if row_hi < r["end"]: lines.append(f"  ... {r['end'] - row_hi} more byte(s)")
+        lines.append("")
+
+    if len(ranges) > max_ranges: lines.append(f"... {len(ranges) - max_ranges} more range(s)")
+    return "\n".join(lines), marks
+
+def _merge_cols(cols):
+    # Adjacent changed bytes become one highlight span (covering the separating space)
+    out = []
+    for c0, c1 in cols:
+        if out and c0 - out[-1][1] <= 1: out[-1][1] = c1
+        else: out.append([c0, c1])
+    return out
+
+
+def format_ranges(ranges, runs, original, patched):
+    # Totals come from all runs; only the annotated ranges are listed
+    total = len(runs[0])
+    lines = [f"Binary diff: {os.path.basename(original)} -> {os.path.basename(patched)}",
+             f"{int(runs[2].sum())} byte(s) differ in {total} range(s)"]
+    for r in ranges:
+        lines.append(f"  {r['start']:#010x}-{r['end']:#010x}  {r['changed']:>6} byte(s)  {r['section']}")
+    if total > len(ranges): lines.append(f"  ... {total - len(ranges)} more range(s)")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Vectorised byte diff of two binaries.")
+    parser.add_argument("original")
+    parser.add_argument("patched")
+    parser.add_argument("--hex", action="store_true", help="Also print the hex view of each range")
+    args = parser.parse_args(argv)
+
+    if args.original.endswith(".class"):
+        from triage import class_sections
+        sections = class_sections(args.original)
+    else:
+        from backend import CompilerBackend
+        sections = CompilerBackend().section_table(args.original)
+    runs = diff_runs(args.original, args.patched, sections)
+    ranges = group_ranges(runs, sections)
+    print(format_ranges(ranges, runs, args.original, args.patched))
+    if args.hex: print("\n" + render_hex(args.original, args.patched, ranges)[0])
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
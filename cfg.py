@@ -0,0 +1,311 @@
+import os
+import re
+import sys
+import argparse
+import tempfile
+import subprocess
+
+# Control-flow graph recovery from streamed disassembly (objdump -d / javap -c).
+# Parsers consume one line at a time and hand back each function as soon as its
+# last instruction has been read, so callers can show results while the tool runs.
+#
+# Instruction tuple: (addr, kind, targets, line, callee) - line is the tool's own output line
+#   kind: "insn", "call", "jump" (unconditional), "cond", "switch", "ret"
+
+_OBJDUMP_FUNC_RE = re.compile(r"^([0-9a-fA-F]+) <(.+)>:$")
+_OBJDUMP_INSN_RE = re.compile(r"^\s*([0-9a-fA-F]+):\t[0-9a-fA-F ]+\t(.+)$")
+_X86_TARGET_RE = re.compile(r"^([0-9a-fA-F]+)\s*(?:<([^>]+)>)?")
+_X86_PREFIXES = {"bnd", "notrack", "rep", "repz", "repnz", "repe", "repne", "lock", "data16", "cs", "ds"}
+_X86_RET = {"ret", "retq", "retl", "retw", "hlt", "ud2", "iret", "iretq", "sysret"}
+
+# "  0000000000001139 l     F .text	000000000000000f              sq"
+_SYMTAB_RE = re.compile(r"^([0-9a-fA-F]+) (.{7}) (\S+)\t([0-9a-fA-F]+)\s+(?:\.hidden\s+)?(\S+)$")
+
+_JAVA_METHOD_RE = re.compile(r"^  (?!\s)(.*\)|static \{\})(?: throws [^;]+)?;")  # Name without the throws clause
+_JAVA_INSN_RE = re.compile(r"^\s+(\d+): (\w+)\s*(.*)$")
+_JAVA_CASE_RE = re.compile(r"^\s+(-?\d+|default): (\d+)$")
+_JAVA_CALLEE_RE = re.compile(r"// (?:Interface)?Method (\S+)")
+
+
+def _x86_insn(addr, text, line):
+    tokens = text.split()
+    while len(tokens) > 1 and tokens[0] in _X86_PREFIXES: tokens.pop(0)
+    mnem = tokens[0] if tokens else ""
+    operand = " ".join(tokens[1:])
+    m = _X86_TARGET_RE.match(operand)
+    target = int(m.group(1), 16) if m and not operand.startswith("*") else None
+
+    if mnem in _X86_RET: return (addr, "ret", [], line, None)
+    if mnem.startswith("call"): return (addr, "call", [], line, (m.group(2) if m else None) or operand)
+    if mnem in ("jmp", "jmpq", "ljmp"): return (addr, "jump", [target] if target is not None else [], line, None)
+    if mnem.startswith(("j", "loop")): return (addr, "cond", [target] if target is not None else [], line, None)
+    return (addr, "insn", [], line, None)
+
+def _java_insn(addr, op, rest, text):
+    if op.endswith("return") or op == "athrow": return (addr, "ret", [], text, None)
+    if op in ("goto", "goto_w"): return (addr, "jump", [int(rest.split()[0])], text, None)
+    if op.startswith("if") or op in ("jsr", "jsr_w"): return (addr, "cond", [int(rest.split()[0])], text, None)
+    if op in ("tableswitch", "lookupswitch"): return (addr, "switch", [], text, None)
+    if op.startswith("invoke"):
+        m = _JAVA_CALLEE_RE.search(rest)
+        return (addr, "call", [], text, m.group(1) if m else None)
+    return (addr, "insn", [], text, None)
+
+
+class Function:
+    def __init__(self, name, start):
+        self.name = name
+        self.start = start
+        self.insns = []
+        self.blocks = []  # [{"start", "end", "insns": [...], "succ": [(addr, label)]}]
+        self.calls = []
+
+    def finish(self):
+        # Basic blocks in one linear pass: leaders are the entry, every internal
+        # branch target, and every instruction after a branch or return.
+        insns = self.insns
+        if not insns: return self
+        addrs = {i[0] for i in insns}
+        leaders = {insns[0][0]}
+        for n, (addr, kind, targets, _, _) in enumerate(insns):
+            if kind in ("jump", "cond", "switch"):
+                leaders.update(t for t in targets if t in addrs)
+            if kind in ("jump", "cond", "switch", "ret") and n + 1 < len(insns):
+                leaders.add(insns[n + 1][0])
+
+        blocks, cur = [], None
+        for insn in insns:
+            if insn[0] in leaders:
+                cur = {"start": insn[0], "insns": [], "succ": []}
+                blocks.append(cur)
+            cur["insns"].append(insn)
+            if insn[1] == "call" and insn[4] and insn[4] not in self.calls: self.calls.append(insn[4])
+
+        for n, b in enumerate(blocks):
+            last = b["insns"][-1]
+            b["end"] = last[0]
+            nxt = blocks[n + 1]["start"] if n + 1 < len(blocks) else None
+            kind, targets = last[1], [t for t in last[2] if t in addrs]
+            if kind == "jump": b["succ"] = [(t, "jump") for t in targets]
+            elif kind == "cond": b["succ"] = [(t, "taken") for t in targets] + ([(nxt, "fall")] if nxt is not None else [])
+            elif kind == "switch": b["succ"] = [(t, "case") for t in dict.fromkeys(targets)]
+            elif kind != "ret" and nxt is not None: b["succ"] = [(nxt, "fall")]
+        self.blocks = blocks
+        return self
+
+
+class ObjdumpParser:
+    # feed(line) -> finished Function or None; close() flushes the last one
+    def __init__(self):
+        self.cur = None
+
+    def feed(self, line):
+        line = line.rstrip("\n")
+        m = _OBJDUMP_INSN_RE.match(line)
+        if m and self.cur is not None:
+            self.cur.insns.append(_x86_insn(int(m.group(1), 16), m.group(2), line))
+            return None
+        m = _OBJDUMP_FUNC_RE.match(line)
+        if m:
+            done = self.close()
+            self.cur = Function(m.group(2), int(m.group(1), 16))
+            return done
+        return None
+
+    def close(self):
+        done, self.cur = self.cur, None
+        return done.finish() if done else None
+
+
+class JavapParser:
+    def __init__(self):
+        self.cur = None
+        self.switch = None  # Targets list of the switch being read
+
+    def feed(self, line):
+        line = line.rstrip("\n")
+        if self.switch is not None:
+            m = _JAVA_CASE_RE.match(line)
+            if m:
+                self.switch.append(int(m.group(2)))
+                return None
+            if line.strip() == "}": self.switch = None
+            return None
+        m = _JAVA_INSN_RE.match(line)
+        if m and self.cur is not None:
+            insn = _java_insn(int(m.group(1)), m.group(2), m.group(3), line)
+            self.cur.insns.append(insn)
+            if insn[1] == "switch": self.switch = insn[2]
+            return None
+        m = _JAVA_METHOD_RE.match(line)
+        if m:
+            done = self.close()
+            self.cur = Function(m.group(1), 0)
+            return done
+        return None
+
+    def close(self):
+        done, self.cur = self.cur, None
+        return done.finish() if done else None
+
+
+# --- Streaming tools ---
+def _stream(cmd):
+    startupinfo = None
+    if os.name == 'nt':
+        startupinfo = subprocess.STARTUPINFO()
+        startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
+        startupinfo.wShowWindow = subprocess.SW_HIDE
+    # stderr goes to a temp file so a chatty tool cannot block on a full pipe
+    with tempfile.TemporaryFile() as err:
+        proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=err, text=True,
+                                errors="replace", bufsize=1 << 16, startupinfo=startupinfo)
+        try:
+            for line in proc.stdout: yield line
+        finally:
+            proc.stdout.close()
+            proc.wait()
+        # Only reached when the whole stream was read
+        if proc.returncode != 0:
+            err.seek(0)
+            msg = err.read().decode(errors="replace").strip()
+            raise RuntimeError(msg or f"{cmd[0]} exited with status {proc.returncode}")
+
+def iter_functions(lines, parser):
+    # Turns a line stream into a stream of finished Functions
+    for line in lines:
+        done = parser.feed(line)
+        if done: yield done
+    done = parser.close()
+    if done: yield done
+
+
+def list_functions(backend, exe):
+    # Function symbols with [start, stop) from objdump -t, before any disassembly.
+    # Symbols without a size end at the next function (or their section's end).
+    # Returns [] when the table has no usable symbols (e.g. stripped or PE), so callers
+    # fall back to streaming the whole disassembly.
+    success, out = backend.run_cmd(f'objdump -t "{exe}"')
+    if not success: return []
+    ends = {s["name"]: s["vma"] + s["size"] for s in backend.section_table(exe)}
+    syms = []
+    for line in out.splitlines():
+        m = _SYMTAB_RE.match(line)
+        if not m or "F" not in m.group(2) or m.group(3).startswith("*"): continue
+        syms.append({"name": m.group(5), "start": int(m.group(1), 16), "size": int(m.group(4), 16), "section": m.group(3)})
+    syms.sort(key=lambda s: s["start"])
+
+    funcs = []
+    for n, s in enumerate(syms):
+        stop = s["start"] + s["size"]
+        if not s["size"]:
+            later = [t["start"] for t in syms[n + 1:] if t["section"] == s["section"] and t["start"] > s["start"]]
+            stop = later[0] if later else ends.get(s["section"], s["start"])
+        if stop > s["start"]: funcs.append({"name": s["name"], "start": s["start"], "stop": stop, "section": s["section"]})
+    return funcs
+
+def disassemble_function(backend, exe, func):
+    # Lazily disassembles just [start, stop) of one function
+    if not backend.has_gcc: raise RuntimeError("GCC (MinGW) is not installed or not found in PATH.")
+    cmd = ["objdump", "-d", f"--start-address={func['start']:#x}", f"--stop-address={func['stop']:#x}", exe]
+    found = None
+    for f in iter_functions(_stream(cmd), ObjdumpParser()):
+        if found is None: found = f
+        else: found.insns.extend(f.insns)  # Local labels split one symbol into several headers
+    if found is None: found = Function(func["name"], func["start"])
+    found.name = func["name"]
+    found.blocks, found.calls = [], []
+    return found.finish()
+
+def stream_objdump(backend, exe):
+    if not backend.has_gcc: raise RuntimeError("GCC (MinGW) is not installed or not found in PATH.")
+    return iter_functions(_stream(["objdump", "-d", exe]), ObjdumpParser())
+
+def stream_javap(backend, class_dir, class_name):
+    if not backend.has_java: raise RuntimeError("Java Development Kit (JDK) is not installed or not found in PATH.")
+    return iter_functions(_stream(["javap", "-c", "-p", "-cp", class_dir, class_name]), JavapParser())
+
+
+# --- Rendering ---
+def format_function_list(funcs, cfgs, hex_addrs=True):
+    # funcs: [{"name", "start", ...}] ; cfgs: name -> Function
+    lines = [f"Functions ({len(funcs)})  -- click a name to jump", ""]
+    lines.extend(function_row(f, cfgs.get(f["name"]), hex_addrs) for f in funcs)
+    return lines
+
+def function_row(f, g, hex_addrs=True):
+    where = f"{f['start']:#08x}" if hex_addrs else ""
+    size = f"{f['stop'] - f['start']:>6} B" if "stop" in f else ""
+    stats = f"{len(g.insns):>5} insns {len(g.blocks):>3} blocks" if g else "  (not disassembled, click to load)"
+    return f"  {f['name'][:32]:<32} {where} {size} {stats}".rstrip()
+
+def render_cfgs(funcs, cfgs, hex_addrs=True):
+    # -> (text, anchors, lazy): anchors = [[line, target_line]] (list entries and CFG edges),
+    #    lazy = [[line, func index]] list entries whose function is not disassembled yet
+    lines = format_function_list(funcs, cfgs, hex_addrs)
+    lines.append("")
+    anchors, lazy = [], []
+    entry = {}
+    for f in funcs:
+        g = cfgs.get(f["name"])
+        if not g: continue
+        entry[f["name"]] = len(lines)
+        body, links = render_function(g, hex_addrs, len(lines))
+        lines.extend(body)
+        anchors.extend(links)
+
+    # Function list rows sit right after the two header lines
+    for n, f in enumerate(funcs):
+        if f["name"] in entry: anchors.append([2 + n, entry[f["name"]]])
+        else: lazy.append([2 + n, n])
+    return "\n".join(lines), anchors, lazy
+
+def render_function(g, hex_addrs=True, first_line=0):
+    # -> (lines, anchors); anchors link each edge line to its target block header
+    fmt = (lambda a: f"{a:#x}") if hex_addrs else str
+    lines = [f"== {g.name} @ {fmt(g.start)}  ({len(g.insns)} insns, {len(g.blocks)} blocks"
+             + (f", calls: {', '.join(g.calls[:8])}" if g.calls else "") + ") =="]
+    ids = {b["start"]: n for n, b in enumerate(g.blocks)}
+    headers, edges = {}, []
+    for n, b in enumerate(g.blocks):
+        headers[b["start"]] = first_line + len(lines)
+        lines.append(f"B{n}  [{fmt(b['start'])}..{fmt(b['end'])}]  {len(b['insns'])} insns")
+        lines.extend(i[3] for i in b["insns"])
+        for addr, label in b["succ"]:
+            edges.append((first_line + len(lines), addr))
+            lines.append(f"    -> B{ids[addr]} ({label})")
+        if not b["succ"]: lines.append("    -> (exit)")
+    lines.append("")
+    return lines, [[line, headers[addr]] for line, addr in edges]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Recover per-function control-flow graphs from a binary or class.")
+    parser.add_argument("target", help="Executable, or a .class file")
+    parser.add_argument("-f", "--function", help="Only this function (lazy per-function disassembly)")
+    args = parser.parse_args(argv)
+
+    from backend import CompilerBackend
+    bk = CompilerBackend()
+    try:
+        if args.target.endswith(".class"):
+            stream = stream_javap(bk, os.path.dirname(args.target) or ".", os.path.splitext(os.path.basename(args.target))[0])
+        else:
+            funcs = list_functions(bk, args.target)
+            if funcs:
+                # Function list first, then each CFG as it is disassembled
+                print("\n".join(format_function_list(funcs, {})) + "\n", flush=True)
+                if args.function: funcs = [f for f in funcs if f["name"] == args.function]
+                stream = (disassemble_function(bk, args.target, f) for f in funcs)
+            else:
+                stream = stream_objdump(bk, args.target)
+        for g in stream:
+            if args.function and g.name != args.function: continue
+            print("\n".join(render_function(g, not args.target.endswith(".class"))[0]), flush=True)
+    except RuntimeError as e:
+        print(f"ERROR: {e}")
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
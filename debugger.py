@@ -0,0 +1,295 @@
+import os
+import re
+import time
+import queue
+import codecs
+import tempfile
+import threading
+import subprocess
+try:
+    import pty  # POSIX only
+except ImportError:
+    pty = None
+
+# --- GDB/MI Parser ---
+# Records look like:  [token]^done,name="value",frame={...}  /  *stopped,...  /  ~"console text"
+# Values are c-strings, tuples {..} or lists [..]. The parser is a single forward pass
+# over the line with precompiled regexes, so multi-KB register dumps stay cheap.
+
+_CSTRING_RE = re.compile(r'"((?:[^"\\]|\\.)*)"')
+_NAME_RE = re.compile(r'[A-Za-z_][\w\-]*')
+_RECORD_RE = re.compile(r'(\d*)([\^*+=])([\w\-]+)')
+
+def _unescape(s):
+    if "\\" not in s: return s
+    return codecs.escape_decode(s.encode("utf-8"))[0].decode("utf-8", errors="replace")
+
+def _parse_value(s, i):
+    c = s[i]
+    if c == '"':
+        m = _CSTRING_RE.match(s, i)
+        if not m: raise ValueError(f"Bad c-string at {i}")
+        return _unescape(m.group(1)), m.end()
+    if c == "{":
+        if s[i + 1] == "}": return {}, i + 2
+        out, i = _parse_results(s, i + 1)
+        return out, i + 1  # skip '}'
+    if c == "[":
+        items = []
+        i += 1
+        if s[i] == "]": return items, i + 1
+        while True:
+            # List elements are either bare values or name=value results (names dropped)
+            if s[i] not in '"{[':
+                m = _NAME_RE.match(s, i)
+                i = m.end() + 1  # skip '='
+            val, i = _parse_value(s, i)
+            items.append(val)
+            if s[i] == ",": i += 1
+            else: return items, i + 1  # skip ']'
+    raise ValueError(f"Unexpected {c!r} at {i}")
+
+def _parse_results(s, i):
+    out = {}
+    n = len(s)
+    while i < n and s[i] not in "}]":
+        m = _NAME_RE.match(s, i)
+        if not m: raise ValueError(f"Expected name at {i}")
+        val, i = _parse_value(s, m.end() + 1)
+        out[m.group()] = val
+        if i < n and s[i] == ",": i += 1
+    return out, i
+
+def parse_mi_line(line):
+    # Returns a dict: {"type": "result"|"exec"|"status"|"notify"|"console"|"target"|"log"|"prompt"|"output", ...}
+    line = line.rstrip("\r\n")
+    if line.startswith("(gdb)"): return {"type": "prompt"}
+    if line[:1] in ("~", "@", "&") and line[1:2] == '"':
+        kind = {"~": "console", "@": "target", "&": "log"}[line[0]]
+        return {"type": kind, "text": _unescape(line[2:-1])}
+
+    m = _RECORD_RE.match(line)
+    if not m:
+        return {"type": "output", "text": line}  # Stray non-MI text from gdb itself
+    token, sigil, cls = m.groups()
+    kind = {"^": "result", "*": "exec", "+": "status", "=": "notify"}[sigil]
+    results = {}
+    if m.end() < len(line) and line[m.end()] == ",":
+        try: results, _ = _parse_results(line, m.end() + 1)
+        except (ValueError, IndexError, AttributeError): results = {"raw": line[m.end() + 1:]}
+    return {"type": kind, "token": int(token) if token else None, "class": cls, "results": results}
+
+
+# --- Session ---
+class GdbSession:
+    # One long-lived `gdb --interpreter=mi2` process. Re-runs reuse it: only the
+    # executable is reloaded (when its path or mtime changed) and the program restarted.
+    def __init__(self, gdb_path):
+        self.gdb_path = gdb_path
+        self.proc = None
+        self.lines = queue.Queue()
+        self.token = 0
+        self.loaded = None  # (exe, mtime) currently loaded
+        self.register_names = []
+        self.output = []    # non-MI lines seen while waiting
+
+    def alive(self):
+        return self.proc is not None and self.proc.poll() is None
+
+    def start(self):
+        if self.alive(): return
+        startupinfo = None
+        if os.name == 'nt':
+            startupinfo = subprocess.STARTUPINFO()
+            startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
+            startupinfo.wShowWindow = subprocess.SW_HIDE
+
+        self.proc = subprocess.Popen(
+            [self.gdb_path, "--interpreter=mi2", "-q", "-nx"],
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+            text=True, bufsize=1, errors="replace", startupinfo=startupinfo
+        )
+        self.lines = queue.Queue()
+        threading.Thread(target=self._reader, args=(self.proc, self.lines), daemon=True).start()
+        self.loaded = None
+        self.register_names = []
+        self._wait(lambda r: r["type"] == "prompt", 10)
+        self.command("-gdb-set confirm off")
+        self.command("-gdb-set pagination off")
+
+    def _reader(self, proc, lines):
+        for line in proc.stdout:
+            lines.put(line)
+        lines.put(None)
+
+    def close(self):
+        if not self.alive(): return
+        try:
+            self.proc.stdin.write("-gdb-exit\n")
+            self.proc.stdin.flush()
+            self.proc.wait(timeout=2)
+        except Exception:
+            self.proc.kill()
+        self.proc = None
+
+    def _wait(self, predicate, timeout):
+        deadline = time.monotonic() + timeout
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0: raise TimeoutError("gdb did not answer in time")
+            try: line = self.lines.get(timeout=remaining)
+            except queue.Empty: raise TimeoutError("gdb did not answer in time")
+            if line is None: raise RuntimeError("gdb exited unexpectedly")
+            rec = parse_mi_line(line)
+            if rec["type"] == "output": self.output.append(rec["text"])
+            elif rec["type"] == "target": self.output.append(rec["text"].rstrip("\n"))
+            if predicate(rec): return rec
+
+    def command(self, cmd, timeout=10):
+        # Send one MI command and return its result record ({"class": "done"|"error"|..., "results": {...}})
+        self.token += 1
+        tok = self.token
+        self.proc.stdin.write(f"{tok}{cmd}\n")
+        self.proc.stdin.flush()
+        return self._wait(lambda r: r["type"] == "result" and r["token"] == tok, timeout)
+
+    def load(self, exe):
+        key = (os.path.abspath(exe), os.path.getmtime(exe))
+        if self.loaded == key: return
+        path = key[0].replace("\\", "/")
+        res = self.command(f'-file-exec-and-symbols "{path}"')
+        if res["class"] == "error": raise RuntimeError(res["results"].get("msg", "Cannot load executable"))
+        self.loaded = key
+        self.register_names = []  # New binary may target another arch
+
+    def _snapshot(self, stop, mem_bytes):
+        frame = stop["results"].get("frame", {})
+        snap = {
+            "reason": stop["results"].get("reason", "?"),
+            "func": frame.get("func", "??"), "addr": frame.get("addr", ""),
+            "file": frame.get("file", ""), "line": frame.get("line", "")
+        }
+
+        if not self.register_names:
+            res = self.command("-data-list-register-names")
+            self.register_names = res["results"].get("register-names", [])
+        res = self.command("-data-list-register-values --skip-unavailable x")
+        regs = {}
+        for r in res["results"].get("register-values", []):
+            idx = int(r.get("number", -1))
+            val = r.get("value", "")
+            # Vector registers come back as nested tuples; keep the scalar ones
+            if 0 <= idx < len(self.register_names) and self.register_names[idx] and isinstance(val, str):
+                regs[self.register_names[idx]] = val
+        snap["registers"] = regs
+
+        res = self.command("-stack-list-frames")
+        snap["backtrace"] = [
+            f"#{f.get('level', '?')} {f.get('addr', '')} in {f.get('func', '??')}"
+            + (f" at {f['file']}:{f['line']}" if "file" in f else "")
+            for f in res["results"].get("stack", [])
+        ]
+
+        res = self.command(f"-data-read-memory-bytes $sp {mem_bytes}")
+        mem = res["results"].get("memory", [])
+        snap["memory"] = (mem[0].get("begin", ""), mem[0].get("contents", "")) if mem else ("", "")
+        return snap
+
+    def trace(self, exe, breakpoints, max_stops=16, mem_bytes=64, timeout=15):
+        # Run exe under gdb, stopping at each breakpoint to collect registers / backtrace / memory
+        self.start()
+        self.load(exe)
+        self.output = []
+        self.command("-break-delete")
+        for bp in breakpoints:
+            self.command(f"-break-insert -f {bp}")
+
+        stops = []
+        exit_code = None
+        channel = self._inferior_channel()
+        try:
+            res = self.command("-exec-run", timeout)
+            if res["class"] == "error": raise RuntimeError(res["results"].get("msg", "Cannot run program"))
+            while True:
+                stop = self._wait(lambda r: r["type"] == "exec" and r["class"] == "stopped", timeout)
+                reason = stop["results"].get("reason", "")
+                if reason.startswith("exited"):
+                    exit_code = int(stop["results"].get("exit-code", "0"), 8)  # gdb reports octal
+                    break
+                stops.append(self._snapshot(stop, mem_bytes))
+                if len(stops) >= max_stops or reason.startswith("signal"):
+                    self.command("-interpreter-exec console kill")
+                    break
+                self.command("-exec-continue", timeout)
+        finally:
+            program_output = channel()
+
+        return {"stops": stops, "exit_code": exit_code, "output": "\n".join([program_output] + self.output).strip("\n")}
+
+    def _inferior_channel(self):
+        # The program gets its own terminal (POSIX) or output file, so nothing it prints
+        # can be read as an MI record. Returns a function that closes it and gives the text.
+        if pty is not None:
+            master, slave = pty.openpty()
+            self.command(f'-inferior-tty-set "{os.ttyname(slave)}"')
+            os.write(master, b"\x04")  # Ctrl-D: a program reading stdin sees end of file, not a hang
+            chunks = []
+            def reader():
+                while True:
+                    try: data = os.read(master, 4096)
+                    except OSError: break  # EIO once the last slave fd is closed
+                    if not data: break
+                    chunks.append(data)
+            t = threading.Thread(target=reader, daemon=True)
+            t.start()
+            def close():
+                os.close(slave)
+                t.join(2)
+                os.close(master)
+                return b"".join(chunks).decode("utf-8", errors="replace").replace("\r\n", "\n")
+            return close
+
+        fd, path = tempfile.mkstemp(suffix=".out")
+        os.close(fd)
+        self.command(f'-exec-arguments < "{os.devnull}" > "{path}" 2>&1')
+        def close():
+            try:
+                with open(path, "r", errors="replace") as f: return f.read()
+            finally:
+                os.remove(path)
+        return close
+
+
+# --- Helpers ---
+_IMPORT_CALL_RE = re.compile(r"call.*<(?:__imp_)?([A-Za-z_]\w*)@plt>|call.*\*.*<__imp_([A-Za-z_]\w*)>")
+
+def find_imported_calls(disasm_text):
+    # Names of library functions called through the PLT (ELF) or import table (PE)
+    names = []
+    for m in _IMPORT_CALL_RE.finditer(disasm_text):
+        name = m.group(1) or m.group(2)
+        if name.startswith("__"): continue  # CRT internals (__cxa_finalize, __main, ...)
+        if name not in names: names.append(name)
+    return names
+
+def format_trace(trace):
+    out = []
+    for i, s in enumerate(trace["stops"]):
+        where = f"{s['file']}:{s['line']}" if s["file"] else s["addr"]
+        out.append(f"=== Stop {i + 1}: {s['func']} ({s['reason']}) @ {where}")
+        out.append("Backtrace:")
+        out.extend(f"  {b}" for b in s["backtrace"])
+        out.append("Registers:")
+        regs = list(s["registers"].items())
+        for j in range(0, len(regs), 3):
+            out.append("  " + "  ".join(f"{n:>6}={v:<18}" for n, v in regs[j:j + 3]))
+        addr, hexdata = s["memory"]
+        out.append(f"Memory @ $sp ({addr}):")
+        for j in range(0, len(hexdata), 32):
+            chunk = hexdata[j:j + 32]
+            out.append("  " + " ".join(chunk[k:k + 2] for k in range(0, len(chunk), 2)))
+        out.append("")
+    code = trace["exit_code"]
+    out.append(f"Program exited with code {code}." if code is not None else "Program killed after last stop.")
+    out.append(f"OUTPUT:\n{trace['output']}")
+    return "\n".join(out)
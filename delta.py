@@ -0,0 +1,225 @@
+import os
+import sys
+import zlib
+import shutil
+import struct
+import hashlib
+import argparse
+
+# Compact block-based delta between an original binary and a patched variant.
+#
+# File layout:
+#   magic "CSDELTA1"
+#   header: source size, target size (u64), source sha1, target sha1 (20 bytes each), block size (u32)
+#   zlib stream of ops:
+#     COPY  b"C" u64 src_offset u32 length           - bytes taken from the original
+#     XOR   b"X" u64 src_offset u32 length <bytes>    - original XOR these bytes (bsdiff-style: a
+#                                                     few changed bytes in a block of zeros)
+#     ADD   b"A" u32 length <bytes>                   - literal new bytes
+#     END   b"E"
+#
+# Both directions stream block by block, so memory use is independent of file size
+# (apart from one small hash per source block for finding moved blocks).
+
+MAGIC = b"CSDELTA1"
+HEADER = struct.Struct("<QQ20s20sI")
+COPY = struct.Struct("<cQI")
+ADD = struct.Struct("<cI")
+BLOCK_SIZE = 4096
+
+class DeltaError(Exception):
+    pass
+
+
+def _sha1_file(path, chunk_size=1 << 20):
+    h = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            h.update(chunk)
+    return h.digest()
+
+def _xor(a, b):
+    # Whole-block XOR at C speed via big ints
+    return (int.from_bytes(a, "little") ^ int.from_bytes(b, "little")).to_bytes(len(a), "little")
+
+
+# --- Generating ---
+def make_delta(original, patched, delta_path, block_size=BLOCK_SIZE):
+    # Returns a stats dict: sizes and op counts
+    src_size, dst_size = os.path.getsize(original), os.path.getsize(patched)
+
+    # Source block index (first offset per block digest) for blocks that moved
+    index = {}
+    with open(original, "rb") as f:
+        off = 0
+        for block in iter(lambda: f.read(block_size), b""):
+            index.setdefault(hashlib.blake2b(block, digest_size=8).digest(), off)
+            off += len(block)
+
+    stats = {"copy": 0, "xor": 0, "add": 0}
+    comp = zlib.compressobj(9)
+    pending = None  # Merged run of COPY: [src_offset, length]
+
+    with open(original, "rb") as src, open(patched, "rb") as dst, open(delta_path, "wb") as out:
+        out.write(MAGIC)
+        out.write(HEADER.pack(src_size, dst_size, _sha1_file(original), _sha1_file(patched), block_size))
+
+        def emit(data):
+            out.write(comp.compress(data))
+
+        def flush_copy():
+            nonlocal pending
+            if pending:
+                emit(COPY.pack(b"C", pending[0], pending[1]))
+                stats["copy"] += 1
+            pending = None
+
+        def copy(src_off, length):
+            nonlocal pending
+            if pending and pending[0] + pending[1] == src_off:
+                pending[1] += length
+            else:
+                flush_copy()
+                pending = [src_off, length]
+
+        pos = 0
+        for tblock in iter(lambda: dst.read(block_size), b""):
+            n = len(tblock)
+            src.seek(pos)
+            sblock = src.read(n)
+
+            if sblock == tblock:
+                copy(pos, n)
+            else:
+                moved = index.get(hashlib.blake2b(tblock, digest_size=8).digest()) if n == block_size else None
+                if moved is not None and _block_at(src, moved, n) == tblock:
+                    copy(moved, n)
+                elif len(sblock) == n and n - _xor(sblock, tblock).count(0) < n // 2:
+                    flush_copy()
+                    emit(COPY.pack(b"X", pos, n) + _xor(sblock, tblock))
+                    stats["xor"] += 1
+                else:
+                    flush_copy()
+                    emit(ADD.pack(b"A", n) + tblock)
+                    stats["add"] += 1
+            pos += n
+
+        flush_copy()
+        emit(b"E")
+        out.write(comp.flush())
+
+    stats.update({"source_size": src_size, "target_size": dst_size, "delta_size": os.path.getsize(delta_path)})
+    return stats
+
+def _block_at(f, offset, n):
+    f.seek(offset)
+    return f.read(n)
+
+
+# --- Applying ---
+class _OpReader:
+    # Pulls exact byte counts out of the decompressed op stream. Decompression is capped
+    # per call, since a few KB of zeros-heavy XOR data can inflate enormously.
+    def __init__(self, f):
+        self.f = f
+        self.d = zlib.decompressobj()
+        self.buf = b""
+        self.pos = 0
+
+    def read(self, n):
+        while len(self.buf) - self.pos < n:
+            self.buf = self.buf[self.pos:]
+            self.pos = 0
+            data = self.d.unconsumed_tail or self.f.read(1 << 16)
+            more = self.d.decompress(data, 1 << 20) if data else self.d.flush()
+            if not more and not data: raise DeltaError("Delta stream is truncated.")
+            self.buf += more
+        out = self.buf[self.pos:self.pos + n]
+        self.pos += n
+        return out
+
+def read_header(delta_path):
+    with open(delta_path, "rb") as f:
+        if f.read(len(MAGIC)) != MAGIC: raise DeltaError(f"{delta_path} is not a delta file.")
+        src_size, dst_size, src_sha, dst_sha, block_size = HEADER.unpack(f.read(HEADER.size))
+    return {"source_size": src_size, "target_size": dst_size, "source_sha1": src_sha.hex(),
+            "target_sha1": dst_sha.hex(), "block_size": block_size}
+
+def apply_delta(original, delta_path, output):
+    # Rebuilds the patched file; both the original and the result are checksum-verified
+    hdr = read_header(delta_path)
+    if os.path.getsize(original) != hdr["source_size"] or _sha1_file(original).hex() != hdr["source_sha1"]:
+        raise DeltaError(f"{original} does not match the delta's original (checksum mismatch).")
+
+    h = hashlib.sha1()
+    try:
+        with open(original, "rb") as src, open(delta_path, "rb") as f, open(output, "wb") as out:
+            f.seek(len(MAGIC) + HEADER.size)
+            ops = _OpReader(f)
+
+            def write(data):
+                h.update(data)
+                out.write(data)
+
+            while True:
+                op = ops.read(1)
+                if op == b"E": break
+                if op == b"C":
+                    _, src_off, n = COPY.unpack(op + ops.read(COPY.size - 1))
+                    # Merged copies can span most of the file: stream them in pieces
+                    src.seek(src_off)
+                    while n:
+                        data = src.read(min(n, 1 << 20))
+                        if not data: raise DeltaError(f"Copy past end of original at {src_off:#x}.")
+                        write(data)
+                        n -= len(data)
+                elif op == b"X":
+                    _, src_off, n = COPY.unpack(op + ops.read(COPY.size - 1))
+                    data = _block_at(src, src_off, n)
+                    if len(data) != n: raise DeltaError(f"Xor past end of original at {src_off:#x}.")
+                    write(_xor(data, ops.read(n)))
+                elif op == b"A":
+                    _, n = ADD.unpack(op + ops.read(ADD.size - 1))
+                    write(ops.read(n))
+                else:
+                    raise DeltaError(f"Unknown delta op {op!r}.")
+    except Exception:
+        if os.path.exists(output): os.remove(output)
+        raise
+
+    if h.hexdigest() != hdr["target_sha1"]:
+        os.remove(output)
+        raise DeltaError("Reconstructed file failed the checksum check.")
+    shutil.copymode(original, output)  # Keep the exec bit of patched executables
+    return hdr
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Block-based binary deltas between original and patched files.")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    p = sub.add_parser("diff", help="Create a delta")
+    p.add_argument("original"); p.add_argument("patched"); p.add_argument("delta")
+    p.add_argument("--block-size", type=int, default=BLOCK_SIZE)
+    p = sub.add_parser("apply", help="Rebuild the patched file from original + delta")
+    p.add_argument("original"); p.add_argument("delta"); p.add_argument("output")
+    p = sub.add_parser("info", help="Show a delta header")
+    p.add_argument("delta")
+    args = parser.parse_args(argv)
+
+    try:
+        if args.cmd == "diff":
+            st = make_delta(args.original, args.patched, args.delta, args.block_size)
+            print(f"{args.delta}: {st['delta_size']} bytes for a {st['target_size']} byte target "
+                  f"({st['copy']} copy, {st['xor']} xor, {st['add']} add ops)")
+        elif args.cmd == "apply":
+            hdr = apply_delta(args.original, args.delta, args.output)
+            print(f"Rebuilt {args.output} ({hdr['target_size']} bytes, sha1 {hdr['target_sha1']})")
+        else:
+            for k, v in read_header(args.delta).items(): print(f"{k}: {v}")
+    except (DeltaError, OSError) as e:
+        print(f"Delta failed: {e}")
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
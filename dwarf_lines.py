@@ -0,0 +1,267 @@
+import os
+import re
+import bisect
+import struct
+
+# In-process .debug_line reader (DWARF 2-5) for -g builds.
+# The line program is run once per artifact into an interval index:
+#   address -> (file, line)      bisect over sorted range starts, O(log n)
+#   (file, line) -> [(lo, hi)]   dict of address ranges
+
+class DwarfError(Exception):
+    pass
+
+# DW_FORM_* codes used by DWARF 5 directory/file entry formats
+_FORM_STRING, _FORM_LINE_STRP, _FORM_STRP = 0x08, 0x1f, 0x0e
+_FORM_UDATA, _FORM_DATA1, _FORM_DATA2, _FORM_DATA4, _FORM_DATA8, _FORM_DATA16, _FORM_BLOCK = 0x0f, 0x0b, 0x05, 0x06, 0x07, 0x1e, 0x09
+_LNCT_PATH, _LNCT_DIRECTORY_INDEX = 1, 2
+
+
+class _Reader:
+    def __init__(self, data, pos=0):
+        self.data = data
+        self.pos = pos
+
+    def u(self, fmt):
+        v = struct.unpack_from("<" + fmt, self.data, self.pos)[0]
+        self.pos += struct.calcsize(fmt)
+        return v
+
+    def uleb(self):
+        result = shift = 0
+        while True:
+            b = self.data[self.pos]
+            self.pos += 1
+            result |= (b & 0x7f) << shift
+            shift += 7
+            if b < 0x80: return result
+
+    def sleb(self):
+        result = shift = 0
+        while True:
+            b = self.data[self.pos]
+            self.pos += 1
+            result |= (b & 0x7f) << shift
+            shift += 7
+            if b < 0x80:
+                if b & 0x40: result -= 1 << shift
+                return result
+
+    def cstr(self):
+        end = self.data.index(b"\0", self.pos)
+        s = self.data[self.pos:end].decode("utf-8", errors="replace")
+        self.pos = end + 1
+        return s
+
+    def addr(self, size):
+        return self.u({1: "B", 2: "H", 4: "I", 8: "Q"}[size])
+
+
+def _strp(section, offset):
+    if section is None: return ""
+    end = section.index(b"\0", offset)
+    return section[offset:end].decode("utf-8", errors="replace")
+
+
+def parse_debug_line(data, line_str=None, debug_str=None):
+    # Returns a list of sequences; each is a list of (address, file_path, line) rows,
+    # the last row of a sequence marking its end address.
+    sequences = []
+    pos = 0
+    while pos < len(data):
+        r = _Reader(data, pos)
+        unit_length = r.u("I")
+        offset_size = 4
+        if unit_length == 0xffffffff:
+            unit_length = r.u("Q")
+            offset_size = 8
+        end = r.pos + unit_length
+        version = r.u("H")
+        if version < 2 or version > 5: raise DwarfError(f"Unsupported DWARF line table version {version}")
+        if version >= 5:
+            r.u("B")  # address size (set_address carries its own length)
+            r.u("B")  # segment selector size
+        header_length = r.u("I" if offset_size == 4 else "Q")
+        program = r.pos + header_length
+        min_inst = r.u("B")
+        max_ops = r.u("B") if version >= 4 else 1
+        r.u("B")  # default_is_stmt
+        line_base = r.u("b")
+        line_range = r.u("B")
+        opcode_base = r.u("B")
+        std_lengths = [r.u("B") for _ in range(opcode_base - 1)]
+
+        if version >= 5:
+            dirs = [e.get(_LNCT_PATH, "") for e in _entries(r, offset_size, line_str, debug_str)]
+            files = [_join(dirs, e.get(_LNCT_DIRECTORY_INDEX, 0), e.get(_LNCT_PATH, "")) for e in _entries(r, offset_size, line_str, debug_str)]
+        else:
+            dirs = [""]  # Index 0 = compilation directory
+            while True:
+                d = r.cstr()
+                if not d: break
+                dirs.append(d)
+            files = [""]  # DWARF < 5 file numbers are 1-based
+            while True:
+                name = r.cstr()
+                if not name: break
+                d = r.uleb(); r.uleb(); r.uleb()
+                files.append(_join(dirs, d, name))
+
+        r.pos = program
+        seq = []
+        # State machine registers
+        address, file_idx, line, op_index = 0, 1, 1, 0
+        while r.pos < end:
+            op = r.u("B")
+            if op >= opcode_base:
+                adj = op - opcode_base
+                address += min_inst * ((op_index + adj // line_range) // max_ops)
+                line += line_base + adj % line_range
+                seq.append((address, file_idx, line))
+            elif op == 0:
+                length = r.uleb()
+                sub_end = r.pos + length
+                sub = r.u("B")
+                if sub == 1:    # end_sequence
+                    seq.append((address, None, line))
+                    sequences.append([(a, _file(files, f), l) for a, f, l in seq])
+                    seq = []
+                    address, file_idx, line, op_index = 0, 1, 1, 0
+                elif sub == 2:  # set_address
+                    address = r.addr(length - 1)
+                    op_index = 0
+                elif sub == 3:  # define_file (DWARF < 5)
+                    name = r.cstr()
+                    d = r.uleb()
+                    files.append(_join(dirs, d, name))
+                r.pos = sub_end
+            elif op == 1:   # copy
+                seq.append((address, file_idx, line))
+            elif op == 2:   # advance_pc
+                address += min_inst * r.uleb()
+            elif op == 3:   # advance_line
+                line += r.sleb()
+            elif op == 4:   # set_file
+                file_idx = r.uleb()
+            elif op == 8:   # const_add_pc
+                address += min_inst * ((255 - opcode_base) // line_range)
+            elif op == 9:   # fixed_advance_pc
+                address += r.u("H")
+            elif op in (5, 12):  # set_column, set_isa
+                r.uleb()
+            elif op in (6, 7, 10, 11):  # negate_stmt, basic_block, prologue_end, epilogue_begin
+                pass
+            else:
+                for _ in range(std_lengths[op - 1]): r.uleb()
+        pos = end
+    return sequences
+
+def _entries(r, offset_size, line_str, debug_str):
+    # DWARF 5 entry-format-described list (directories or files)
+    fmt = [(r.uleb(), r.uleb()) for _ in range(r.u("B"))]
+    out = []
+    for _ in range(r.uleb()):
+        entry = {}
+        for content, form in fmt:
+            if form == _FORM_STRING: v = r.cstr()
+            elif form == _FORM_LINE_STRP: v = _strp(line_str, r.u("I" if offset_size == 4 else "Q"))
+            elif form == _FORM_STRP: v = _strp(debug_str, r.u("I" if offset_size == 4 else "Q"))
+            elif form == _FORM_UDATA: v = r.uleb()
+            elif form == _FORM_DATA1: v = r.u("B")
+            elif form == _FORM_DATA2: v = r.u("H")
+            elif form == _FORM_DATA4: v = r.u("I")
+            elif form == _FORM_DATA8: v = r.u("Q")
+            elif form == _FORM_DATA16: r.pos += 16; v = None
+            elif form == _FORM_BLOCK: r.pos += r.uleb(); v = None
+            else: raise DwarfError(f"Unsupported DW_FORM {form:#x} in line table header")
+            entry[content] = v
+        out.append(entry)
+    return out
+
+def _join(dirs, idx, name):
+    if os.path.isabs(name) or not (0 <= idx < len(dirs)) or not dirs[idx]: return name
+    return dirs[idx].rstrip("/\\") + "/" + name
+
+def _file(files, idx):
+    if idx is None: return None
+    return files[idx] if 0 <= idx < len(files) else f"<file {idx}>"
+
+
+class LineTable:
+    # Interval index over the decoded sequences
+    def __init__(self, sequences):
+        spans = []
+        for seq in sequences:
+            for (a, f, l), (b, _, _) in zip(seq, seq[1:]):
+                if b > a and f is not None: spans.append((a, b, f, l))
+        spans.sort()
+        self.starts = [s[0] for s in spans]
+        self.spans = spans
+        self.by_line = {}
+        for a, b, f, l in spans:
+            self.by_line.setdefault((os.path.basename(f), l), []).append((a, b))
+
+    def lookup(self, address):
+        # -> (file, line) or None
+        i = bisect.bisect_right(self.starts, address) - 1
+        if i >= 0 and address < self.spans[i][1]: return self.spans[i][2], self.spans[i][3]
+        return None
+
+    def ranges(self, filename, line):
+        return self.by_line.get((os.path.basename(filename), line), [])
+
+
+_CACHE = {}  # (path, mtime_ns, size) -> LineTable
+
+def line_table(backend, exe):
+    # Built once per artifact version; section bytes are located via objdump -h
+    st = os.stat(exe)
+    key = (os.path.abspath(exe), st.st_mtime_ns, st.st_size)
+    if key in _CACHE: return _CACHE[key]
+
+    sections = {s["name"]: s for s in backend.section_table(exe)}
+    if ".debug_line" not in sections: raise DwarfError(f"{exe} has no .debug_line section (not built with -g?)")
+    with open(exe, "rb") as f:
+        def read(name):
+            s = sections.get(name)
+            if not s: return None
+            f.seek(s["offset"])
+            return f.read(s["size"])
+        try:
+            table = LineTable(parse_debug_line(read(".debug_line"), read(".debug_line_str"), read(".debug_str")))
+        except (struct.error, IndexError, KeyError, ValueError) as e:
+            raise DwarfError(f"Malformed .debug_line in {exe}: {e}")
+
+    for k in [k for k in _CACHE if k[0] == key[0]]: del _CACHE[k]  # Drop stale versions
+    _CACHE[key] = table
+    return table
+
+
+def strip_debug_asm(text):
+    # Hides -g noise (.loc/.file N directives, .debug_* sections) from an assembly listing
+    out, in_debug = [], False
+    for line in text.splitlines():
+        s = line.strip()
+        if s.startswith((".section", ".text", ".data", ".bss")):
+            parts = s.split()
+            in_debug = parts[0] == ".section" and len(parts) > 1 and parts[1].startswith(".debug_")
+        if in_debug or s.startswith(".loc\t") or s.startswith(".loc ") or _FILE_N_RE.match(s): continue
+        out.append(line)
+    return "\n".join(out) + ("\n" if text.endswith("\n") else "")
+
+_FILE_N_RE = re.compile(r"^\.file\s+\d+\s")
+
+# "    1139:	55                   	push   %rbp"
+_OBJDUMP_INSN_RE = re.compile(r"^\s*([0-9a-fA-F]+):\t")
+
+def map_disassembly(table, disasm, source):
+    # [[source_line, disasm_line], ...] (0-based text lines) for every instruction of source
+    name = os.path.basename(source)
+    pairs = []
+    for i, text in enumerate(disasm.splitlines()):
+        m = _OBJDUMP_INSN_RE.match(text)
+        if not m: continue
+        hit = table.lookup(int(m.group(1), 16))
+        if hit and os.path.basename(hit[0]) == name:
+            pairs.append([hit[1] - 1, i])
+    return pairs
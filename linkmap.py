@@ -0,0 +1,217 @@
+import os
+import re
+import sys
+import json
+import time
+import argparse
+import tempfile
+import subprocess
+
+# Link analysis: links the same objects with every installed linker, dynamically and
+# with -static, timing each link and reading its map file to attribute the output
+# size to the input objects and libraries.
+#   python linkmap.py hello.o [more.o ...] [--runs N] [--json out.json]
+
+LINKERS = ("bfd", "gold", "lld", "mold")
+MODES = ("dynamic", "static")
+RUNS = 3  # Timed links per combination (best is kept); one more writes the map
+
+# Output sections that are not loaded at run time
+_NON_ALLOC = (".debug", ".comment", ".symtab", ".strtab", ".shstrtab", ".stab", ".gnu_debuglink", ".gnu.warning", ".note.GNU-stack")
+# Input sections the linker synthesises; GNU ld books them under the first input object
+_SYNTHETIC = (".interp", ".hash", ".gnu.hash", ".dynsym", ".dynstr", ".gnu.version", ".gnu.version_d", ".gnu.version_r",
+              ".dynamic", ".got", ".got.plt", ".igot.plt", ".plt", ".plt.got", ".plt.sec", ".iplt", ".eh_frame_hdr", ".note.gnu.build-id")
+LINKER = "<linker>"    # Headers, GOT/PLT, dynamic tables... made by the linker itself
+PADDING = "<padding>"  # Alignment fill
+MERGED = "<merged>"    # Merged strings/constants/.eh_frame the map does not split by input (gold)
+_MERGED = ("** merge strings", "** merge constants", "** eh_frame")
+
+def available_linkers(gcc):
+    found = []
+    for name in LINKERS:
+        proc = subprocess.run([gcc, f"-fuse-ld={name}", "-Wl,--version"], capture_output=True)
+        if proc.returncode == 0: found.append(name)
+    return found
+
+
+# --- Map parsing ---
+# GNU ld / gold: " .text   0x0000000000401000   0x2a /path/hello.o" (name may wrap onto its own line)
+_GNU_ROW_RE = re.compile(r"^(.*?)\s*0x([0-9a-fA-F]+)\s+0x([0-9a-fA-F]+)\s*(.*)$")
+_GNU_START = ("Linker script and memory map", "Memory map")
+
+def parse_map(text):
+    # -> [(output_section, input_file or LINKER/PADDING, size)] for every input section
+    for line in text.splitlines():
+        words = line.split()
+        if "VMA" in words and "Size" in words and "Out" in words: return _parse_lld_map(text)
+    return _parse_gnu_map(text)
+
+def _parse_gnu_map(text):
+    rows = []
+    lines = iter(text.splitlines())
+    for line in lines:
+        if line.strip() in _GNU_START: break  # Skip the discarded-sections list
+    out_sec, pending = None, None
+    for line in lines:
+        if not line.strip():
+            pending = None
+            continue
+        if not line[0].isspace():
+            # Output section (col 0); LOAD/OUTPUT lines end up here too but own no rows
+            out_sec, pending = line.split()[0], None
+            continue
+        m = _GNU_ROW_RE.match(line)
+        if not m:
+            s = line.strip()
+            if line.startswith(" ") and not line.startswith("  ") and not s.startswith("*("): pending = s  # Wrapped input name
+            continue
+        name, size, owner = m.group(1).strip() or pending, int(m.group(3), 16), m.group(4).strip()
+        pending = None
+        if not name: continue  # Output section address/size line
+        if name.startswith(("*fill*", "** fill", "** zero fill")): owner = PADDING
+        elif name.startswith(_MERGED): owner = MERGED
+        elif name.startswith("**") or not owner or name in _SYNTHETIC or name.startswith(".rela"): owner = LINKER
+        rows.append((out_sec, owner, size))
+    return rows
+
+def _parse_lld_map(text):
+    # lld:  "VMA LMA Size Align Out In Symbol"  (hex without 0x)
+    # mold: "VMA Size Align Out In Symbol"      (hex with 0x)
+    # Level is given by indentation: output section, then "file:(section)", then symbols.
+    rows, row_re, size_col, base, out_sec = [], None, None, None, None
+    for line in text.splitlines():
+        if row_re is None:
+            words = line.split()
+            if "Out" in words and "Size" in words:
+                cols = words[:words.index("Out")]
+                size_col = cols.index("Size")
+                row_re = re.compile(r"^\s*" + r"(\S+)\s+" * (len(cols) - 1) + r"(\S+)( +)(\S.*)$")
+            continue
+        m = row_re.match(line)
+        if not m: continue
+        indent, name = len(m.group(len(m.groups()) - 1)), m.group(len(m.groups()))
+        if base is None: base = indent
+        if indent == base:
+            out_sec = name
+        elif ":(" in name:
+            owner = name.rsplit(":(", 1)[0]
+            rows.append((out_sec, LINKER if owner == "<internal>" else owner, int(m.group(size_col + 1), 16)))
+    return rows
+
+
+def _owner_key(owner):
+    # "/usr/lib/libc.a(printf.o)" -> ("libc.a", "printf.o"); "/tmp/hello.o" -> ("hello.o", None)
+    m = re.match(r"^(.*?)\(([^()]*)\)$", owner)
+    if m: return os.path.basename(m.group(1)), m.group(2)
+    return os.path.basename(owner) if owner not in (LINKER, PADDING, MERGED) else owner, None
+
+def attribute(rows):
+    # -> {input: {"loaded", "other", "members": {member: loaded}}}
+    # The symbol/string tables the linker writes itself are left out: only gold lists them.
+    out = {}
+    for sec, owner, size in rows:
+        if not size or (owner == LINKER and sec and sec.startswith(_NON_ALLOC)): continue
+        name, member = _owner_key(owner)
+        entry = out.setdefault(name, {"loaded": 0, "other": 0, "members": {}})
+        if sec and sec.startswith(_NON_ALLOC):
+            entry["other"] += size
+        else:
+            entry["loaded"] += size
+            if member: entry["members"][member] = entry["members"].get(member, 0) + size
+    return out
+
+
+# --- Linking ---
+def _link_cmd(gcc, objects, linker, mode, output, extra=()):
+    return [gcc, f"-fuse-ld={linker}"] + (["-static"] if mode == "static" else []) + list(objects) + ["-o", output] + list(extra)
+
+def analyse(gcc, objects, linkers=None, modes=MODES, runs=RUNS, progress=None):
+    # -> list of {"linker", "mode", "seconds", "size", "inputs"} (or "error") per combination
+    linkers = available_linkers(gcc) if linkers is None else linkers
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for linker in linkers:
+            for mode in modes:
+                out = os.path.join(tmp, f"a.{linker}.{mode}")
+                res = {"linker": linker, "mode": mode}
+                times = []
+                for _ in range(runs):
+                    t0 = time.perf_counter()
+                    proc = subprocess.run(_link_cmd(gcc, objects, linker, mode, out), capture_output=True, text=True)
+                    times.append(time.perf_counter() - t0)
+                    if proc.returncode != 0: break
+                if proc.returncode != 0:
+                    res["error"] = (proc.stderr.strip().splitlines() or ["link failed"])[-1]
+                else:
+                    res["seconds"] = min(times)
+                    res["size"] = os.path.getsize(out)
+                    map_file = out + ".map"
+                    proc = subprocess.run(_link_cmd(gcc, objects, linker, mode, out, [f"-Wl,-Map,{map_file}"]), capture_output=True)
+                    if proc.returncode == 0 and os.path.exists(map_file):
+                        with open(map_file, "r", errors="replace") as f: res["inputs"] = attribute(parse_map(f.read()))
+                    else:
+                        res["inputs"] = None  # Linker wrote no map
+                results.append(res)
+                if progress: progress(results)
+    return results
+
+
+# --- Display ---
+def format_links(results, missing=(), top=8, members=5):
+    lines = [f"{'Linker':<7} {'Mode':<8} {'Time(ms)':>9} {'Size':>11} {'Loaded':>11} {'Debug/other':>12}"]
+    for r in results:
+        if "error" in r:
+            lines.append(f"{r['linker']:<7} {r['mode']:<8} failed: {r['error'][:60]}")
+            continue
+        row = f"{r['linker']:<7} {r['mode']:<8} {r['seconds'] * 1e3:>9.1f} {r['size']:>11,}"
+        if r.get("inputs"):
+            row += f" {sum(e['loaded'] for e in r['inputs'].values()):>11,} {sum(e['other'] for e in r['inputs'].values()):>12,}"
+        else:
+            row += f" {'no map':>11}"
+        lines.append(row)
+    if missing: lines.append(f"Not installed: {', '.join(missing)}")
+    for r in results:
+        merged = (r.get("inputs") or {}).get(MERGED)
+        if merged and merged["loaded"]:
+            lines.append(f"Note: {r['linker']} / {r['mode']}: {merged['loaded']:,} loaded byte(s) of merged strings, constants "
+                         f"and .eh_frame are shown as {MERGED}; its map does not attribute them to inputs")
+
+    done = [r for r in results if "error" not in r]
+    if done: lines.append("")
+    for mode in MODES:
+        same = [r for r in done if r["mode"] == mode]
+        if len(same) < 2: continue
+        fastest, smallest = min(same, key=lambda r: r["seconds"]), min(same, key=lambda r: r["size"])
+        lines.append(f"{mode}: fastest {fastest['linker']} ({fastest['seconds'] * 1e3:.1f} ms), smallest {smallest['linker']} ({smallest['size']:,} bytes)")
+
+    for r in done:
+        if not r.get("inputs"): continue
+        total = sum(e["loaded"] for e in r["inputs"].values()) or 1
+        lines += ["", f"== {r['linker']} / {r['mode']}: loaded bytes by input =="]
+        ranked = sorted(r["inputs"].items(), key=lambda kv: -kv[1]["loaded"])
+        for name, e in ranked[:top]:
+            count = f" ({len(e['members'])} members)" if e["members"] else ""
+            lines.append(f"  {name + count:<34} {e['loaded']:>10,}  {e['loaded'] / total * 100:5.1f}%")
+            for member, size in sorted(e["members"].items(), key=lambda kv: -kv[1])[:members]:
+                lines.append(f"      {member:<30} {size:>10,}")
+        if len(ranked) > top: lines.append(f"  ... {len(ranked) - top} more input(s)")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Link objects with every installed linker, dynamic and static, and attribute the output size.")
+    parser.add_argument("objects", nargs="+")
+    parser.add_argument("--gcc", default="gcc")
+    parser.add_argument("--runs", type=int, default=RUNS, help="Timed links per combination")
+    parser.add_argument("--json", help="Also write the raw results here")
+    args = parser.parse_args(argv)
+
+    linkers = available_linkers(args.gcc)
+    results = analyse(args.gcc, args.objects, linkers, runs=args.runs)
+    print(format_links(results, [l for l in LINKERS if l not in linkers]))
+    if args.json:
+        with open(args.json, "w") as f: json.dump(results, f, indent=1)
+    return 1 if any("error" in r for r in results) else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,123 @@
+import os
+import re
+import json
+import tempfile
+import threading
+import subprocess
+
+# Background syntax check for the step-0 editor ("live mode").
+# Only one checker process runs at a time: a newer edit kills the in-flight one,
+# and results from a superseded edit are dropped.
+
+_JAVAC_DIAG_RE = re.compile(r"^(.*?\.java):(\d+): (error|warning): (.*)$")
+
+class LiveChecker:
+    def __init__(self, backend, workspace_dir):
+        self.backend = backend
+        self.workspace_dir = workspace_dir # Include path for the user's own headers
+        self.lock = threading.Lock()
+        self.generation = 0
+        self.proc = None
+
+    def check_async(self, lang, code, filename, callback):
+        # callback(success, diagnostics_or_message) runs on the worker thread
+        with self.lock:
+            self.generation += 1
+            gen = self.generation
+            if self.proc is not None and self.proc.poll() is None:
+                self.proc.kill()
+        threading.Thread(target=self._worker, args=(gen, lang, code, filename, callback), daemon=True).start()
+
+    def _worker(self, gen, lang, code, filename, callback):
+        try:
+            if lang == "C": result = self._check_c(gen, code)
+            else: result = self._check_java(gen, code, filename)
+        except Exception as e:
+            result = (False, f"Live check failed: {e}")
+        if result is not None and gen == self.generation:
+            callback(*result)
+
+    def _spawn(self, gen, cmd, stdin_text=None):
+        # Returns combined output, or None when a newer edit superseded this one
+        startupinfo = None
+        if os.name == 'nt':
+            startupinfo = subprocess.STARTUPINFO()
+            startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
+            startupinfo.wShowWindow = subprocess.SW_HIDE
+
+        with self.lock:
+            if gen != self.generation: return None
+            proc = self.proc = subprocess.Popen(
+                cmd, stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                text=True, errors="replace", startupinfo=startupinfo
+            )
+        out, _ = proc.communicate(stdin_text)
+        if gen != self.generation: return None
+        return out
+
+    def _check_c(self, gen, code):
+        # STRICT MODE
+        if not self.backend.has_gcc:
+            return False, "ERROR: GCC (MinGW) is not installed or not found in PATH."
+        # Source comes in on stdin, so nothing is written to the workspace
+        cmd = [self.backend.gcc_path, "-x", "c", "-fsyntax-only", "-fdiagnostics-format=json", "-I", self.workspace_dir, "-"]
+        out = self._spawn(gen, cmd, code)
+        if out is None: return None
+        return True, parse_gcc_json(out)
+
+    def _check_java(self, gen, code, filename):
+        # STRICT MODE
+        if not self.backend.has_java:
+            return False, "ERROR: Java Development Kit (JDK) is not installed or not found in PATH."
+        # javac has no syntax-only mode: compile a scratch copy into a throwaway dir
+        with tempfile.TemporaryDirectory() as tmp:
+            src = os.path.join(tmp, os.path.basename(filename))
+            with open(src, "w") as f: f.write(code)
+            out = self._spawn(gen, [self.backend.java_path, "-proc:none", "-d", tmp, src])
+        if out is None: return None
+        return True, parse_javac(out)
+
+
+def parse_gcc_json(out, source="<stdin>"):
+    # -fdiagnostics-format=json -> [{"line", "col", "end_col", "kind", "message"}] for the
+    # checked source only. Issues inside included headers would land on unrelated editor
+    # lines, so they are folded into one summary entry with line None.
+    start = out.find("[")
+    if start < 0: return []
+    try: data = json.loads(out[start:])
+    except ValueError: return []
+    diags, elsewhere = [], []
+    # gcc 12 may nest later diagnostics under an earlier one's children; notes stay out
+    items = [x for d in data for x in [d] + d.get("children", []) if x.get("kind", "error") != "note"]
+    for d in items:
+        locs = d.get("locations") or [{}]
+        caret = locs[0].get("caret", {})
+        finish = locs[0].get("finish", caret)
+        col = max(1, caret.get("column", 1))  # "at end of input" comes with column -1
+        entry = {
+            "line": caret.get("line", 1), "col": col,
+            "end_col": max(col, finish.get("column", col)) + 1,
+            "kind": d.get("kind", "error"), "message": d.get("message", "")
+        }
+        if caret.get("file", source) == source: diags.append(entry)
+        else: elsewhere.append((os.path.basename(caret["file"]), entry))
+    if elsewhere:
+        name, first = elsewhere[0]
+        diags.append({"line": None, "col": 1, "end_col": 1,
+                      "kind": "error" if any(e["kind"] == "error" for _, e in elsewhere) else "warning",
+                      "message": f"{len(elsewhere)} issue(s) in included headers (first: {name}:{first['line']}: {first['message']})"})
+    return diags
+
+def parse_javac(out):
+    # "Hello.java:3: error: ';' expected" followed by the source line and a caret line
+    diags = []
+    lines = out.splitlines()
+    for i, line in enumerate(lines):
+        m = _JAVAC_DIAG_RE.match(line)
+        if not m: continue
+        col = 1
+        if i + 2 < len(lines) and "^" in lines[i + 2]:
+            col = lines[i + 2].index("^") + 1
+        diags.append({"line": int(m.group(2)), "col": col, "end_col": col + 1,
+                      "kind": m.group(3), "message": m.group(4)})
+    return diags
@@ -1,11 +1,32 @@
 import customtkinter as ctk
 import os
 import re
-from backend import CompilerBackend, SOURCE_FILE_C, SOURCE_FILE_JAVA, GCC_CMD
-from ui_components import Sidebar, Console, EditorArea
+from backend import CompilerBackend, SOURCE_FILE_C, SOURCE_FILE_JAVA, GCC_CMD, file_hash
+from ui_components import Sidebar, Console, EditorArea, highlight_runs
+from search_index import SearchIndex
+from pipeline import Pipeline, Stage
+from session import SessionStore
+from live_check import LiveChecker
+from patcher import apply_script, format_report, PatchError
+from delta import make_delta, DeltaError
+from bindiff import diff_runs, group_ranges, render_hex, format_ranges
+from triage import class_sections
+from timing import parse_time_report, parse_time_trace, record_run, format_timing
+from dwarf_lines import line_table, map_disassembly, strip_debug_asm, DwarfError
+from cfg import list_functions, disassemble_function, stream_objdump, stream_javap, render_cfgs, render_function, function_row
+from pch import PchCache, header_prefix, check_preprocessed, format_pch
+from linkmap import LINKERS, available_linkers, analyse as analyse_links, format_links
+from bench import benchmark, benchmark_java, build_runner, record as record_bench, format_bench
 from pygments.lexers import CLexer, GasLexer
 import threading
 import shutil
+import tempfile
+import json
+import subprocess
+import struct
+
+EAGER_FUNCTIONS = 64 # Functions disassembled up front in the Disasm step; the rest load on click
+SEARCH_LIMIT = 200   # Hits listed per query
 
 class CompilationApp(ctk.CTk):
     def __init__(self):
@@ -20,11 +41,30 @@ class CompilationApp(ctk.CTk):
         
         # Backend
         self.backend = CompilerBackend()
+        self.search_index = SearchIndex(self.backend)
+        self._search_query = ""
+        self._search_hits = []
+        self._search_pos = 0
         
         # State
         self.language = "C"
         self.step_index = 0
         self.steps = [] 
+        self._busy = False
+        self._stage_cache = {"C": {}, "Java": {}} # Stage results, validated by file stamps
+        self._prefetching = {"C": {}, "Java": {}} # Sibling stages still running in the background
+        self._lane_step = {"C": 0, "Java": 0} # Last step shown per lane
+        self.session = SessionStore(self.workspace_dir)
+        self.live_checker = LiveChecker(self.backend, self.workspace_dir)
+        self.live_mode = False
+        self._live_job = None
+        self.timing_mode = False # Compile with -ftime-report
+        self.bench_mode = False # Benchmark the program in the Execution step
+        self.link_mode = False # Link with every installed linker, dynamic + static
+        self.pch = PchCache(self.backend.gcc_path, self.workspace_dir) # Precompiled header prefixes (C lane)
+        self._shown_content = None # Content dict currently in the panes
+        self._line_maps = None # (line_pairs, src->asm lines, asm->src line) for click mapping
+        self._target_stage = None # Stage the user asked for (may post partial results)
         self.current_java_file = os.path.join(self.workspace_dir, "Hello.java")
         
         # Layout
@@ -37,7 +77,12 @@ class CompilationApp(ctk.CTk):
             save_callback=self.save_source,
             break_callback=self.break_code,
             reset_callback=self.reset_sim,
-            lang_callback=self.change_language
+            lang_callback=self.change_language,
+            jump_callback=self.jump_to_step,
+            live_callback=self.set_live_mode,
+            timing_callback=self.set_timing_mode,
+            bench_callback=self.set_bench_mode,
+            link_callback=self.set_link_mode
         )
         self.sidebar.btn_restore.configure(command=self.restore_defaults)
         
@@ -53,13 +98,18 @@ class CompilationApp(ctk.CTk):
         self.main_paned.grid(row=0, column=0, sticky="nsew")
         
         # Top: Editor
-        self.editor = EditorArea(self.main_paned) 
+        self.editor = EditorArea(self.main_paned, search_callback=self.search_artifacts)
         self.main_paned.add(self.editor, minsize=400, stretch="always")
         
         # Bottom: Console
         self.console = Console(self.main_paned)
         self.main_paned.add(self.console, minsize=100, stretch="never")
 
+        # Live check: debounce keystrokes in the step-0 editor
+        self.editor.txt_left.bind("<KeyRelease>", self._on_editor_key, add="+")
+        self.editor.txt_left.bind("<ButtonRelease-1>", lambda e: self._on_pane_click("left", e), add="+")
+        self.editor.txt_right.bind("<ButtonRelease-1>", lambda e: self._on_pane_click("right", e), add="+")
+
         # Zoom State
         self.current_scale = 1.0
         self._zoom_job = None
@@ -69,9 +119,10 @@ class CompilationApp(ctk.CTk):
         self.bind("<Control-equal>", self.zoom_in)
         self.bind("<Control-minus>", self.zoom_out)
 
-        # Initial Render
+        # Initial Render (previous session if its sources are unchanged)
         self._define_steps()
-        self.reset_sim()
+        if not self._restore_session():
+            self.reset_sim()
 
     def zoom_in(self, event=None):
         if self.current_scale < 2.0:
@@ -112,11 +163,227 @@ class CompilationApp(ctk.CTk):
 
     # --- Step Control ---
     def change_language(self, choice):
+        if choice == self.language: return
+        self._lane_step[self.language] = self.step_index
         self.language = choice
         self.console.log(f"Switched to {self.language}")
         self._define_steps() # Recalculate steps
-        self.current_java_file = os.path.join(self.workspace_dir, "Hello.java")
-        self.reset_sim()
+
+        # Artifacts and cached results of both lanes are kept, so coming back is instant
+        self.step_index = self._lane_step[choice]
+        self.sidebar.set_next_text("NEXT STEP >")
+        self.refresh_ui()
+
+    # --- Live Check ---
+    def set_live_mode(self, enabled):
+        self.live_mode = enabled
+        self.console.log(f"Live check {'enabled' if enabled else 'disabled'}.")
+        if enabled: self._schedule_live_check()
+        else: self.editor.mark_diagnostics([])
+
+    def _on_editor_key(self, event=None):
+        if self.live_mode and self.step_index == 0:
+            self._schedule_live_check()
+
+    def _schedule_live_check(self):
+        if self._live_job:
+            self.after_cancel(self._live_job)
+        self._live_job = self.after(150, self._run_live_check)
+
+    def _run_live_check(self):
+        self._live_job = None
+        code = self.editor.txt_left.get("0.0", "end-1c")
+        fname = SOURCE_FILE_C if self.language == "C" else self._get_java_filename(code)
+        # Newer edits cancel the in-flight check inside LiveChecker
+        self.live_checker.check_async(self.language, code, fname,
+                                      lambda ok, diags: self.after(0, self._apply_live_result, ok, diags))
+
+    def _apply_live_result(self, ok, diags):
+        if not self.live_mode or self.step_index != 0: return
+        if not ok:
+            # STRICT MODE: tool missing -> switch live mode off again
+            self.console.log(diags, error=True)
+            self.sidebar.live_var.set(False)
+            self.live_mode = False
+            return
+
+        self.editor.mark_diagnostics(diags)
+        report = "\n".join(f"{d['line']}:{d['col']}: {d['kind']}: {d['message']}" if d["line"] is not None
+                           else f"{d['kind']}: {d['message']}" for d in diags)
+        self.editor.lbl_right.configure(text=f"Live Diagnostics ({len(diags)})")
+        self.editor.apply_highlighting(self.editor.txt_right, report or "No problems found.", None)
+
+    # --- Source <-> Disassembly Mapping ---
+    def _on_pane_click(self, side, event):
+        c = self._shown_content
+        if not c: return
+        tb = getattr(self.editor, f"txt_{side}")._textbox
+        line = int(tb.index(f"@{event.x},{event.y}").split(".")[0]) - 1
+
+        # CFG navigation: function list entries and block edges
+        if side == "right":
+            target = dict(map(tuple, c.get("anchors", []))).get(line)
+            if target is not None:
+                self.editor.highlight_lines(self.editor.txt_right, [target])
+                return
+            lazy = {e[0]: e for e in c.get("lazy_funcs", [])}
+            if line in lazy:
+                self._load_function(c, lazy[line])
+                return
+
+        pairs = c.get("line_pairs")
+        if not pairs: return
+        if self._line_maps is None or self._line_maps[0] is not pairs:
+            src_to_asm, asm_to_src = {}, {}
+            for src, asm in pairs:
+                src_to_asm.setdefault(src, []).append(asm)
+                asm_to_src[asm] = src
+            self._line_maps = (pairs, src_to_asm, asm_to_src)
+        _, src_to_asm, asm_to_src = self._line_maps
+
+        src = line if side == "left" else asm_to_src.get(line)
+        if src is None or src not in src_to_asm: return
+        self.editor.highlight_lines(self.editor.txt_left, [src])
+        self.editor.highlight_lines(self.editor.txt_right, src_to_asm[src])
+
+    def _load_function(self, c, entry):
+        # Lazily disassemble one listed function and append its CFG to the pane
+        row, name, start, stop = entry
+        func = {"name": name, "start": start, "stop": stop}
+        self.console.log(f"Disassembling {name} ({start:#x}-{stop:#x})...")
+
+        def work():
+            try:
+                g = disassemble_function(self.backend, c["cfg_binary"], func)
+            except RuntimeError as e:
+                self.after(0, self.console.log, str(e), True)
+                return
+            self.after(0, finish, g)
+
+        def finish(g):
+            if entry not in c.get("lazy_funcs", []): return  # Loaded meanwhile
+            lines = c["right_text"].split("\n")
+            lines[row] = function_row(func, g)
+            body, links = render_function(g, True, len(lines))
+            c["right_text"] = "\n".join(lines + body)
+            c["anchors"] = c.get("anchors", []) + links + [[row, len(lines)]]
+            c["lazy_funcs"] = [e for e in c["lazy_funcs"] if e is not entry]
+            c.pop("right_runs", None)  # Text changed; re-lex
+            if self._shown_content is c:
+                self.editor.apply_highlighting(self.editor.txt_right, c["right_text"], c.get("right_lexer"))
+                self.editor.highlight_lines(self.editor.txt_right, [len(lines)])
+
+        threading.Thread(target=work, daemon=True).start()
+
+    def _show_partial(self, stage, title, text):
+        # Early output of a long-running stage (only while it is the one being shown)
+        if self._target_stage != stage or not self._busy: return
+        self.editor.lbl_right.configure(text=title)
+        self.editor.apply_highlighting(self.editor.txt_right, text, None)
+
+    # --- Phase Timing ---
+    def set_timing_mode(self, enabled):
+        self.timing_mode = enabled
+        # The cached results were made with the other setting (timed builds skip the PCH)
+        self._stage_cache["C"].pop("Preprocessing", None)
+        self._stage_cache["C"].pop("Compilation", None)
+        self.console.log(f"Phase timing {'enabled' if enabled else 'disabled'} (applies to the Compilation step).")
+
+    def _compile_timing(self, res, cmd_out, f_pre, flags):
+        # gcc -ftime-report table (+ clang -ftime-trace when installed), stored next to the .s
+        reports = {"gcc": parse_time_report(cmd_out)}
+        if self.backend.has_clang:
+            with tempfile.TemporaryDirectory() as tmp:
+                cmd = f'"{self.backend.clang_path}" -S -ftime-trace -ftime-trace-granularity=0 {flags} -x cpp-output {f_pre} -o {os.path.join(tmp, "hello.s")}'
+                res["log"] += f"Running: {cmd}\n"
+                success, out = self.backend.run_cmd(cmd)
+                traces = [f for f in os.listdir(tmp) if f.endswith(".json")]
+                if success and traces:
+                    reports["clang"] = parse_time_trace(os.path.join(tmp, traces[0]))
+                else:
+                    res["log"] += f"clang -ftime-trace unavailable: {out.strip()[:200]}\n"
+        return reports
+
+    # --- Benchmark ---
+    def set_bench_mode(self, enabled):
+        self.bench_mode = enabled
+        self.console.log(f"Benchmark mode {'enabled' if enabled else 'disabled'} (applies to the Execution step).")
+
+    def _run_benchmark(self, res, lane, source, binary, cmd, java_class=None):
+        # Runs after the normal execution; returns the report text (or None on failure)
+        self.after(0, self._show_partial, "Execution", "Run Result", res["content"]["right_text"] + "\n\nBenchmarking...")
+        res["log"] += f"\nBenchmarking: {' '.join(cmd)}\n"
+        try:
+            runner = build_runner(self.backend.gcc_path, self.workspace_dir)  # Isolated max RSS (POSIX)
+            if java_class:
+                result = benchmark_java(cmd[0], self.backend.java_path, self.workspace_dir, java_class, runner=runner)
+            else:
+                result = benchmark(cmd, runner=runner)
+            result["binary_hash"] = file_hash(binary)
+            previous = record_bench(self.workspace_dir, lane, file_hash(source), result["binary_hash"], result)
+        except (OSError, subprocess.CalledProcessError) as e:
+            res["log"] += f"Benchmark failed: {e}\n"
+            return None
+        report = format_bench(result, previous)
+        res["log"] += report + "\n"
+        return report
+
+    # --- Link Analysis ---
+    def set_link_mode(self, enabled):
+        self.link_mode = enabled
+        self._stage_cache["C"].pop("Linking", None)
+        self.console.log(f"Link analysis {'enabled' if enabled else 'disabled'} (applies to the Linking step).")
+
+    def _link_analysis(self, res, f_obj, f_exe):
+        # Every installed linker x dynamic/-static; raw results saved next to the executable
+        linkers = available_linkers(self.backend.gcc_path)
+        missing = [l for l in LINKERS if l not in linkers]
+        res["log"] += f"\nLink analysis with: {', '.join(linkers)}" + (f" (not installed: {', '.join(missing)})" if missing else "") + "\n"
+        progress = lambda done: self.after(0, self._show_partial, "Linking", f"Link Analysis ({len(done)}/{len(linkers) * 2}) - linking...", format_links(done, missing))
+        results = analyse_links(self.backend.gcc_path, [f_obj], linkers, progress=progress)
+        with open(f_exe + ".links.json", "w") as f: json.dump(results, f)
+        res["log"] += f"Link analysis saved to {f_exe}.links.json\n"
+        return format_links(results, missing)
+
+    # --- Session Snapshot ---
+    def _restore_session(self):
+        try:
+            lanes = self.session.load()
+        except Exception as e:
+            self.console.log(f"Session restore failed: {e}", error=True)
+            return False
+        if self.language not in lanes: return False
+
+        for lang, lane in lanes.items():
+            self._stage_cache[lang].update(lane["cache"])
+            self._lane_step[lang] = lane["step"]
+            if lang == "Java": self.current_java_file = lane["source"]
+
+        self.step_index = min(self._lane_step[self.language], len(self.steps) - 1)
+        summary = ", ".join(f"{lang}: {len(lane['cache'])} steps" for lang, lane in lanes.items())
+        self.console.log(f"Session restored ({summary}).")
+        self.refresh_ui()
+        return True
+
+    def _save_session(self):
+        # Called from the step thread after each step
+        self._lane_step[self.language] = self.step_index
+        lanes = {
+            "C": {"source": SOURCE_FILE_C, "step": self._lane_step["C"], "cache": dict(self._stage_cache["C"])},
+            "Java": {"source": self.current_java_file, "step": self._lane_step["Java"], "cache": dict(self._stage_cache["Java"])}
+        }
+        try:
+            self.session.save(lanes)
+        except Exception as e:
+            self.after(0, self.console.log, f"Session save failed: {e}", True)
+
+    def _precompute_highlighting(self, res):
+        # Lex in the background; the UI just replays the stored runs
+        c = res.get("content")
+        if not c: return
+        for side in ("left", "right"):
+            if c.get(f"{side}_lexer") and f"{side}_runs" not in c:
+                c[f"{side}_runs"] = highlight_runs(c[f"{side}_text"], c[f"{side}_lexer"])
 
     def restore_defaults(self):
         # Determine correct filename based on context or default
@@ -157,19 +424,26 @@ class CompilationApp(ctk.CTk):
         self.sidebar.btn_next.configure(state="disabled")
         
         # Trigger Step 0
+        self._busy = True
         threading.Thread(target=self._run_step_thread, daemon=True).start()
 
     def next_step(self):
+        self.jump_to_step(self.step_index + 1)
+
+    def jump_to_step(self, idx):
+        # Any step can be opened directly; the pipeline runs only missing prerequisites
+        if self._busy: return
+
         # Auto-save current content if it's the source step
         if self.step_index == 0:
             self.save_source(reset=False)
 
-        self.step_index += 1
-        if self.step_index >= len(self.steps):
-            self.step_index = len(self.steps) - 1
+        if idx >= len(self.steps):
             self.sidebar.set_next_text("DONE")
             return
             
+        self._busy = True
+        self.step_index = idx
         self.sidebar.highlight(self.step_index)
         self.sidebar.set_next_text("Processing...")
         self.sidebar.enable_controls(False) # Disable all during processing
@@ -184,24 +458,40 @@ class CompilationApp(ctk.CTk):
         lang = self.language
         
         try:
-            if lang == "C":
-                result = self.prepare_c_step(idx)
-            else:
-                result = self.prepare_java_step(idx)
+            pipeline = self._c_pipeline() if lang == "C" else self._java_pipeline()
+            self._target_stage = self.steps[idx]
+            ran, failed, result = pipeline.run(self.steps[idx])
+            if failed: idx = self.steps.index(failed) # Show the stage that broke
+            for res in [result] + [r for _, r in ran]:
+                self._precompute_highlighting(res)
             
             # Schedule UI update
-            self.after(0, self._apply_step_result, result)
+            self.after(0, self._apply_step_result, result, idx, ran)
+
+            # Keep the search index and session snapshot in sync (only changed artifacts are re-read)
+            self.search_index.refresh(self.workspace_dir)
+            self._save_session()
+            self.pch.measure_pending() # New PCHs are timed now that the step is shown
         except Exception as e:
+            self._busy = False
             self.after(0, self.console.log, f"Thread Error: {e}", True)
 
-    def _apply_step_result(self, result):
+    def _apply_step_result(self, result, idx=None, ran=()):
         # Back on Main Thread
+        self._busy = False
+        if idx is not None: self.step_index = idx
+        self.sidebar.highlight(self.step_index)
         self.sidebar.set_next_text("NEXT STEP >")
         self.sidebar.btn_next.configure(state="normal")
         
         # Header
         self.editor.set_header(f"Step {self.step_index}: {self.steps[self.step_index]}")
         
+        # Prerequisites that had to run first
+        for name, res in ran:
+            if res is result: continue
+            self.console.log(f"[{name}] {res.get('log', '').strip()}")
+
         # Logs
         if "log" in result: self.console.log(result["log"])
         if "error" in result: self.console.log(result["error"], error=True)
@@ -226,13 +516,53 @@ class CompilationApp(ctk.CTk):
                 c["left_text"], c["right_text"], 
                 c.get("left_title", "Input"), c.get("right_title", "Output"),
                 c.get("left_lexer"), c.get("right_lexer"),
-                c.get("left_editable", False)
+                c.get("left_editable", False),
+                c.get("left_runs"), c.get("right_runs"),
+                c.get("left_marks"), c.get("right_marks")
             )
+            self._shown_content = c
 
         # Controls
         is_step_0 = (self.step_index == 0)
         self.sidebar.enable_controls(is_step_0)
 
+    # --- Global Search ---
+    def search_artifacts(self, query):
+        query = query.strip()
+        if not query: return
+
+        # Same query again = jump to next hit
+        if query == self._search_query and self._search_hits:
+            self._search_pos = (self._search_pos + 1) % len(self._search_hits)
+        else:
+            self._search_query = query
+            hits = self.search_index.search(query, SEARCH_LIMIT + 1)  # One extra tells us the list was cut
+            self._search_hits = hits[:SEARCH_LIMIT]
+            self._search_pos = 0
+            if len(hits) > SEARCH_LIMIT:
+                self.console.log(f"Search '{query}': more than {SEARCH_LIMIT} hits, showing the first {SEARCH_LIMIT}")
+            else:
+                self.console.log(f"Search '{query}': {len(hits)} hit(s)")
+
+        if not self._search_hits: return
+        self._show_search_hit(self._search_hits[self._search_pos])
+
+    def _show_search_hit(self, hit):
+        # Hit list in the explanation box, the matching artifact view in the read-only right pane.
+        # The left pane is left alone: on step 0 it is the source, which is saved on the next jump.
+        listing = [f"Search: {self._search_query} ({self._search_pos + 1}/{len(self._search_hits)})"]
+        listing += [f"{'>' if i == self._search_pos else ' '} {os.path.basename(h['path'])} [{h['view']}] "
+                    f"line {h['line'] + 1} @ {h['offset']:#x}: {h['text'].strip()}"
+                    for i, h in enumerate(self._search_hits)]
+        self.editor.set_explanation("\n".join(listing))
+        self.editor.highlight_line(self.editor.expl_box, self._search_pos + 1)
+
+        lexer = GasLexer() if hit["view"] in ("assembly", "disasm") else (CLexer() if hit["view"] in ("source", "preprocessed") else None)
+        self.editor.lbl_right.configure(text=f"{os.path.basename(hit['path'])} [{hit['view']}]")
+        self.editor.apply_highlighting(self.editor.txt_right, self.search_index.view_text(hit["path"], hit["view"]), lexer)
+        self.editor.highlight_line(self.editor.txt_right, hit["line"])
+        self._shown_content = None # Right pane no longer matches the step's anchors
+
     # --- Logic Generators (Background Safe) ---
     # These return dicts: { "success": bool, "log": str, "explanation": str, "content": {...} }
 
@@ -242,9 +572,8 @@ class CompilationApp(ctk.CTk):
             return f"[SUCCESS] Generated {fname} ({size} bytes)"
         return ""
 
-    def prepare_c_step(self, idx):
+    def _c_pipeline(self):
         bk = self.backend
-        res = {"success": True, "log": ""}
         
         # Define paths within workspace
         f_src = SOURCE_FILE_C # Already source_code/hello.c
@@ -252,8 +581,12 @@ class CompilationApp(ctk.CTk):
         f_asm = os.path.join(self.workspace_dir, "hello.s")
         f_obj = os.path.join(self.workspace_dir, "hello.o")
         f_exe = os.path.join(self.workspace_dir, "hello.exe")
+        f_patched = os.path.join(self.workspace_dir, "hello_patched.exe") # Patching output
+        f_script = os.path.join(self.workspace_dir, "patch_c.json") # Optional patch script
+        c_flags = "-g" # Debug line tables drive the source <-> disassembly mapping (PCHs are built with the same flags)
         
-        if idx == 0: # Source
+        def source(): # Source
+            res = {"success": True, "log": ""}
             # Ensure code exists and is not empty
             default_c = '#include <stdio.h>\n\nint main() {\n    printf("Hello from C!\\n");\n    return 0;\n}'
             if not os.path.exists(f_src) or os.path.getsize(f_src) == 0:
@@ -268,12 +601,32 @@ class CompilationApp(ctk.CTk):
                 "left_title": "Source Code (Editable)", "right_title": "Output",
                 "left_lexer": CLexer(), "left_editable": True
             }
-            
-        elif idx == 1: # Preprocessing
+            return res
+
+        def preprocess(): # Preprocessing
+            res = {"success": True, "log": ""}
             res["explanation"] = "Preprocessing: Expansion & Cleanup.\n\nBEFORE compilation, the Preprocessor handles directives like '#include'.\n\nIt expands the contents of header files (like stdio.h) into your file."
+            header = None
+            # Leading #include block -> precompiled header (not for timed builds, which measure a full parse)
+            prefix = header_prefix(self.read_file(f_src)) if bk.has_gcc and not self.timing_mode else []
+            if prefix:
+                try:
+                    header, manifest, built = self.pch.get(prefix, c_flags, self.workspace_dir)
+                    if manifest.get("rejected"): res["log"] += f"PCH skipped: {manifest['rejected']}\n"
+                except (OSError, RuntimeError) as e:
+                    res["log"] += f"PCH unavailable, expanding headers in full: {e}\n"
             cmd = f"{GCC_CMD} -E {f_src} -o {f_pre}"
-            res["log"] += f"Running: {cmd}\n"
-            success, out = bk.run_cmd(cmd, filename=f_pre)
+            pch_args = f" -fpch-preprocess -iquote {self.workspace_dir} -include {header}" if header else ""
+            res["log"] += f"Running: {cmd}{pch_args}\n"
+            success, out = bk.run_cmd(cmd + pch_args, filename=f_pre)
+
+            used, stray = check_preprocessed(f_pre) if success and header else (False, None)
+            if stray:
+                # Unguarded header: the PCH and the #include line would both define its contents
+                self.pch.reject(manifest, f"{stray} has no include guard")
+                res["log"] += f"PCH dropped: {stray} has no include guard. Running: {cmd}\n"
+                success, out = bk.run_cmd(cmd, filename=f_pre)
+                used = False
             
             res["success"] = success
             if not success: 
@@ -281,15 +634,23 @@ class CompilationApp(ctk.CTk):
                 return res
             
             res["log"] += self._log_file_saved(f_pre)
+            if used:
+                res["log"] += "\n" + format_pch(manifest, built) + "\n"
+                res["explanation"] += "\n\nPrecompiled Header:\nThe #include block at the top was already compiled into a .gch file. The '#pragma GCC pch_preprocess' line stands in for those headers, and the compiler loads the saved result instead of parsing them again."
+            elif header: res["log"] += "\ngcc rejected the PCH; headers were expanded in full.\n"
             res["content"] = {
                 "left_text": self.read_file(f_src), "right_text": self.read_file(f_pre),
-                "left_title": "Source", "right_title": "Preprocessed (Expanded)",
+                "left_title": "Source", "right_title": "Preprocessed (headers from PCH)" if used else "Preprocessed (Expanded)",
                 "left_lexer": CLexer(), "right_lexer": CLexer()
             }
-            
-        elif idx == 2: # Compilation
+            return res
+
+        def compile_asm(): # Compilation
+            res = {"success": True, "log": ""}
             res["explanation"] = "Compilation: C to Assembly.\n\nThe Compiler translates the messy preprocessed C code into Assembly Language.\n\nWhat is Assembly?\nIt's a low-level, human-readable representation of CPU instructions. It's specific to the processor architecture (like x86-64)."
-            cmd = f"{GCC_CMD} -S {f_pre} -o {f_asm}"
+            flags = c_flags
+            timed = self.timing_mode
+            cmd = f"{GCC_CMD} -S {flags} {f_pre} -o {f_asm}" + (" -ftime-report" if timed else "")
             res["log"] += f"Running: {cmd}\n"
             success, out = bk.run_cmd(cmd, filename=f_asm)
             
@@ -298,12 +659,23 @@ class CompilationApp(ctk.CTk):
             else: 
                 res["log"] += self._log_file_saved(f_asm)
                 res["content"] = {
-                    "left_text": self.read_file(f_pre), "right_text": self.read_file(f_asm),
+                    "left_text": self.read_file(f_pre), "right_text": strip_debug_asm(self.read_file(f_asm)),
                     "left_title": "Preprocessed", "right_title": "Assembly (Instructions)",
                     "left_lexer": CLexer(), "right_lexer": GasLexer()
                 }
+                if timed:
+                    # Timing table replaces the preprocessed input beside the assembly
+                    reports = self._compile_timing(res, out, f_pre, flags)
+                    previous = record_run(f_asm, reports, file_hash(f_src), flags)
+                    res["log"] += f"Phase timing saved to {f_asm}.timing.json\n"
+                    c = res["content"]
+                    c["left_text"] = format_timing(reports, previous)
+                    c["left_title"] = "Phase Timing (-ftime-report)"
+                    del c["left_lexer"]
+            return res
 
-        elif idx == 3: # Assembling
+        def assemble(): # Assembling
+            res = {"success": True, "log": ""}
             res["explanation"] = "Assembling: Assembly to Machine Code.\n\nThe Assembler converts the text instructions (like 'mov', 'call') into raw binary opcodes (Machine Code).\n\nResult?\nAn 'Object File' (.o). It contains machine code, but it's incomplete. It has 'holes' where external functions like 'printf' should be."
             cmd = f"{GCC_CMD} -c {f_asm} -o {f_obj}"
             res["log"] += f"Running: {cmd}\n"
@@ -314,12 +686,14 @@ class CompilationApp(ctk.CTk):
             else:
                 res["log"] += self._log_file_saved(f_obj)
                 res["content"] = {
-                    "left_text": self.read_file(f_asm), "right_text": self.read_file(f_obj),
+                    "left_text": strip_debug_asm(self.read_file(f_asm)), "right_text": self.read_file(f_obj),
                     "left_title": "Assembly", "right_title": "Object File (Machine Code)",
                     "left_lexer": GasLexer()
                 }
+            return res
 
-        elif idx == 4: # Linking
+        def link(): # Linking
+            res = {"success": True, "log": ""}
             res["explanation"] = "Linking: Creating the Executable.\n\nThe Linker combines your Object File with System Libraries to create the final .exe.\n\nWhy does it get bigger?\nThe Linker adds:\n1. C Runtime (Startup code to initialize the app).\n2. Import Tables (telling Windows where to find 'printf').\n3. PE Headers (Metadata for the OS)."
             cmd = f"{GCC_CMD} {f_obj} -o {f_exe}"
             res["log"] += f"Running: {cmd}\n"
@@ -333,8 +707,14 @@ class CompilationApp(ctk.CTk):
                     "left_text": self.read_file(f_obj), "right_text": self.read_file(f_exe),
                     "left_title": "Object File", "right_title": "Executable (Complete)"
                 }
+                if self.link_mode:
+                    # Linker comparison replaces the object file beside the executable
+                    res["content"]["left_text"] = self._link_analysis(res, f_obj, f_exe)
+                    res["content"]["left_title"] = "Link Analysis (linker x mode)"
+            return res
 
-        elif idx == 5: # Execution - NEW
+        def execute(): # Execution
+            res = {"success": True, "log": ""}
             res["explanation"] = "Execution (User Mode).\n\nThis is how a normal user interacts with the program. They run it, provide input, and expect an output.\n\nKey Difference:\nThe user cares about the *Result* (Did it work?), not *How* it worked."
             res["log"] += f"Running: {f_exe}\n"
             success, out = bk.run_cmd(f_exe)
@@ -343,8 +723,13 @@ class CompilationApp(ctk.CTk):
                 "left_text": self.read_file(f_exe), "right_text": f"OUTPUT:\n{out}",
                 "left_title": "Executable", "right_title": "Run Result"
             }
+            if self.bench_mode and success:
+                report = self._run_benchmark(res, "C", f_src, f_exe, [os.path.abspath(f_exe)])
+                if report: res["content"]["right_text"] += f"\n\n{report}"
+            return res
 
-        elif idx == 6: # RE: Recon (Strings) - OLD idx 5
+        def strings(): # RE: Recon (Strings)
+            res = {"success": True, "log": ""}
             res["explanation"] = "RE: Reconnaissance (Strings).\n\nBefore running unknown code, we check it statically. The 'strings' command scans the binary for readable ASCII text.\n\nGoal: identifying passwords, error messages, or hardcoded API keys."
             res["log"] += f"Running: strings {f_exe}"
             success, out = bk.run_cmd(f"strings {f_exe}")
@@ -352,29 +737,83 @@ class CompilationApp(ctk.CTk):
                 "left_text": self.read_file(f_exe), "right_text": out,
                 "left_title": "Executable", "right_title": "Strings Output"
             }
+            return res
 
-        elif idx == 7: # RE: Dynamic (Execution) - OLD idx 6
+        def dynamic(): # RE: Dynamic (Execution)
+            res = {"success": True, "log": ""}
             res["explanation"] = "RE: Dynamic Analysis (Hacker Mode).\n\nWe run the program again, but this time we are *investigating*. We act like a detective.\n\nWe test edge cases:\n- What happens if I enter a looong password? (Buffer Overflow?)\n- What if I enter symbols?\n- We monitor memory and CPU registers (using a Debugger)."
-            res["log"] += f"Running: {f_exe}\n"
-            success, out = bk.run_cmd(f_exe)
-            res["log"] += f"Process Finished. Output:\n{out}"
-            res["content"] = {
-                "left_text": self.read_file(f_exe), "right_text": f"OUTPUT:\n{out}",
-                "left_title": "Executable", "right_title": "Dynamic Analysis (Debugger Attached)"
-            }
+            res["log"] += f"Running under gdb: {f_exe}\n"
+            success, out = bk.debug_trace(f_exe)
+            if success:
+                res["log"] += "Debug session finished (breakpoints: main + imported calls)."
+                res["content"] = {
+                    "left_text": self.read_file(f_exe), "right_text": out,
+                    "left_title": "Executable", "right_title": "Dynamic Analysis (Debugger Attached)"
+                }
+            else:
+                # Degrade: report why, then show a plain run
+                res["error"] = out
+                res["log"] += f"Running: {f_exe}\n"
+                success, out = bk.run_cmd(f_exe)
+                res["log"] += f"Process Finished. Output:\n{out}"
+                res["content"] = {
+                    "left_text": self.read_file(f_exe), "right_text": f"OUTPUT:\n{out}",
+                    "left_title": "Executable", "right_title": "Dynamic Analysis (No Debugger)"
+                }
+            return res
 
-        elif idx == 8: # RE: Static (Disasm) - OLD idx 7
+        def disasm(): # RE: Static (Disasm)
+            res = {"success": True, "log": ""}
             res["explanation"] = "RE: Static Analysis (Disassembly).\n\nWe convert raw machine code back into Assembly to understand the logic flow.\n\nAssembly (ASM): The bridge between Code and Hardware. We can see exactly which registers are used and where jumps happen."
-            cmd = f"{GCC_CMD.replace('gcc','objdump')} -d {f_exe}"
-            res["log"] += f"Running: {cmd}"
-            success, out = bk.run_cmd(cmd)
+            try:
+                table = line_table(bk, f_exe) # DWARF line table (cached per executable)
+            except (DwarfError, OSError) as e:
+                table = None
+                res["log"] += f"No source map: {e}\n"
+
+            # Function list from the symbol table first, then per-function disassembly
+            res["log"] += f"Running: objdump -t {f_exe}\n"
+            funcs = list_functions(bk, f_exe)
+            cfgs = {}
+            try:
+                if funcs:
+                    self.after(0, self._show_partial, s[8], f"Functions ({len(funcs)}) - disassembling...",
+                               "\n".join(f"  {f['name']:<32} {f['start']:#08x} {f['stop'] - f['start']:>6} B" for f in funcs))
+                    # Functions from the source first, then the rest (others load on click)
+                    def from_source(f):
+                        hit = table.lookup(f["start"]) if table else None
+                        return hit is not None and os.path.basename(hit[0]) == os.path.basename(f_src)
+                    ours = [f for f in funcs if from_source(f)]
+                    eager = ours + [f for f in funcs if f not in ours][:max(EAGER_FUNCTIONS - len(ours), 0)]
+                    res["log"] += f"Disassembling {len(eager)} of {len(funcs)} function(s) with --start-address/--stop-address\n"
+                    for f in eager: cfgs[f["name"]] = disassemble_function(bk, f_exe, f)
+                else:
+                    # No usable symbols (stripped / PE): stream the whole binary instead
+                    res["log"] += f"No function symbols; streaming objdump -d {f_exe}\n"
+                    for g in stream_objdump(bk, f_exe):
+                        funcs.append({"name": g.name, "start": g.start})
+                        cfgs[g.name] = g
+            except RuntimeError as e:
+                res["success"] = False
+                res["error"] = str(e)
+                return res
+
+            text, anchors, lazy = render_cfgs(funcs, cfgs)
             res["content"] = {
-                "left_text": self.read_file(f_exe), "right_text": out,
-                "left_title": "Executable", "right_title": "Disassembly",
-                "right_lexer": GasLexer()
+                "left_text": self.read_file(f_src), "right_text": text,
+                "left_title": "Source (click a line)", "right_title": "Disassembly / CFG (click an instruction, function or edge)",
+                "left_lexer": CLexer(), "right_lexer": GasLexer(),
+                "anchors": anchors, "cfg_binary": f_exe,
+                "lazy_funcs": [[row, funcs[n]["name"], funcs[n]["start"], funcs[n]["stop"]] for row, n in lazy]
             }
+            if table:
+                pairs = map_disassembly(table, text, f_src)
+                res["content"]["line_pairs"] = pairs
+                res["log"] += f"Source map: {len(pairs)} instruction(s) mapped to {os.path.basename(f_src)}"
+            return res
 
-        elif idx == 9: # RE: Static (Decomp) - OLD idx 8
+        def decomp(): # RE: Static (Decomp)
+            res = {"success": True, "log": ""}
             res["explanation"] = "RE: Static Analysis (Decompilation).\n\nTools like Ghidra reconstruct high-level C code from ASM.\n\nNote: Variable names are lost (iVar1), and comments are gone. Complexity remains, but it's readable."
             res["log"] += "Simulating Decompiler (Ghidra-style)..."
             
@@ -389,49 +828,88 @@ class CompilationApp(ctk.CTk):
                 "left_title": f"Binary ({os.path.basename(exe_file)})", "right_title": "Decompiled C (Mock)",
                 "right_lexer": CLexer()
             }
+            return res
 
-        elif idx == 10: # RE: Solve (Patching) - OLD idx 9
+        def patch(): # RE: Solve (Patching)
+            res = {"success": True, "log": ""}
             res["explanation"] = "RE: The Solve (Patching).\n\nWe don't just watch; we change! We can edit the binary's bytes directly to alter its behavior.\n\nSimulation:\nWe will patch the binary to replace 'Hello' with 'HACKD'. No recompilation needed!"
-            
-            # Create a patched copy
-            f_patched = os.path.join(self.workspace_dir, "hello_patched.exe")
-            
-            # Simulate Patch logic
-            try:
-                if os.path.exists(f_exe):
-                    with open(f_exe, 'rb') as f: data = f.read()
-                    
-                    # Pattern match "Hello" -> "HACKD"
-                    # Only works if lengths match to avoid corrupting offsets
-                    patch_from = b"Hello"
-                    patch_to   = b"HACKD"
-                    
-                    if patch_from in data:
-                        new_data = data.replace(patch_from, patch_to, 1) # Replace first occurrence
-                        with open(f_patched, 'wb') as f: f.write(new_data)
-                        res["log"] += f"Patched 'Hello' -> 'HACKD' in binary.\nSaved to {f_patched}\n"
-                    else:
-                        res["log"] += "String 'Hello' not found for patching. Using original.\n"
-                        shutil.copy(f_exe, f_patched)
-                else:
-                    res["error"] = "Binary not found to patch."
-                    return res
-            except Exception as e:
-                res["log"] += f"Patching failed: {e}\n"
-                shutil.copy(f_exe, f_patched)
+
+            if not os.path.exists(f_exe):
+                res["error"] = "Binary not found to patch."
+                return res
+
+            # Pattern match "Hello" -> "HACKD" (same length, so offsets stay valid)
+            report = self._run_patch_script(res, f_script, {"name": "greeting", "string": "Hello", "replace_string": "HACKD", "limit": 1}, f_exe, f_patched)
 
             # Run patched
             res["log"] += f"Running: {f_patched}\n"
             success, out = bk.run_cmd(f_patched)
             res["log"] += f"Pwning complete. Output:\n{out}"
             
+            hex_text, marks = self._hex_diff(res, report, f_exe, f_patched)
             res["content"] = {
-                "left_text": f"[HEX VIEW]\nOriginal: ... 48 65 6c 6c 6f ... (Hello)\nPatched : ... 48 41 43 4b 44 ... (HACKD)", 
+                "left_text": hex_text, "left_marks": marks,
                 "right_text": f"OUTPUT:\n{out}",
                 "left_title": "Hex Editor Patch", "right_title": "Run Patched Binary"
             }
+            return res
 
-        return res
+        # Stage graph: name (= step title), deps, file inputs/outputs
+        s = self.steps
+        return Pipeline([
+            Stage(s[0], source, outputs=[f_src], cache=False),
+            Stage(s[1], preprocess, deps=[s[0]], inputs=[f_src], outputs=[f_pre]),
+            Stage(s[2], compile_asm, deps=[s[1]], inputs=[f_pre], outputs=[f_asm]),
+            Stage(s[3], assemble, deps=[s[2]], inputs=[f_asm], outputs=[f_obj]),
+            Stage(s[4], link, deps=[s[3]], inputs=[f_obj], outputs=[f_exe]),
+            # After linking, the read-only RE stages don't depend on each other and are prefetched together
+            Stage(s[5], execute, deps=[s[4]], inputs=[f_exe], cache=False),
+            Stage(s[6], strings, deps=[s[4]], inputs=[f_exe], prefetch=True),
+            Stage(s[7], dynamic, deps=[s[4]], inputs=[f_exe], cache=False),
+            Stage(s[8], disasm, deps=[s[4]], inputs=[f_exe], prefetch=True),
+            Stage(s[9], decomp, deps=[s[4]], inputs=[f_src, f_exe], prefetch=True),
+            Stage(s[10], patch, deps=[s[4]], inputs=[f_exe, f_script], outputs=[f_patched]),
+        ], cache=self._stage_cache["C"], prefetching=self._prefetching["C"])
+
+    def _run_patch_script(self, res, script_file, default_patch, src, dst):
+        # Workspace patch script if present, else the built-in demo patch
+        script = script_file if os.path.exists(script_file) else {"patches": [default_patch]}
+        res["log"] += f"Patch script: {script_file if isinstance(script, str) else 'built-in'}\n"
+        try:
+            report = apply_script(script, src, dst)
+        except (PatchError, OSError, ValueError) as e:
+            res["log"] += f"Patching failed: {e}\n"
+            shutil.copy(src, dst)
+            return None
+
+        if report["regions"]:
+            res["log"] += f"Patched {len(report['regions'])} region(s).\nSaved to {dst}\n"
+            # Compact record of the change (original + delta rebuilds the patched file)
+            try:
+                st = make_delta(src, dst, dst + ".delta")
+                res["log"] += f"Delta: {dst}.delta ({st['delta_size']} bytes vs {st['target_size']} byte copy)\n"
+            except (DeltaError, OSError) as e:
+                res["log"] += f"Delta failed: {e}\n"
+        else:
+            res["log"] += "No patch pattern matched. Using original.\n"
+        return report
+
+    def _hex_diff(self, res, report, original, patched):
+        # Patch report + byte diff of the files actually on disk, with changed bytes marked
+        head = format_report(report) if report else "[HEX VIEW]"
+        try:
+            sections = class_sections(original) if original.endswith(".class") else self.backend.section_table(original)
+            runs = diff_runs(original, patched, sections)
+            ranges = group_ranges(runs, sections)
+        except (OSError, ValueError, struct.error) as e:
+            res["log"] += f"Binary diff failed: {e}\n"
+            return head, []
+        if not ranges: return head + "\n\nNo changes.", []
+
+        head += "\n\n" + format_ranges(ranges, runs, original, patched) + "\n\n"
+        hex_text, marks = render_hex(original, patched, ranges)
+        first = head.count("\n")
+        return head + hex_text, [[line + first, c0, c1] for line, c0, c1 in marks]
 
     def _get_java_filename(self, content=None):
         default_name = "Hello.java"
@@ -480,6 +958,9 @@ class CompilationApp(ctk.CTk):
             self.current_java_file = fname
             
         code = self.editor.txt_left.get("0.0", "end-1c")
+
+        # Unchanged auto-save: keep the mtime so later stages stay up to date
+        if not reset and os.path.exists(fname) and self.read_file(fname) == code: return
         
         try:
             with open(fname, "w") as f:
@@ -492,9 +973,8 @@ class CompilationApp(ctk.CTk):
         except Exception as e:
             self.console.log(f"Save failed: {e}", error=True)
 
-    def prepare_java_step(self, idx):
+    def _java_pipeline(self):
         bk = self.backend
-        res = {"success": True, "log": ""}
         
         # Use tracked file
         java_file = self.current_java_file
@@ -504,7 +984,14 @@ class CompilationApp(ctk.CTk):
              java_file = os.path.join(self.workspace_dir, "Hello.java")
              self.current_java_file = java_file
 
-        if idx == 0:
+        base_name_full = os.path.splitext(java_file)[0] # source_code/Hello
+        base_name = os.path.basename(base_name_full) # Hello
+        class_file = f"{base_name_full}.class" # source_code/Hello.class
+        f_patched = os.path.join(self.workspace_dir, f"{base_name}Patched.class") # Patching output
+        f_script = os.path.join(self.workspace_dir, "patch_java.json") # Optional patch script
+
+        def source(): # Source
+            res = {"success": True, "log": ""}
             default_code = 'public class Hello {\n    public static void main(String[] args) {\n        System.out.println("Hello from Java!");\n    }\n}'
             
             # Use tracked file if exists, else create default in workspace
@@ -522,20 +1009,16 @@ class CompilationApp(ctk.CTk):
             }
             return res
 
-        # For Compilation+, strict use of tracked file
-        if not os.path.exists(java_file):
-            res["success"] = False
-            res["error"] = f"File {java_file} not found. Did you save?"
-            return res
-
-        base_name_full = os.path.splitext(java_file)[0] # source_code/Hello
-        base_name = os.path.basename(base_name_full) # Hello
-        class_file = f"{base_name_full}.class" # source_code/Hello.class
+        def compile_class(): # Compilation
+            res = {"success": True, "log": ""}
+            # Strict use of tracked file
+            if not os.path.exists(java_file):
+                res["success"] = False
+                res["error"] = f"File {java_file} not found. Did you save?"
+                return res
 
-        if idx == 1: # Compilation
             res["explanation"] = "Compilation: Source to Bytecode.\n\nThe 'javac' compiler translates your human-readable Java code into 'Bytecode' (the .class file).\n\nWhat is Bytecode?\nIt's a set of instructions for a 'Virtual Machine' (the JVM), not for your physical CPU. This is why Java can run on any OS that has a JVM."
             
-            # javac source_code/Hello.java (outputs .class in same dir by default)
             # javac source_code/Hello.java (outputs .class in same dir by default)
             cmd = f"javac {java_file}"
             res["log"] += f"Running: {cmd}\n"
@@ -550,8 +1033,10 @@ class CompilationApp(ctk.CTk):
                     "left_title": "Source Code", "right_title": "Bytecode (.class)",
                     "left_lexer": CLexer()
                 }
+            return res
 
-        elif idx == 2: # Execution - NEW
+        def execute(): # Execution
+            res = {"success": True, "log": ""}
             res["explanation"] = "Execution (User Mode).\n\nThe JVM loads the class file and runs it. This is standard usage.\n\nFrom a user's perspective, they just want to see 'Hello from Java!'."
             # java -cp source_code Hello
             cmd = f"java -cp {self.workspace_dir} {base_name}"
@@ -562,8 +1047,14 @@ class CompilationApp(ctk.CTk):
                 "left_text": self.read_file(class_file), "right_text": out,
                 "left_title": "Bytecode", "right_title": "Console Output"
             }
+            if self.bench_mode and success:
+                cmd = [bk.java_runtime or "java", "-cp", self.workspace_dir, base_name]
+                report = self._run_benchmark(res, "Java", java_file, class_file, cmd, java_class=base_name)
+                if report: res["content"]["right_text"] += f"\n\n{report}"
+            return res
 
-        elif idx == 3: # RE: Recon (Strings) - OLD idx 2
+        def strings(): # RE: Recon (Strings)
+            res = {"success": True, "log": ""}
             res["explanation"] = "RE: Reconnaissance (Strings).\n\nWe scan the .class file for readable text. This often reveals constant values, class names, and error messages."
             res["log"] += f"Running: strings {class_file}"
             success, out = bk.run_cmd(f"strings {class_file}")
@@ -571,8 +1062,10 @@ class CompilationApp(ctk.CTk):
                 "left_text": self.read_file(class_file), "right_text": out,
                 "left_title": "Bytecode", "right_title": "Strings Found"
             }
+            return res
 
-        elif idx == 4: # RE: Dynamic (Execution) - OLD idx 3
+        def dynamic(): # RE: Dynamic (Execution)
+            res = {"success": True, "log": ""}
             res["explanation"] = "RE: Dynamic Analysis (Hacker Mode).\n\nWe run the Java program again, but this time we attach a Debugger (JDB) or monitor the JVM memory.\n\nWe look for side effects:\n- Does it write to a file?\n- Does it open a network connection?\n- We pause execution to inspect variables."
             # java -cp source_code Hello
             cmd = f"java -cp {self.workspace_dir} {base_name}"
@@ -583,20 +1076,34 @@ class CompilationApp(ctk.CTk):
                 "left_text": self.read_file(class_file), "right_text": out,
                 "left_title": "Bytecode", "right_title": "Dynamic Run (Monitored)"
             }
+            return res
 
-        elif idx == 5: # RE: Static (Disasm) - OLD idx 4
+        def disasm(): # RE: Static (Disasm)
+            res = {"success": True, "log": ""}
             res["explanation"] = "RE: Static Analysis (javap).\n\nWe use 'javap' to disassemble Bytecode. This shows us the stack operations (push, pop, invoke) that the JVM performs."
             # javap -c -cp source_code Hello
-            cmd = f"javap -c -cp {self.workspace_dir} {base_name}"
+            cmd = f"javap -c -p -cp {self.workspace_dir} {base_name}"
             res["log"] += f"Running: {cmd}"
-            success, out = bk.run_cmd(cmd)
+            # Methods are parsed into basic blocks as javap streams them out
+            funcs, cfgs = [], {}
+            try:
+                for g in stream_javap(bk, self.workspace_dir, base_name):
+                    funcs.append({"name": g.name, "start": 0})
+                    cfgs[g.name] = g
+            except RuntimeError as e:
+                res["success"] = False
+                res["error"] = str(e)
+                return res
+            text, anchors, _ = render_cfgs(funcs, cfgs, hex_addrs=False)
             res["content"] = {
-                "left_text": self.read_file(class_file), "right_text": out,
-                "left_title": "Bytecode", "right_title": "JVM Opcodes",
-                "right_lexer": GasLexer()
+                "left_text": self.read_file(class_file), "right_text": text,
+                "left_title": "Bytecode", "right_title": "JVM Opcodes / CFG (click a method or edge)",
+                "right_lexer": GasLexer(), "anchors": anchors
             }
+            return res
 
-        elif idx == 6: # RE: Static (Decomp) - OLD idx 5
+        def decomp(): # RE: Static (Decomp)
+            res = {"success": True, "log": ""}
             res["explanation"] = "RE: Static Analysis (Decompilation).\n\nJava decompilation is extremely effective because the .class file preserves so much metadata.\n\nSimulation:\nWe simulate a tool like JD-GUI reconstructing the source."
             res["log"] += "Simulating Java Decompiler..."
             
@@ -609,45 +1116,42 @@ class CompilationApp(ctk.CTk):
                 "left_title": "Bytecode", "right_title": "Decompiled Source (Mock)",
                 "right_lexer": CLexer()
             }
+            return res
 
-        elif idx == 7: # RE: Solve (Patching) - OLD idx 6
+        def patch(): # RE: Solve (Patching)
+            res = {"success": True, "log": ""}
             res["explanation"] = "RE: The Solve (Patching Class Files).\n\nJava Bytecode can be edited too! Tools like 'Recaf' allow us to change instructions or constants.\n\nSimulation:\nWe will patch the 'Hello' string in the .class file to 'PWNED'."
-            
-            # Create a patched copy
-            f_patched = os.path.join(self.workspace_dir, f"{base_name}Patched.class")
-            
-            try:
-                if os.path.exists(class_file):
-                    with open(class_file, 'rb') as f: data = f.read()
-                    
-                    patch_from = b"Hello"
-                    patch_to   = b"PWNED"
-                    
-                    if patch_from in data:
-                        new_data = data.replace(patch_from, patch_to, 1)
-                        with open(f_patched, 'wb') as f: f.write(new_data)
-                        res["log"] += f"Patched 'Hello' -> 'PWNED' in class file.\nSaved to {f_patched}\n"
-                    else:
-                        res["log"] += "String 'Hello' not found. Copying original.\n"
-                        shutil.copy(class_file, f_patched)
-                else:
-                     res["error"] = "Class file not found."
-                     return res
-            except Exception as e:
-                res["log"] += f"Patch failed: {e}\n"
-                shutil.copy(class_file, f_patched)
+
+            if not os.path.exists(class_file):
+                res["error"] = "Class file not found."
+                return res
+
+            report = self._run_patch_script(res, f_script, {"name": "greeting", "string": "Hello", "replace_string": "PWNED", "limit": 1}, class_file, f_patched)
 
             # We can't easily run the patched class without renaming it properly in Java structure
             # But for simulation, we just show the HEX difference
             res["log"] += "Patching complete. Ready for injection."
             
+            hex_text, marks = self._hex_diff(res, report, class_file, f_patched)
             res["content"] = {
-                 "left_text": f"[HEX VIEW]\nOriginal: ... Hello ...\nPatched : ... PWNED ...",
+                 "left_text": hex_text, "left_marks": marks,
                  "right_text": "Visual Confirmation:\nThe string constant has been modified in the Bytecode Pool.",
                  "left_title": "Bytecode Patch", "right_title": "Result"
             }
-        
-        return res
+            return res
+
+        # After javac, every RE stage only needs the .class file; the read-only ones are prefetched together
+        s = self.steps
+        return Pipeline([
+            Stage(s[0], source, outputs=[java_file], cache=False),
+            Stage(s[1], compile_class, deps=[s[0]], inputs=[java_file], outputs=[class_file]),
+            Stage(s[2], execute, deps=[s[1]], inputs=[class_file], cache=False),
+            Stage(s[3], strings, deps=[s[1]], inputs=[class_file], prefetch=True),
+            Stage(s[4], dynamic, deps=[s[1]], inputs=[class_file], cache=False),
+            Stage(s[5], disasm, deps=[s[1]], inputs=[class_file], prefetch=True),
+            Stage(s[6], decomp, deps=[s[1]], inputs=[java_file, class_file], prefetch=True),
+            Stage(s[7], patch, deps=[s[1]], inputs=[class_file, f_script], outputs=[f_patched]),
+        ], cache=self._stage_cache["Java"], prefetching=self._prefetching["Java"])
 
     def reset_sim(self, preload_content=None):
         self.step_index = 0
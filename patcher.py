@@ -0,0 +1,342 @@
+import os
+import sys
+import json
+import mmap
+import re
+import shutil
+import argparse
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from delta import make_delta
+
+# Declarative binary patch engine.
+#
+# A patch script is JSON:
+#   {"patches": [
+#       {"name": "greeting", "string": "Hello", "replace_string": "HACKD", "limit": 1},
+#       {"name": "skip-check", "pattern": "74 ?? 48 8b", "replace": "eb", "expect": 1},
+#       {"name": "nop", "at": "0x1234", "pattern": "e8 ?? ?? ?? ??", "replace": "90 90 90 90 90"}
+#   ]}
+#
+#   pattern / string         bytes to find ("??" = any byte)
+#   replace / replace_string bytes written at match + offset (same length in, same length out)
+#   offset                   where to write, relative to the match start (default 0)
+#   expect                   exact number of matches required, else the script fails
+#   limit                    patch at most the first N matches
+#   at                       absolute file offset instead of searching (pattern, if given, is verified there)
+#
+# All search patterns are matched in a single Aho-Corasick pass over an mmap of the input.
+# The output is a clone of the input with only the patched regions rewritten: a reflink
+# (copy-on-write, no data copied) where the filesystem supports it, else an in-kernel copy.
+
+
+class PatchError(Exception):
+    pass
+
+
+# --- Script Parsing ---
+def _parse_hex(text, allow_wildcards):
+    out = []
+    for tok in text.replace(",", " ").split():
+        # Accept "4865" as well as "48 65"
+        pairs = [tok[i:i + 2] for i in range(0, len(tok), 2)] if len(tok) > 2 and "?" not in tok else [tok]
+        for p in pairs:
+            if p in ("??", "?"):
+                if not allow_wildcards: raise PatchError(f"Wildcards are not allowed in '{text}'")
+                out.append(None)
+            else:
+                try: out.append(int(p, 16))
+                except ValueError: raise PatchError(f"Bad hex byte '{p}' in '{text}'")
+    return out
+
+def _parse_int(value):
+    return int(value, 0) if isinstance(value, str) else int(value)
+
+class Patch:
+    def __init__(self, spec, index):
+        self.name = spec.get("name", f"patch{index}")
+        if "string" in spec: self.pattern = list(spec["string"].encode("latin-1"))
+        elif "pattern" in spec: self.pattern = _parse_hex(spec["pattern"], True)
+        else: self.pattern = None
+
+        if "replace_string" in spec: self.replace = spec["replace_string"].encode("latin-1")
+        elif "replace" in spec: self.replace = bytes(_parse_hex(spec["replace"], False))
+        else: raise PatchError(f"{self.name}: missing 'replace' / 'replace_string'")
+
+        self.offset = _parse_int(spec.get("offset", 0))
+        self.at = _parse_int(spec["at"]) if "at" in spec else None
+        self.expect = spec.get("expect")
+        self.limit = spec.get("limit")
+
+        if self.at is None and not self.pattern:
+            raise PatchError(f"{self.name}: needs a 'pattern'/'string' or an absolute 'at'")
+        if self.pattern is not None and all(b is None for b in self.pattern):
+            raise PatchError(f"{self.name}: pattern is all wildcards")
+        if self.pattern:
+            self.segments = _fixed_segments(self.pattern)
+            # Longest literal run is the Aho-Corasick needle; the rest is verified on hit
+            self.anchor_off, self.anchor = max(self.segments, key=lambda s: len(s[1]))
+
+    def matches_at(self, data, start):
+        if start < 0 or start + len(self.pattern) > len(data): return False
+        return all(data[start + off:start + off + len(seg)] == seg for off, seg in self.segments)
+
+def _fixed_segments(pattern):
+    # [(relative offset, literal bytes)] for every wildcard-free run
+    segs, run, run_start = [], [], 0
+    for i, b in enumerate(pattern + [None]):
+        if b is None:
+            if run: segs.append((run_start, bytes(run)))
+            run = []
+            run_start = i + 1
+        else:
+            run.append(b)
+    return segs
+
+def load_script(path_or_dict):
+    if isinstance(path_or_dict, dict): data = path_or_dict
+    else:
+        with open(path_or_dict, "r") as f: data = json.load(f)
+    specs = data.get("patches", []) if isinstance(data, dict) else data
+    if not specs: raise PatchError("Patch script has no patches.")
+    return [Patch(spec, i) for i, spec in enumerate(specs)]
+
+
+# --- Multi-pattern Search ---
+class AhoCorasick:
+    def __init__(self, needles):
+        # Trie + failure links, flattened into a dense 256-way table so the scan
+        # loop is a single list lookup per byte
+        goto, fail, out = [{}], [0], [[]]
+        for idx, needle in enumerate(needles):
+            s = 0
+            for b in needle:
+                if b not in goto[s]:
+                    goto.append({}); fail.append(0); out.append([])
+                    goto[s][b] = len(goto) - 1
+                s = goto[s][b]
+            out[s].append(idx)
+
+        table = [None] * len(goto)
+        table[0] = [goto[0].get(b, 0) for b in range(256)]
+        order = list(goto[0].values())  # BFS; depth-1 states fail to the root
+        i = 0
+        while i < len(order):
+            s = order[i]
+            i += 1
+            row = list(table[fail[s]])
+            for b, nxt in goto[s].items():
+                row[b] = nxt
+                fail[nxt] = table[fail[s]][b]
+                out[nxt] = out[nxt] + out[fail[nxt]]
+                order.append(nxt)
+            table[s] = row
+        self.table = table
+        self.out = out
+        self.lengths = [len(n) for n in needles]
+        self.first = re.compile(b"[" + b"".join(re.escape(bytes([b])) for b in sorted(goto[0])) + b"]")
+
+    def scan(self, data):
+        # Yields (start offset, needle index) for every occurrence, overlapping included.
+        # While in the root state, a regex over the needles' first bytes skips ahead at C speed.
+        table, out, lengths, first = self.table, self.out, self.lengths, self.first
+        state, i, n = 0, 0, len(data)
+        while i < n:
+            if state == 0:
+                m = first.search(data, i)
+                if not m: return
+                i = m.start()
+            state = table[state][data[i]]
+            i += 1
+            if out[state]:
+                for idx in out[state]:
+                    yield i - lengths[idx], idx
+
+def _find_all(patches, data):
+    # {patch index: sorted match starts}
+    found = {i: [] for i, p in enumerate(patches) if p.pattern and p.at is None}
+    if not found: return found
+
+    needles, owners = [], []
+    for i in found:
+        p = patches[i]
+        if p.anchor in needles: owners[needles.index(p.anchor)].append(i)
+        else:
+            needles.append(p.anchor)
+            owners.append([i])
+
+    if len(needles) == 1:
+        # One needle: the C-level find loop beats a Python automaton
+        hits = []
+        pos = data.find(needles[0])
+        while pos >= 0:
+            hits.append((pos, 0))
+            pos = data.find(needles[0], pos + 1)
+    else:
+        hits = AhoCorasick(needles).scan(data)
+
+    for pos, k in hits:
+        for i in owners[k]:
+            p = patches[i]
+            start = pos - p.anchor_off
+            if p.matches_at(data, start): found[i].append(start)
+    for starts in found.values(): starts.sort()
+    return found
+
+
+# --- Applying ---
+def apply_patches(patches, src, dst):
+    # Returns a report dict; raises PatchError when the script does not fit the file
+    size = os.path.getsize(src)
+    if size == 0: raise PatchError(f"{src} is empty.")
+
+    regions, counts = [], {}
+    with open(src, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        found = _find_all(patches, data)
+        for i, p in enumerate(patches):
+            if p.at is not None:
+                if p.pattern and not p.matches_at(data, p.at):
+                    raise PatchError(f"{p.name}: pattern not present at {p.at:#x}")
+                starts = [p.at]
+            else:
+                starts = found[i]
+            counts[p.name] = len(starts)
+            if p.expect is not None and len(starts) != int(p.expect):
+                raise PatchError(f"{p.name}: expected {p.expect} match(es), found {len(starts)}")
+            if p.limit is not None: starts = starts[:int(p.limit)]
+
+            for start in starts:
+                off = start + p.offset
+                if off < 0 or off + len(p.replace) > size:
+                    raise PatchError(f"{p.name}: write at {off:#x} (+{len(p.replace)}) is outside the file ({size} bytes)")
+                regions.append({"patch": p.name, "offset": off, "old": bytes(data[off:off + len(p.replace)]), "new": p.replace})
+
+    regions.sort(key=lambda r: r["offset"])
+    for a, b in zip(regions, regions[1:]):
+        if a["offset"] + len(a["new"]) > b["offset"]:
+            raise PatchError(f"{a['patch']} and {b['patch']} overlap at {b['offset']:#x}")
+
+    # Clone, then rewrite only the changed regions
+    _clone(src, dst)
+    with open(dst, "r+b") as f:
+        for r in regions:
+            f.seek(r["offset"])
+            f.write(r["new"])
+
+        # Verify: same length, every region holds the new bytes
+        f.seek(0, os.SEEK_END)
+        if f.tell() != size: raise PatchError(f"Output size {f.tell()} != input size {size}")
+        for r in regions:
+            f.seek(r["offset"])
+            if f.read(len(r["new"])) != r["new"]: raise PatchError(f"Verification failed at {r['offset']:#x}")
+
+    return {"input": src, "output": dst, "size": size, "matches": counts, "regions": regions}
+
+_FICLONE = 0x40049409  # Linux ioctl: share the source's extents (btrfs, XFS, bcachefs...)
+
+def _clone(src, dst):
+    # Reflink where the filesystem can, else copy_file_range (stays in the kernel and lets
+    # NFS/CIFS copy server-side), else shutil's copy (sendfile / fcopyfile / CopyFile).
+    # A plain copy is acceptable there: it is one sequential pass at disk speed, next to
+    # the Aho-Corasick scan that already reads the whole input.
+    if hasattr(os, "copy_file_range"):
+        try:
+            with open(src, "rb") as fin, open(dst, "wb") as fout:
+                try:
+                    import fcntl
+                    fcntl.ioctl(fout.fileno(), _FICLONE, fin.fileno())
+                except (ImportError, OSError):
+                    left = os.fstat(fin.fileno()).st_size
+                    while left > 0:
+                        n = os.copy_file_range(fin.fileno(), fout.fileno(), left)
+                        if n == 0: break
+                        left -= n
+                    if left: raise OSError("copy_file_range stopped early")
+            shutil.copymode(src, dst)
+            return
+        except OSError:
+            pass  # e.g. cross-device on old kernels
+    shutil.copy(src, dst)
+
+def apply_script(script, src, dst):
+    return apply_patches(load_script(script), src, dst)
+
+def format_report(report):
+    lines = [f"{report['input']} -> {report['output']} ({report['size']} bytes)"]
+    for name, n in report["matches"].items():
+        lines.append(f"  {name}: {n} match(es)")
+    for r in report["regions"]:
+        old = " ".join(f"{b:02x}" for b in r["old"])
+        new = " ".join(f"{b:02x}" for b in r["new"])
+        lines.append(f"  {r['offset']:#010x} [{r['patch']}]  {old}  ->  {new}")
+    return "\n".join(lines)
+
+
+# --- Bulk Mode ---
+def _bulk_worker(script_dict, src, dst, as_delta):
+    try:
+        if not as_delta:
+            report = apply_script(script_dict, src, dst)
+            return {"file": src, "ok": True, "output": dst, "regions": len(report["regions"]), "matches": report["matches"]}
+
+        # Keep only a delta against the original instead of a full patched copy
+        tmp = dst + ".tmp"
+        try:
+            report = apply_script(script_dict, src, tmp)
+            make_delta(src, tmp, dst + ".delta")
+        finally:
+            if os.path.exists(tmp): os.remove(tmp)
+        return {"file": src, "ok": True, "output": dst + ".delta", "regions": len(report["regions"]), "matches": report["matches"]}
+    except (PatchError, OSError, ValueError) as e:
+        return {"file": src, "ok": False, "error": str(e)}
+
+def apply_script_to_dir(script, in_dir, out_dir, workers=None, suffixes=(".exe", ".class", ".o", ".bin", ".dll", ".so", ""), as_delta=False):
+    # Applies one script to every matching file in in_dir, in parallel processes.
+    # Yields one result dict per file as soon as it finishes.
+    # as_delta=True stores <name>.delta files (see delta.py) instead of full copies.
+    if not isinstance(script, dict):
+        with open(script, "r") as f: script = json.load(f)
+    load_script(script)  # Fail fast on a broken script
+    os.makedirs(out_dir, exist_ok=True)
+
+    jobs = []
+    for name in sorted(os.listdir(in_dir)):
+        src = os.path.join(in_dir, name)
+        if not os.path.isfile(src) or os.path.splitext(name)[1].lower() not in suffixes: continue
+        jobs.append((src, os.path.join(out_dir, name)))
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(_bulk_worker, script, src, dst, as_delta) for src, dst in jobs]
+        for fut in as_completed(futures):
+            yield fut.result()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Apply a declarative binary patch script.")
+    parser.add_argument("script", help="Patch script (JSON)")
+    parser.add_argument("target", help="Binary to patch, or a directory with --bulk")
+    parser.add_argument("-o", "--output", help="Output file (single) or directory (bulk)")
+    parser.add_argument("--bulk", action="store_true", help="Patch every binary in the target directory")
+    parser.add_argument("-j", "--jobs", type=int, default=None, help="Worker processes for --bulk")
+    parser.add_argument("--delta", action="store_true", help="With --bulk: store compact deltas instead of patched copies")
+    args = parser.parse_args(argv)
+
+    if args.bulk:
+        out_dir = args.output or os.path.join(args.target, "patched")
+        failed = 0
+        for res in apply_script_to_dir(args.script, args.target, out_dir, args.jobs, as_delta=args.delta):
+            if res["ok"]: print(f"[OK]   {res['file']}: {res['regions']} region(s) -> {res['output']}")
+            else:
+                failed += 1
+                print(f"[FAIL] {res['file']}: {res['error']}")
+        return 1 if failed else 0
+
+    root, ext = os.path.splitext(args.target)
+    try:
+        print(format_report(apply_script(args.script, args.target, args.output or f"{root}_patched{ext}")))
+    except (PatchError, OSError, ValueError) as e:
+        print(f"Patch failed: {e}")
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,239 @@
+import os
+import re
+import json
+import time
+import shutil
+import hashlib
+import threading
+import subprocess
+
+# Precompiled headers for the C lane. The leading block of #include lines of a source
+# file (its header prefix) is compiled once into a .gch and reused:
+#   <workspace>/.pch/<key>/prefix.h       the include block
+#   <workspace>/.pch/<key>/prefix.h.gch   gcc -x c-header output
+#   <workspace>/.pch/<key>/manifest.json  dependencies + measured costs
+# key = prefix text + compiler flags + compiler version. The headers the prefix pulls in
+# (from -MD) are checked on every use and the PCH is rebuilt when one of them changes.
+# The saving estimate takes a dozen gcc runs, so it is not part of a build: new PCHs are
+# queued and measure_pending() times them once the step that built them is done.
+
+KEEP = 8         # PCH directories kept (least recently used are removed)
+COST_SAMPLES = 3 # Timing samples (min) for the saving estimate
+NOISE_S = 0.0005 # Smallest saving reported; the spread of the start-up samples raises it
+
+
+def header_prefix(text):
+    # Leading #include lines (comments/blank lines may sit between them) -> list of lines.
+    # Anything else (#define, #if, code) ends the prefix: it could change what the headers mean.
+    prefix, in_comment = [], False
+    for line in text.splitlines():
+        s = line.strip()
+        if in_comment:
+            if "*/" in s:
+                in_comment = False
+                s = s.split("*/", 1)[1].strip()
+            else:
+                continue
+        if s.startswith("/*"):
+            if "*/" not in s[2:]:
+                in_comment = True
+                continue
+            s = s[s.index("*/", 2) + 2:].strip()
+        if not s or s.startswith("//"): continue
+        if s.startswith("#") and s[1:].lstrip().startswith("include") and "/*" not in s:
+            prefix.append(s)
+            continue
+        break
+    return prefix
+
+
+def _stamp(path):
+    st = os.stat(path)
+    return [st.st_size, st.st_mtime_ns]
+
+def _content_hash(path):
+    with open(path, "rb") as f: return hashlib.sha1(f.read()).hexdigest()
+
+def _parse_depfile(path):
+    # make-style "target: dep dep \" -> [dep, ...]
+    with open(path, "r") as f: text = f.read().replace("\\\n", " ")
+    deps = text.split(":", 1)[1].split() if ":" in text else []
+    return [d.replace("\\ ", " ") for d in deps]
+
+
+class PchCache:
+    def __init__(self, gcc, workspace_dir):
+        self.gcc = gcc
+        self.root = os.path.join(workspace_dir, ".pch")
+        self._version = None
+        self.lock = threading.Lock() # Manifest read-modify-write (steps and measurement run on threads)
+        self.pending = {}            # key -> (flags, include_dir) of PCHs not measured yet
+
+    def version(self):
+        if self._version is None:
+            out = subprocess.run([self.gcc, "-dumpfullversion", "-dumpmachine"], capture_output=True, text=True).stdout
+            self._version = " ".join(out.split())
+        return self._version
+
+    def key(self, prefix, flags, include_dir):
+        h = hashlib.sha1("\n".join(prefix + [flags, include_dir, self.version()]).encode())
+        return h.hexdigest()[:16]
+
+    def _paths(self, key):
+        d = os.path.join(self.root, key)
+        return d, os.path.join(d, "prefix.h"), os.path.join(d, "prefix.h.gch"), os.path.join(d, "manifest.json")
+
+    def get(self, prefix, flags, include_dir):
+        # -> (header, manifest, built) where header is the path to pass to -include;
+        # raises RuntimeError when the PCH cannot be built
+        key = self.key(prefix, flags, include_dir)
+        d, header, gch, manifest_path = self._paths(key)
+        with self.lock:
+            manifest = self._load_valid(manifest_path, gch)
+            built = manifest is None
+            if built: manifest = self._build(key, prefix, flags, include_dir)
+            if manifest.get("rejected"): return None, manifest, False
+            manifest["uses"] += 1
+            manifest["last_used"] = time.time()
+            self._save(manifest_path, manifest)
+            if built: self._prune()
+        if "parse_s" not in manifest: self.pending[key] = (flags, include_dir)
+        return header, manifest, built
+
+    def reject(self, manifest, reason):
+        # Kept until one of the headers changes, so the prefix is not retried on every run
+        self.pending.pop(manifest["key"], None)
+        with self.lock:
+            manifest["rejected"] = reason
+            manifest["uses"] -= 1  # Counted by get()
+            self._save(self._paths(manifest["key"])[3], manifest)
+
+    def measure_pending(self):
+        # Times the queued PCHs; call it off the UI thread once the step has returned
+        while self.pending:
+            try: key, (flags, include_dir) = self.pending.popitem()
+            except KeyError: break  # Taken by another thread
+            d, header, gch, manifest_path = self._paths(key)
+            if not os.path.exists(gch): continue
+            costs = self._measure(header, flags, include_dir)
+            with self.lock:
+                try:
+                    with open(manifest_path, "r") as f: manifest = json.load(f)
+                except (OSError, ValueError):
+                    continue  # Pruned meanwhile
+                manifest.update(costs)
+                self._save(manifest_path, manifest)
+
+    def _load_valid(self, manifest_path, gch):
+        try:
+            with open(manifest_path, "r") as f: manifest = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if not os.path.exists(gch): return None
+        changed = False
+        for dep in manifest["deps"]:
+            try:
+                stamp = _stamp(dep["path"])
+                if stamp == dep["stamp"]: continue
+                if _content_hash(dep["path"]) != dep["sha1"]: return None  # Header edited
+                dep["stamp"] = stamp  # Touched only
+                changed = True
+            except OSError:
+                return None
+        if changed: self._save(manifest_path, manifest)
+        return manifest
+
+    def _build(self, key, prefix, flags, include_dir):
+        d, header, gch, manifest_path = self._paths(key)
+        shutil.rmtree(d, ignore_errors=True)
+        os.makedirs(d)
+        with open(header, "w") as f: f.write("\n".join(prefix) + "\n")
+
+        deps = os.path.join(d, "deps.d")
+        cmd = [self.gcc, "-x", "c-header"] + flags.split() + ["-iquote", include_dir, header, "-o", gch, "-MD", "-MF", deps]
+        t0 = time.perf_counter()
+        proc = subprocess.run(cmd, capture_output=True, text=True)
+        build_s = time.perf_counter() - t0
+        if proc.returncode != 0:
+            shutil.rmtree(d, ignore_errors=True)
+            raise RuntimeError(proc.stderr.strip() or "gcc -x c-header failed")
+
+        dep_paths = [p for p in _parse_depfile(deps) if os.path.abspath(p) != os.path.abspath(header)]
+        manifest = {"key": key, "prefix": prefix, "flags": flags, "compiler": self.version(),
+                    "deps": [{"path": p, "stamp": _stamp(p), "sha1": _content_hash(p)} for p in dep_paths],
+                    "build_s": build_s, "uses": 0, "created": time.time()}
+        return manifest
+
+    def _measure(self, header, flags, include_dir):
+        # Cost of the headers in a compile, without and with the PCH: the first is
+        # what every compile pays today, the difference is the saving per compile.
+        # Both are net of gcc start-up (an empty compile), which dwarfs small headers.
+        base = [self.gcc, "-S"] + flags.split() + ["-iquote", include_dir, "-o", os.devnull]
+        def samples(cmd):
+            times = []
+            for _ in range(COST_SAMPLES):
+                t0 = time.perf_counter()
+                subprocess.run(cmd, capture_output=True)
+                times.append(time.perf_counter() - t0)
+            return times
+        startup = samples(base + ["-x", "c", os.devnull])
+        parse_s = max(0.0, min(samples(base + ["-x", "c", header])) - min(startup))
+        load_s = max(0.0, min(samples(base + ["-include", header, "-x", "c", os.devnull])) - min(startup))
+        return {"parse_s": parse_s, "load_s": load_s, "startup_s": min(startup),
+                "noise_s": max(NOISE_S, max(startup) - min(startup))}
+
+    def _save(self, path, manifest):
+        tmp = path + ".tmp"
+        with open(tmp, "w") as f: json.dump(manifest, f)
+        os.replace(tmp, path)
+
+    def _prune(self):
+        entries = []
+        for key in os.listdir(self.root):
+            try:
+                with open(self._paths(key)[3], "r") as f: entries.append((json.load(f).get("last_used", 0), key))
+            except (OSError, ValueError):
+                entries.append((0, key))
+        for _, key in sorted(entries, reverse=True)[KEEP:]:
+            shutil.rmtree(os.path.join(self.root, key), ignore_errors=True)
+
+
+_MARKER_RE = re.compile(r'^# \d+ "(.*)"')
+
+def check_preprocessed(preprocessed):
+    # -> (used, stray). gcc -E -fpch-preprocess leaves a pragma in place of the headers when
+    # the PCH was valid. The source's own #include lines are still seen; a guarded header
+    # then expands to nothing, so text before the first line of the source means a header
+    # without an include guard was pulled in twice (stray = that header).
+    used, main_file, current = False, None, None
+    with open(preprocessed, "r", errors="replace") as f:
+        for line in f:
+            if line.startswith("#pragma GCC pch_preprocess"):
+                used = True
+                continue
+            m = _MARKER_RE.match(line)
+            if m:
+                current = m.group(1)
+                if main_file is None: main_file = current  # First marker names the main file
+                continue
+            if not line.strip() or line.startswith("#"): continue
+            return used, current if used and current != main_file else None
+    return used, None
+
+def format_pch(manifest, built):
+    lines = [f"PCH: {'built' if built else 'reused'} {manifest['key']} "
+             f"({len(manifest['prefix'])} header include(s), {len(manifest['deps'])} file(s) behind them)"]
+    if built: lines.append(f"  built in {manifest['build_s'] * 1e3:.1f} ms")
+    if "parse_s" not in manifest:
+        lines.append("  saving per compile not measured yet (timed in the background after this step)")
+        return "\n".join(lines)
+    saved = max(0.0, manifest["parse_s"] - manifest["load_s"])
+    cost = f"  headers cost {manifest['parse_s'] * 1e3:.1f} ms to compile, {manifest['load_s'] * 1e3:.1f} ms from the PCH"
+    if "startup_s" in manifest: cost += f" (net of {manifest['startup_s'] * 1e3:.1f} ms gcc start-up)"
+    lines.append(cost)
+    if saved < manifest.get("noise_s", NOISE_S):
+        lines.append(f"  no measurable saving per compile (under the {manifest.get('noise_s', NOISE_S) * 1e3:.1f} ms noise floor)")
+    else:
+        lines.append(f"  {saved * 1e3:.1f} ms saved per compile, "
+                     f"used {manifest['uses']} time(s), ~{saved * manifest['uses'] * 1e3:.0f} ms saved in total")
+    return "\n".join(lines)
@@ -0,0 +1,141 @@
+import os
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+class Stage:
+    # One step of a lane. run() returns the usual step result dict
+    # ({"success", "log", "explanation", "content", ...}).
+    # inputs/outputs are file paths; deps are names of stages that must run first.
+    def __init__(self, name, run, deps=(), inputs=(), outputs=(), cache=True, prefetch=False):
+        self.name = name
+        self.run = run
+        self.deps = list(deps)
+        self.inputs = list(inputs)
+        self.outputs = list(outputs)
+        self.cache = cache # False = always re-run when it is the target (e.g. editable source)
+        self.prefetch = prefetch # True = may run alongside a sibling target (read-only, no side effects)
+
+
+def _stamp(paths):
+    # Cheap identity of a set of files: (path, mtime, size), None when missing
+    out = []
+    for p in paths:
+        try:
+            st = os.stat(p)
+            out.append((p, st.st_mtime_ns, st.st_size))
+        except OSError:
+            out.append((p, None, None))
+    return tuple(out)
+
+
+class Pipeline:
+    # A lane declared as a DAG of stages. run(target) executes only the missing
+    # prerequisites of target (independent ones concurrently), skipping stages whose
+    # outputs are newer than their inputs, then runs or recalls the target itself.
+    # Prefetchable siblings whose deps are satisfied by then start in the background
+    # alongside the target; run() returns as soon as the target is done, and opening a
+    # sibling afterwards is a cache hit (or waits for the sibling still in flight).
+    def __init__(self, stages, cache=None, max_workers=4, prefetching=None):
+        self.stages = stages
+        self.by_name = {s.name: s for s in stages}
+        self.cache = cache if cache is not None else {} # name -> (stamp, result), shared across rebuilds
+        self.prefetching = prefetching if prefetching is not None else {} # name -> future of a running sibling, shared too
+        self.max_workers = max_workers
+
+    def prerequisites(self, name):
+        # Transitive deps of name in topological order (name itself excluded)
+        order, seen = [], set()
+        def visit(n, stack):
+            if n in stack: raise ValueError(f"Dependency cycle at stage '{n}'")
+            if n in seen: return
+            for d in self.by_name[n].deps: visit(d, stack | {n})
+            seen.add(n)
+            order.append(n)
+        visit(name, set())
+        return order[:-1]
+
+    def up_to_date(self, stage):
+        # Make-style check: every output exists and is at least as new as every input
+        if not stage.outputs: return False
+        try:
+            oldest_out = min(os.path.getmtime(p) for p in stage.outputs)
+            newest_in = max([os.path.getmtime(p) for p in stage.inputs] or [0])
+        except OSError:
+            return False
+        return oldest_out >= newest_in
+
+    def _execute(self, stage):
+        try:
+            res = stage.run()
+        except Exception as e:
+            res = {"success": False, "log": "", "error": f"Stage '{stage.name}' crashed: {e}"}
+        if res.get("success", True) and stage.cache:
+            self.cache[stage.name] = (_stamp(stage.inputs + stage.outputs), res)
+        return res
+
+    def recall(self, stage):
+        # Cached result if nothing the stage reads or writes changed since it ran
+        hit = self.cache.get(stage.name)
+        if stage.cache and hit and hit[0] == _stamp(stage.inputs + stage.outputs): return hit[1]
+        return None
+
+    def siblings(self, target, done):
+        # Ready prefetchable stages other than target that have no fresh result and are not running
+        return [s for s in self.stages if s.name != target and s.prefetch and s.deps and s.name not in self.prefetching
+                and all(d in done for d in s.deps) and self.recall(s) is None]
+
+    def _prefetch(self, pool, stage):
+        fut = pool.submit(self._execute, stage)
+        self.prefetching[stage.name] = fut
+        fut.add_done_callback(lambda f: self.prefetching.pop(stage.name, None))
+
+    def run(self, target):
+        # Returns (ran, failed, result):
+        #   ran    = [(name, result)] prerequisites that actually executed
+        #   failed = name of the stage that failed (None on success)
+        #   result = target result, or the failing prerequisite's result
+        needed = self.prerequisites(target)
+        remaining = list(needed)
+        done = set()
+        ran = []
+
+        # Not a with-block: that would wait for the prefetched siblings before returning
+        pool = ThreadPoolExecutor(max_workers=self.max_workers)
+        try:
+            pending = {}
+            while remaining or pending:
+                # Dispatch every stage whose deps are satisfied
+                progressed = False
+                for name in list(remaining):
+                    stage = self.by_name[name]
+                    if not all(d in done for d in stage.deps): continue
+                    remaining.remove(name)
+                    progressed = True
+                    if self.up_to_date(stage) or self.recall(stage) is not None:
+                        done.add(name)
+                    else:
+                        pending[pool.submit(self._execute, stage)] = name
+                if progressed and not pending: continue # Skips may unblock more stages
+                if not pending: raise ValueError("Unsatisfiable stage dependencies")
+
+                finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for fut in finished:
+                    name = pending.pop(fut)
+                    res = fut.result()
+                    ran.append((name, res))
+                    if not res.get("success", True):
+                        for f in pending: f.cancel()
+                        return ran, name, res
+                    done.add(name)
+
+            # Siblings start first and keep running after the target returns
+            for sib in self.siblings(target, done): self._prefetch(pool, sib)
+            stage = self.by_name[target]
+            res = self.recall(stage)
+            if res is None and target in self.prefetching:
+                self.prefetching[target].result() # Already running as a sibling of an earlier target
+                res = self.recall(stage)
+            if res is None: res = self._execute(stage)
+        finally:
+            pool.shutdown(wait=False)
+
+        return ran, (None if res.get("success", True) else target), res
@@ -0,0 +1,171 @@
+import os
+import re
+import bisect
+import threading
+from backend import file_hash
+
+# Artifact types the index knows how to read
+TEXT_EXTS = (".c", ".h", ".i", ".s", ".java")
+BINARY_EXTS = (".o", ".exe", ".class")
+
+TOKEN_RE = re.compile(r"[A-Za-z_.$][\w.$]*|0x[0-9a-fA-F]+|\d+")
+
+def tokenize(text):
+    return [t.lower() for t in TOKEN_RE.findall(text)]
+
+
+class SearchIndex:
+    # Inverted index over every artifact in the workspace.
+    # Each artifact is split into "views" (source text, strings, symbols, disassembly),
+    # and every view line is indexed by token. Only artifacts whose hash changed
+    # since the last refresh get re-read, so refreshing after each step is cheap.
+    def __init__(self, backend):
+        self.backend = backend
+        self.lock = threading.Lock()
+        self.hashes = {}     # path -> content hash
+        self.docs = {}       # (path, view) -> {"lines": [...], "offsets": [...]}
+        self.postings = {}   # token -> {(path, view): set(line numbers)}
+        self._vocab = []     # sorted tokens, rebuilt lazily for prefix search
+        self._vocab_dirty = False
+
+    # --- Building ---
+    def refresh(self, workspace_dir):
+        # Re-index changed artifacts, drop vanished ones. Returns number re-indexed.
+        if not os.path.isdir(workspace_dir): return 0
+        present = set()
+        changed = 0
+        for name in sorted(os.listdir(workspace_dir)):
+            path = os.path.join(workspace_dir, name)
+            if name.startswith(".") or not os.path.isfile(path) or not name.endswith(TEXT_EXTS + BINARY_EXTS): continue  # Dotfiles are tool state
+            present.add(path)
+            try: digest = file_hash(path)
+            except OSError: continue
+            if self.hashes.get(path) == digest: continue
+
+            views = self._read_views(path)  # Slow part (objdump etc.), done outside the lock
+            with self.lock:
+                self._drop_artifact(path)
+                for view, lines, offsets in views:
+                    self._add_doc(path, view, lines, offsets)
+                self.hashes[path] = digest
+            changed += 1
+
+        with self.lock:
+            for path in [p for p in self.hashes if p not in present]:
+                self._drop_artifact(path)
+        return changed
+
+    def _read_views(self, path):
+        views = []
+        if path.endswith(TEXT_EXTS):
+            try:
+                with open(path, "r", errors="replace") as f: text = f.read()
+            except OSError:
+                return views
+            view = {".i": "preprocessed", ".s": "assembly"}.get(os.path.splitext(path)[1], "source")
+            views.append((view,) + _split_lines(text))
+            return views
+
+        # Binary: strings keep real file offsets, tool output keeps text offsets
+        try:
+            hits = list(self.backend.iter_strings(path))
+            views.append(("strings", [s for _, s in hits], [o for o, _ in hits]))
+        except OSError:
+            pass
+
+        if path.endswith(".class"):
+            cmds = [("disasm", f"javap -c -p {path}")]
+        else:
+            cmds = [("symbols", f"objdump -t {path}"), ("disasm", f"objdump -d {path}")]
+        for view, cmd in cmds:
+            success, out = self.backend.run_cmd(cmd)
+            if success: views.append((view,) + _split_lines(out))
+        return views
+
+    def _add_doc(self, path, view, lines, offsets):
+        key = (path, view)
+        self.docs[key] = {"lines": lines, "offsets": offsets}
+        for line_no, line in enumerate(lines):
+            for tok in tokenize(line):
+                docs = self.postings.get(tok)
+                if docs is None:
+                    docs = self.postings[tok] = {}
+                    self._vocab_dirty = True
+                docs.setdefault(key, set()).add(line_no)
+
+    def _drop_artifact(self, path):
+        keys = [k for k in self.docs if k[0] == path]
+        if not keys:
+            self.hashes.pop(path, None)
+            return
+        for key in keys:
+            for line in self.docs.pop(key)["lines"]:
+                for tok in tokenize(line):
+                    docs = self.postings.get(tok)
+                    if docs is None: continue
+                    docs.pop(key, None)
+                    if not docs:
+                        del self.postings[tok]
+                        self._vocab_dirty = True
+        self.hashes.pop(path, None)
+
+    # --- Querying ---
+    def _expand(self, tok, prefix):
+        # Exact token, or every indexed token starting with it (last query word)
+        if not prefix: return [tok] if tok in self.postings else []
+        if self._vocab_dirty:
+            self._vocab = sorted(self.postings)
+            self._vocab_dirty = False
+        out = []
+        i = bisect.bisect_left(self._vocab, tok)
+        while i < len(self._vocab) and self._vocab[i].startswith(tok):
+            out.append(self._vocab[i])
+            i += 1
+        return out
+
+    def _lines_for(self, tok, prefix):
+        # Merge postings of all expansions: {(path, view): set(lines)}
+        merged = {}
+        for t in self._expand(tok, prefix):
+            for key, lines in self.postings[t].items():
+                merged.setdefault(key, set()).update(lines)
+        return merged
+
+    def search(self, query, limit=200):
+        # Returns hits: dicts with path, view, line, offset and text
+        toks = tokenize(query)
+        if not toks: return []
+        with self.lock:
+            per_tok = [self._lines_for(t, i == len(toks) - 1) for i, t in enumerate(toks)]
+            per_tok.sort(key=len)  # Intersect starting from the rarest term
+            hits = []
+            for key, lines in per_tok[0].items():
+                for other in per_tok[1:]:
+                    if key not in other:
+                        lines = None
+                        break
+                    lines = lines & other[key]
+                if not lines: continue
+                doc = self.docs[key]
+                for line_no in sorted(lines):
+                    hits.append({
+                        "path": key[0], "view": key[1], "line": line_no,
+                        "offset": doc["offsets"][line_no], "text": doc["lines"][line_no]
+                    })
+                    if len(hits) >= limit: return hits
+            return hits
+
+    def view_text(self, path, view):
+        with self.lock:
+            doc = self.docs.get((path, view))
+            return "\n".join(doc["lines"]) if doc else ""
+
+
+def _split_lines(text):
+    lines = text.split("\n")
+    offsets = []
+    pos = 0
+    for line in lines:
+        offsets.append(pos)
+        pos += len(line) + 1
+    return lines, offsets
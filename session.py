@@ -0,0 +1,139 @@
+import os
+import json
+import gzip
+import hashlib
+from pygments.lexers import get_lexer_by_name
+from backend import file_hash
+
+# On-disk snapshot of every computed step result, so reopening the app (or switching
+# lanes) restores steps without re-running the tools.
+#
+# Layout (inside the workspace):
+#   .session/session.json   - small index: per lane source hash, step, stage stamps + results
+#   .session/blobs/<sha1>.gz - large tool outputs, content-addressed (shared between stages)
+# Large texts that are simply the contents of a workspace artifact (hello.i, hello.s, ...)
+# are stored as {"ref": path, "hash": sha1} and re-read on restore.
+
+SESSION_VERSION = 1
+INLINE_LIMIT = 2048  # Texts up to this size are kept inline in the index
+TEXT_KEYS = ("left_text", "right_text")
+RUN_KEYS = ("left_runs", "right_runs")  # Precomputed highlight ranges
+REF_EXTS = (".c", ".h", ".i", ".s", ".java")
+
+class SessionStore:
+    def __init__(self, workspace_dir):
+        self.dir = os.path.join(workspace_dir, ".session")
+        self.index_path = os.path.join(self.dir, "session.json")
+        self.blob_dir = os.path.join(self.dir, "blobs")
+
+    # --- Saving ---
+    def save(self, lanes):
+        # lanes: {lang: {"source": path, "step": int, "cache": {name: (stamp, result)}}}
+        os.makedirs(self.blob_dir, exist_ok=True)
+        used_blobs = set()
+        out = {"version": SESSION_VERSION, "lanes": {}}
+        for lang, lane in lanes.items():
+            src = lane["source"]
+            if not src or not os.path.exists(src): continue
+            stages = {}
+            for name, (stamp, res) in lane["cache"].items():
+                refs = [p for p, mtime, _ in stamp if mtime is not None and p.endswith(REF_EXTS)]
+                stages[name] = {"stamp": stamp, "result": self._encode_result(res, refs, used_blobs)}
+            out["lanes"][lang] = {"source": src, "source_hash": file_hash(src), "step": lane["step"], "stages": stages}
+
+        tmp = self.index_path + ".tmp"
+        with open(tmp, "w") as f: json.dump(out, f, separators=(",", ":"))
+        os.replace(tmp, self.index_path)
+
+        # Drop blobs nothing points at anymore
+        for name in os.listdir(self.blob_dir):
+            if name[:-3] not in used_blobs:
+                try: os.remove(os.path.join(self.blob_dir, name))
+                except OSError: pass
+
+    def _encode_result(self, res, refs, used_blobs):
+        enc = dict(res)
+        if "content" in res:
+            c = dict(res["content"])
+            for side in ("left", "right"):
+                lexer = c.get(f"{side}_lexer")
+                if lexer is not None: c[f"{side}_lexer"] = lexer.aliases[0]
+            for key in TEXT_KEYS:
+                if key in c: c[key] = self._encode_text(c[key], refs, used_blobs)
+            for key in RUN_KEYS:
+                if key in c: c[key] = self._encode_text(json.dumps(c[key], separators=(",", ":")), [], used_blobs)
+            enc["content"] = c
+        return enc
+
+    def _encode_text(self, text, refs, used_blobs):
+        if len(text) <= INLINE_LIMIT: return text
+        # Same bytes as an artifact on disk? Store a pointer instead of a copy
+        for path in refs:
+            try:
+                with open(path, "r") as f:
+                    if f.read() == text: return {"ref": path, "hash": file_hash(path)}
+            except (OSError, UnicodeDecodeError):
+                continue
+        digest = hashlib.sha1(text.encode("utf-8")).hexdigest()
+        path = os.path.join(self.blob_dir, digest + ".gz")
+        if not os.path.exists(path):
+            with gzip.open(path, "wt", encoding="utf-8") as f: f.write(text)
+        used_blobs.add(digest)
+        return {"blob": digest}
+
+    # --- Restoring ---
+    def load(self):
+        # Returns {lang: {"source", "step", "cache"}} for lanes whose source is unchanged
+        try:
+            with open(self.index_path, "r") as f: data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if data.get("version") != SESSION_VERSION: return {}
+
+        lanes = {}
+        for lang, lane in data.get("lanes", {}).items():
+            src = lane.get("source")
+            try:
+                if file_hash(src) != lane.get("source_hash"): continue  # Source edited since snapshot
+            except (OSError, TypeError):
+                continue
+            cache = {}
+            for name, entry in lane.get("stages", {}).items():
+                res = self._decode_result(entry["result"])
+                if res is None: continue  # A referenced artifact changed or vanished
+                stamp = tuple(tuple(s) for s in entry["stamp"])
+                cache[name] = (stamp, res)
+            lanes[lang] = {"source": src, "step": lane.get("step", 0), "cache": cache}
+        return lanes
+
+    def _decode_result(self, enc):
+        res = dict(enc)
+        if "content" not in enc: return res
+        c = dict(enc["content"])
+        for side in ("left", "right"):
+            name = c.get(f"{side}_lexer")
+            if name is not None: c[f"{side}_lexer"] = get_lexer_by_name(name)
+        for key in TEXT_KEYS:
+            if key not in c or isinstance(c[key], str): continue
+            text = self._decode_text(c[key])
+            if text is None: return None
+            c[key] = text
+        for key in RUN_KEYS:
+            if key not in c: continue
+            runs = c[key] if isinstance(c[key], str) else self._decode_text(c[key])
+            if runs is None: return None
+            c[key] = json.loads(runs)
+            text = c.get(key.replace("_runs", "_text"))
+            if not isinstance(text, str) or sum(n for _, n in c[key]) != len(text): del c[key]  # Re-lexed on show
+        res["content"] = c
+        return res
+
+    def _decode_text(self, ref):
+        try:
+            if "blob" in ref:
+                with gzip.open(os.path.join(self.blob_dir, ref["blob"] + ".gz"), "rt", encoding="utf-8") as f:
+                    return f.read()
+            if file_hash(ref["ref"]) != ref["hash"]: return None
+            with open(ref["ref"], "r") as f: return f.read()
+        except (OSError, KeyError):
+            return None
@@ -0,0 +1,68 @@
+import random
+from bindiff import diff_runs, group_ranges, format_ranges, render_hex, SectionMap
+
+SECTIONS = [{"name": f"s{k}", "offset": k * 50, "size": 40, "contents": True} for k in range(6)]
+
+def _brute(a, b, sections, gap):
+    # Exact runs first (a run never splits), then merge close runs within one section
+    n, runs, i = min(len(a), len(b)), [], 0
+    while i < n:
+        if a[i] != b[i]:
+            j = i
+            while j < n and a[j] != b[j]: j += 1
+            runs.append([i, j])
+            i = j
+        else:
+            i += 1
+    if len(a) != len(b):
+        if runs and runs[-1][1] == n: runs[-1][1] = max(len(a), len(b))
+        else: runs.append([n, max(len(a), len(b))])
+    smap, out = SectionMap(sections), []
+    slot = lambda off: int(smap.slots([off])[0])
+    for s, e in runs:
+        if out and s - out[-1][1] < gap and slot(s) == slot(out[-1][1] - 1):
+            out[-1][1] = e
+            out[-1][2] += e - s
+        else:
+            out.append([s, e, e - s])
+    return out
+
+def _files(tmp_path, a, b):
+    (tmp_path / "a").write_bytes(a)
+    (tmp_path / "b").write_bytes(b)
+    return str(tmp_path / "a"), str(tmp_path / "b")
+
+def test_matches_brute_force(tmp_path):
+    rng = random.Random(1)
+    for _ in range(200):
+        a = bytes(rng.randrange(4) for _ in range(rng.randint(0, 300)))
+        b = bytes(x if rng.random() < 0.8 else rng.randrange(4) for x in a[:len(a) - rng.choice([0, 0, 5])])
+        b += bytes(rng.randrange(4) for _ in range(rng.choice([0, 0, 7])))
+        gap, chunk = rng.choice([1, 2, 16]), rng.choice([1, 3, 7, 64, 1 << 20])
+        runs = diff_runs(*_files(tmp_path, a, b), SECTIONS, gap, chunk)
+        assert [list(map(int, r)) for r in zip(*runs)] == _brute(a, b, SECTIONS, gap)
+
+def test_identical_and_empty(tmp_path):
+    starts, ends, changed = diff_runs(*_files(tmp_path, b"same", b"same"))
+    assert len(starts) == 0
+    starts, ends, changed = diff_runs(*_files(tmp_path, b"", b"abc"))
+    assert (starts.tolist(), ends.tolist(), changed.tolist()) == ([0], [3], [3])
+
+def test_ranges_are_capped_and_summarised(tmp_path):
+    a = bytes(1000)
+    b = bytes(1 if i % 40 == 0 else 0 for i in range(1000))
+    pa, pb = _files(tmp_path, a, b)
+    runs = diff_runs(pa, pb)
+    ranges = group_ranges(runs, limit=10)
+    assert len(runs[0]) == 25 and len(ranges) == 10
+    assert ranges[0] == {"start": 0, "end": 1, "section": "(unknown)", "changed": 1}
+    text = format_ranges(ranges, runs, pa, pb)
+    assert "25 byte(s) differ in 25 range(s)" in text and "... 15 more range(s)" in text
+    hex_text, marks = render_hex(pa, pb, ranges, max_ranges=2)
+    assert "... 8 more range(s)" in hex_text and marks
+
+def test_section_lookup():
+    smap = SectionMap([{"name": ".text", "offset": 0x100, "size": 0x50, "contents": True},
+                       {"name": ".bss", "offset": 0x200, "size": 0x10, "contents": False}])
+    assert [smap.lookup(o) for o in (0, 0x120, 0x180)] == ["(headers)", ".text", "(no section)"]
+    assert SectionMap([]).lookup(5) == "(unknown)"
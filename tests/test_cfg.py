@@ -0,0 +1,87 @@
+import sys
+import pytest
+from cfg import ObjdumpParser, JavapParser, iter_functions, _stream
+
+OBJDUMP = """
+hello:     file format elf64-x86-64
+
+
+Disassembly of section .text:
+
+0000000000001139 <sign>:
+    1139:\t85 ff                \ttest   %edi,%edi
+    113b:\t78 06                \tjs     1143 <sign+0xa>
+    113d:\tb8 01 00 00 00       \tmov    $0x1,%eax
+    1142:\tc3                   \tret
+    1143:\tb8 ff ff ff ff       \tmov    $0xffffffff,%eax
+    1148:\teb 02                \tjmp    114c <sign+0x13>
+    114a:\t90                   \tnop
+    114b:\t90                   \tnop
+    114c:\tc3                   \tret
+
+000000000000114d <main>:
+    114d:\tf3 0f 1e fa          \tendbr64
+    1151:\te8 e3 ff ff ff       \tcall   1139 <sign>
+    1156:\tf2 e9 04 00 00 00    \tbnd jmp 1160 <puts@plt>
+"""
+
+JAVAP = """Compiled from "Main.java"
+public class Main {
+  public Main();
+    Code:
+       0: aload_0
+       1: invokespecial #1                  // Method java/lang/Object."<init>":()V
+       4: return
+
+  static int pick(int) throws java.io.IOException;
+    Code:
+       0: iload_0
+       1: tableswitch   { // 0 to 1
+                     0: 24
+                     1: 26
+               default: 28
+          }
+      24: iconst_1
+      25: ireturn
+      26: iconst_2
+      27: ireturn
+      28: iload_0
+      29: ifle          34
+      32: iconst_3
+      33: ireturn
+      34: iconst_0
+      35: ireturn
+}
+"""
+
+def _funcs(text, parser):
+    return {f.name: f for f in iter_functions(text.splitlines(True), parser)}
+
+def test_objdump_blocks_and_edges():
+    funcs = _funcs(OBJDUMP, ObjdumpParser())
+    sign = funcs["sign"]
+    assert [b["start"] for b in sign.blocks] == [0x1139, 0x113d, 0x1143, 0x114a, 0x114c]
+    assert sign.blocks[0]["succ"] == [(0x1143, "taken"), (0x113d, "fall")]
+    assert sign.blocks[1]["succ"] == []  # ret
+    assert sign.blocks[2]["succ"] == [(0x114c, "jump")]
+    assert sign.blocks[3]["succ"] == [(0x114c, "fall")]
+
+def test_objdump_calls_and_prefixes():
+    main = _funcs(OBJDUMP, ObjdumpParser())["main"]
+    assert main.calls == ["sign"]
+    assert main.insns[-1][1] == "jump"  # "bnd jmp" is still a jump; target is outside the function
+    assert main.blocks[-1]["succ"] == []
+
+def test_javap_methods_switch_and_throws():
+    funcs = _funcs(JAVAP, JavapParser())
+    assert list(funcs) == ["public Main()", "static int pick(int)"]
+    assert funcs["public Main()"].calls == ['java/lang/Object."<init>":()V']
+    pick = funcs["static int pick(int)"]
+    assert [b["start"] for b in pick.blocks] == [0, 24, 26, 28, 32, 34]
+    assert pick.blocks[0]["succ"] == [(24, "case"), (26, "case"), (28, "case")]
+    assert pick.blocks[3]["succ"] == [(34, "taken"), (32, "fall")]
+
+def test_stream_raises_tool_errors():
+    with pytest.raises(RuntimeError, match="broken"):
+        list(_stream([sys.executable, "-c", "import sys; print('partial'); sys.exit('broken')"]))
+    assert list(_stream([sys.executable, "-c", "print('a'); print('b')"])) == ["a\n", "b\n"]
@@ -0,0 +1,33 @@
+import pytest
+import debugger
+from debugger import parse_mi_line, find_imported_calls, GdbSession
+
+def test_result_record_with_nested_values():
+    rec = parse_mi_line('12^done,stack=[frame={level="0",addr="0x401136",func="main",file="hello.c",line="4"}]\n')
+    assert rec["type"] == "result" and rec["token"] == 12 and rec["class"] == "done"
+    assert rec["results"]["stack"][0]["func"] == "main"
+
+def test_async_and_stream_records():
+    rec = parse_mi_line('*stopped,reason="exited",exit-code="012"')
+    assert rec["type"] == "exec" and rec["results"]["exit-code"] == "012"
+    assert parse_mi_line('~"Hello\\n"') == {"type": "console", "text": "Hello\n"}
+    assert parse_mi_line("(gdb) ") == {"type": "prompt"}
+
+def test_escaped_strings_and_empty_containers():
+    rec = parse_mi_line('^done,value="a \\"q\\" b",t={},l=[]')
+    assert rec["results"] == {"value": 'a "q" b', "t": {}, "l": []}
+
+def test_imported_calls():
+    text = "  call   401030 <puts@plt>\n  call   401040 <__cxa_finalize@plt>\n  call   *0x2fe2(%rip) # <__imp_printf>\n"
+    assert find_imported_calls(text) == ["puts", "printf"]
+
+@pytest.mark.skipif(debugger.pty is None, reason="POSIX pty needed")
+def test_inferior_output_stays_off_the_mi_pipe():
+    session = GdbSession("gdb")
+    sent = []
+    session.command = lambda cmd, timeout=10: sent.append(cmd) or {"class": "done", "results": {}}
+    close = session._inferior_channel()
+    tty = sent[0].split('"')[1]
+    assert sent[0].startswith("-inferior-tty-set")
+    with open(tty, "w") as f: f.write("5=x\n*stopped\n")  # Would look like MI records on gdb's pipe
+    assert close() == "5=x\n*stopped\n"
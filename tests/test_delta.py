@@ -0,0 +1,50 @@
+import os
+import random
+import pytest
+from delta import make_delta, apply_delta, read_header, DeltaError
+
+def _round_trip(tmp_path, original, patched, block_size=64):
+    a, b, d, out = (str(tmp_path / n) for n in ("a", "b", "a.delta", "out"))
+    with open(a, "wb") as f: f.write(original)
+    with open(b, "wb") as f: f.write(patched)
+    stats = make_delta(a, b, d, block_size=block_size)
+    apply_delta(a, d, out)
+    with open(out, "rb") as f: assert f.read() == patched
+    return stats
+
+def test_small_patch_is_xor_blocks(tmp_path):
+    original = os.urandom(4096)
+    patched = bytearray(original)
+    patched[100:105] = b"HACKD"
+    patched[3000] ^= 0xff
+    stats = _round_trip(tmp_path, original, bytes(patched))
+    assert stats["xor"] == 2 and stats["add"] == 0
+    assert stats["delta_size"] < 300
+
+def test_random_edits_round_trip(tmp_path):
+    rng = random.Random(3)
+    for _ in range(20):
+        original = bytes(rng.randrange(256) for _ in range(rng.randint(1, 2000)))
+        patched = bytearray(original)
+        for _ in range(rng.randint(0, 5)):
+            i = rng.randrange(len(patched))
+            patched[i:i + rng.randint(1, 8)] = bytes(rng.randrange(256) for _ in range(rng.randint(0, 16)))
+        _round_trip(tmp_path, original, bytes(patched), block_size=rng.choice([16, 64, 4096]))
+
+def test_moved_blocks_and_empty_files(tmp_path):
+    original = os.urandom(256)
+    _round_trip(tmp_path, original, original[128:] + original[:128])
+    _round_trip(tmp_path, b"", b"new")
+    _round_trip(tmp_path, b"old", b"")
+
+def test_wrong_original_is_rejected(tmp_path):
+    _round_trip(tmp_path, b"A" * 100, b"B" * 100)
+    (tmp_path / "other").write_bytes(b"C" * 100)
+    with pytest.raises(DeltaError, match="checksum"):
+        apply_delta(str(tmp_path / "other"), str(tmp_path / "a.delta"), str(tmp_path / "x"))
+    assert read_header(str(tmp_path / "a.delta"))["target_size"] == 100
+
+def test_not_a_delta(tmp_path):
+    (tmp_path / "junk").write_bytes(b"nope")
+    with pytest.raises(DeltaError):
+        read_header(str(tmp_path / "junk"))
@@ -0,0 +1,41 @@
+import re
+import shutil
+import subprocess
+import pytest
+from dwarf_lines import LineTable, line_table, map_disassembly, strip_debug_asm
+
+SOURCE = '#include <stdio.h>\n\nint add(int a, int b) {\n    return a + b;\n}\n\nint main(void) {\n    printf("%d\\n", add(1, 2));\n    return 0;\n}\n'
+
+def _table():
+    return LineTable([[(0x1139, "/src/hello.c", 3), (0x1143, "/src/hello.c", 4), (0x114b, "/src/hello.c", 5),
+                       (0x114d, "/usr/include/x.h", 9), (0x1151, "/src/hello.c", 5)]])
+
+def test_lookup_and_ranges():
+    t = _table()
+    assert t.lookup(0x1139) == ("/src/hello.c", 3) and t.lookup(0x1142) == ("/src/hello.c", 3)
+    assert t.lookup(0x1138) is None and t.lookup(0x1151) is None  # Before the first row / at the end row
+    assert t.ranges("hello.c", 4) == [(0x1143, 0x114b)]
+
+def test_map_disassembly_only_maps_the_source():
+    disasm = "0000000000001139 <add>:\n    1139:\t55   \tpush   %rbp\n    1143:\t8b 55 \tmov    -0x4(%rbp),%edx\n    114d:\t90   \tnop\n"
+    assert map_disassembly(_table(), disasm, "source_code/hello.c") == [[2, 1], [3, 2]]
+
+def test_strip_debug_asm():
+    asm = ('\t.file\t"hello.c"\n\t.text\n.Ltext0:\n\t.file 0 "/src" "hello.c"\n\t.loc 0 3 23\n\tpushq\t%rbp\n'
+           '\t.section\t.debug_info,"",@progbits\n\t.long\t0x8c\n\t.text\n\tret\n')
+    assert strip_debug_asm(asm) == '\t.file\t"hello.c"\n\t.text\n.Ltext0:\n\tpushq\t%rbp\n\t.text\n\tret\n'
+
+@pytest.mark.skipif(not (shutil.which("gcc") and shutil.which("objdump")), reason="needs gcc and objdump")
+@pytest.mark.parametrize("version", ["-gdwarf-4", "-gdwarf-5"])
+def test_matches_objdump_decodedline(tmp_path, version):
+    from backend import CompilerBackend
+    src, exe = tmp_path / "hello.c", tmp_path / "hello"
+    src.write_text(SOURCE)
+    subprocess.run(["gcc", "-O0", version, str(src), "-o", str(exe)], check=True)
+    out = subprocess.run(["objdump", "--dwarf=decodedline", str(exe)], capture_output=True, text=True).stdout
+    rows = [(int(a, 16), int(l)) for l, a in re.findall(r"^hello\.c\s+(\d+)\s+(0x[0-9a-f]+)", out, re.M)]
+    assert rows
+    table = line_table(CompilerBackend(), str(exe))
+    for addr, line in rows:
+        hit = table.lookup(addr)
+        assert hit and hit[0].endswith("hello.c") and hit[1] == line
@@ -0,0 +1,23 @@
+from pygments.lexers import CLexer, GasLexer
+from ui_components import highlight_runs, runs_fit
+
+def test_runs_cover_text_with_blank_edges():
+    code = '\n\n#include <stdio.h>\nint main(){return 0;}\n\n\n'
+    runs = highlight_runs(code, CLexer())
+    assert sum(n for _, n in runs) == len(code)
+
+def test_runs_cover_text_without_trailing_newline():
+    code = '\tmovl $0, %eax\n\tret'
+    assert runs_fit(highlight_runs(code, GasLexer()), code)
+
+def test_tokens_line_up_with_text():
+    code = '\n  int x = 1; // c\n'
+    pos, tags = 0, {}
+    for tag, n in highlight_runs(code, CLexer()):
+        tags[code[pos:pos + n].strip()] = tag
+        pos += n
+    assert tags["int"] == "Token.Keyword.Type"
+    assert tags["// c"] == "Token.Comment"
+
+def test_empty_text():
+    assert highlight_runs("", CLexer()) == []
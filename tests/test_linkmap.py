@@ -0,0 +1,79 @@
+from linkmap import parse_map, attribute, LINKER, PADDING, MERGED
+
+BFD_MAP = """Discarded input sections
+
+ .note.GNU-stack
+                0x0000000000000000        0x0 hello.o
+
+Linker script and memory map
+
+LOAD /usr/lib/x86_64-linux-gnu/crt1.o
+LOAD hello.o
+
+.interp         0x0000000000400318       0x1c
+ *(.interp)
+ .interp        0x0000000000400318       0x1c /usr/lib/x86_64-linux-gnu/crt1.o
+
+.text           0x0000000000401000       0x60
+ *(.text .stub .text.*)
+ .text          0x0000000000401000       0x22 /usr/lib/x86_64-linux-gnu/crt1.o
+                0x0000000000401000                _start
+ *fill*         0x0000000000401022        0xe 
+ .text          0x0000000000401030       0x1a hello.o
+                0x0000000000401030                main
+ .text.unlikely_name_that_wraps
+                0x000000000040104a       0x16 /usr/lib/x86_64-linux-gnu/libc.a(printf.o)
+
+.comment        0x0000000000000000       0x1f
+ .comment       0x0000000000000000       0x1f hello.o
+"""
+
+GOLD_MAP = """Memory map
+
+.rodata         0x00000000004006e0       0x20
+ ** merge constants
+                0x00000000004006e0        0x4
+ .rodata        0x00000000004006e4        0x3 hello.o
+ ** merge strings
+                0x00000000004006f0       0x19
+
+.eh_frame       0x0000000000400710       0x40
+ ** eh_frame    0x0000000000400710       0x40
+
+.symtab         0x0000000000000000      0x330
+ ** symtab      0x0000000000000000      0x330
+"""
+
+LLD_MAP = """             VMA              LMA     Size Align Out     In      Symbol
+          2002a8           2002a8       1c     1 .interp
+          2002a8           2002a8       1c     1         <internal>:(.interp)
+          201000           201000       30    16 .text
+          201000           201000       22    16         /usr/lib/crt1.o:(.text)
+          201000           201000        0     1                 _start
+          201030           201030        e    16         hello.o:(.text)
+"""
+
+def test_bfd_rows():
+    rows = parse_map(BFD_MAP)
+    assert (".interp", LINKER, 0x1c) in rows  # Synthetic, booked under the first object by ld
+    assert (".text", PADDING, 0xe) in rows
+    assert (".text", "hello.o", 0x1a) in rows
+    assert (".text", "/usr/lib/x86_64-linux-gnu/libc.a(printf.o)", 0x16) in rows  # Wrapped name
+    assert all(sec != ".note.GNU-stack" for sec, _, _ in rows)  # Discarded-sections list skipped
+
+def test_bfd_attribution():
+    out = attribute(parse_map(BFD_MAP))
+    assert out["hello.o"] == {"loaded": 0x1a, "other": 0x1f, "members": {}}
+    assert out["libc.a"]["members"] == {"printf.o": 0x16}
+
+def test_gold_merged_sections_and_symtab():
+    rows = parse_map(GOLD_MAP)
+    assert (".rodata", MERGED, 4) in rows and (".rodata", MERGED, 0x19) in rows
+    assert (".eh_frame", MERGED, 0x40) in rows
+    out = attribute(rows)
+    assert out[MERGED]["loaded"] == 4 + 0x19 + 0x40
+    assert LINKER not in out  # Linker-written .symtab stays out of the input totals
+
+def test_lld_rows():
+    rows = parse_map(LLD_MAP)
+    assert rows == [(".interp", LINKER, 0x1c), (".text", "/usr/lib/crt1.o", 0x22), (".text", "hello.o", 0xe)]
@@ -0,0 +1,32 @@
+import json
+from live_check import parse_gcc_json, parse_javac
+
+def _diag(kind, file, line, col, message, children=()):
+    return {"kind": kind, "message": message, "children": list(children),
+            "locations": [{"caret": {"file": file, "line": line, "column": col}}]}
+
+def test_source_diagnostics_are_kept():
+    out = json.dumps([_diag("error", "<stdin>", 4, 12, "'x' undeclared")])
+    assert parse_gcc_json(out) == [{"line": 4, "col": 12, "end_col": 13, "kind": "error", "message": "'x' undeclared"}]
+
+def test_header_diagnostics_become_one_summary():
+    out = json.dumps([
+        _diag("warning", "/ws/util.h", 3, 2, "#warning careful",
+              [_diag("error", "<stdin>", 2, 11, "expected ';'"), _diag("note", "<stdin>", 1, 1, "in expansion")]),
+        _diag("error", "/ws/util.h", 1, 10, "expected ';'"),
+    ])
+    diags = parse_gcc_json(out)
+    assert [d["line"] for d in diags] == [2, None]
+    assert diags[1]["kind"] == "error"
+    assert diags[1]["message"].startswith("2 issue(s) in included headers (first: util.h:3:")
+
+def test_end_of_input_column():
+    diags = parse_gcc_json(json.dumps([_diag("error", "<stdin>", 3, -1, "expected '}' at end of input")]))
+    assert diags[0]["col"] == 1 and diags[0]["end_col"] == 2
+
+def test_no_json():
+    assert parse_gcc_json("") == [] and parse_gcc_json("[not json") == []
+
+def test_javac_caret_column():
+    out = "Hello.java:3: error: ';' expected\n        int x = 1\n                 ^\n1 error\n"
+    assert parse_javac(out) == [{"line": 3, "col": 18, "end_col": 19, "kind": "error", "message": "';' expected"}]
@@ -0,0 +1,64 @@
+import os
+import random
+import pytest
+from patcher import AhoCorasick, load_script, apply_script, _find_all, _clone, PatchError
+
+def _brute(data, pattern):
+    return [i for i in range(len(data) - len(pattern) + 1)
+            if all(b is None or data[i + k] == b for k, b in enumerate(pattern))]
+
+def test_aho_corasick_matches_brute_force():
+    rng = random.Random(7)
+    for _ in range(50):
+        data = bytes(rng.choice(b"abc") for _ in range(rng.randint(0, 300)))
+        needles = list({bytes(rng.choice(b"abc") for _ in range(rng.randint(1, 4))) for _ in range(rng.randint(1, 6))})
+        got = sorted(AhoCorasick(needles).scan(data))
+        want = sorted((i, k) for k, n in enumerate(needles) for i in _brute(data, list(n)))
+        assert got == want
+
+def test_wildcard_patterns_match_brute_force():
+    rng = random.Random(11)
+    for _ in range(50):
+        data = bytes(rng.choice(b"\x00\x01\x02") for _ in range(rng.randint(0, 200)))
+        specs = []
+        for k in range(rng.randint(1, 4)):
+            toks = [rng.choice(["00", "01", "02", "??"]) for _ in range(rng.randint(1, 5))]
+            if all(t == "??" for t in toks): toks[0] = "01"
+            specs.append({"name": f"p{k}", "pattern": " ".join(toks), "replace": "ff"})
+        patches = load_script({"patches": specs})
+        found = _find_all(patches, data)
+        for i, p in enumerate(patches):
+            assert found[i] == _brute(data, p.pattern)
+
+def test_apply_writes_only_the_patched_bytes(tmp_path):
+    src, dst = tmp_path / "a.bin", tmp_path / "b.bin"
+    data = bytearray(os.urandom(5000))
+    data[100:105] = b"Hello"
+    data[3000:3004] = b"\x74\x05\x48\x8b"
+    src.write_bytes(bytes(data))
+    report = apply_script({"patches": [
+        {"name": "greeting", "string": "Hello", "replace_string": "HACKD", "limit": 1},
+        {"name": "jump", "pattern": "74 ?? 48 8b", "replace": "eb", "expect": 1},
+    ]}, str(src), str(dst))
+    out = dst.read_bytes()
+    want = bytearray(data)
+    want[100:105] = b"HACKD"
+    want[3000] = 0xeb
+    assert out == bytes(want)
+    assert [r["offset"] for r in report["regions"]] == [100, 3000]
+
+def test_expect_and_overlap_errors(tmp_path):
+    src = tmp_path / "a.bin"
+    src.write_bytes(b"AAAA")
+    with pytest.raises(PatchError, match="expected 1"):
+        apply_script({"patches": [{"string": "A", "replace_string": "B", "expect": 1}]}, str(src), str(tmp_path / "b"))
+    with pytest.raises(PatchError, match="overlap"):
+        apply_script({"patches": [{"at": 0, "replace": "00 00"}, {"at": 1, "replace": "01"}]}, str(src), str(tmp_path / "b"))
+
+def test_clone_keeps_bytes_and_mode(tmp_path):
+    src, dst = tmp_path / "a", tmp_path / "b"
+    src.write_bytes(os.urandom(70000))
+    os.chmod(src, 0o755)
+    _clone(str(src), str(dst))
+    assert dst.read_bytes() == src.read_bytes()
+    assert os.stat(dst).st_mode & 0o777 == 0o755
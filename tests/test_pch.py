@@ -0,0 +1,40 @@
+from pch import header_prefix, check_preprocessed, format_pch
+
+def test_prefix_stops_at_first_non_include():
+    text = '/* banner\n   text */\n#include <stdio.h>\n\n// note\n#  include "util.h"\n#define N 3\n#include <string.h>\n'
+    assert header_prefix(text) == ["#include <stdio.h>", '#  include "util.h"']
+
+def test_prefix_skips_trailing_block_comment_on_same_line():
+    assert header_prefix('/* a */ #include <stdio.h>\nint x;\n') == ["#include <stdio.h>"]
+    assert header_prefix('#include <stdio.h> /* why */\n') == []  # Comment inside the line: not trusted
+
+def test_prefix_empty_for_code_first():
+    assert header_prefix("int main(void) { return 0; }\n#include <stdio.h>\n") == []
+
+def _write(tmp_path, text):
+    path = tmp_path / "hello.i"
+    path.write_text(text)
+    return str(path)
+
+def test_pch_used_and_guarded(tmp_path):
+    text = '# 0 "hello.c"\n#pragma GCC pch_preprocess "/ws/.pch/k/prefix.h.gch"\n# 1 "hello.c"\n\n# 3 "hello.c"\nint main(void) { return 0; }\n'
+    assert check_preprocessed(_write(tmp_path, text)) == (True, None)
+
+def test_unguarded_header_expanded_again(tmp_path):
+    text = ('# 0 "hello.c"\n#pragma GCC pch_preprocess "/ws/.pch/k/prefix.h.gch"\n# 1 "hello.c"\n'
+            '# 1 "source_code/util.h" 1\nint helper(int);\n# 2 "hello.c" 2\nint main(void) { return 0; }\n')
+    assert check_preprocessed(_write(tmp_path, text)) == (True, "source_code/util.h")
+
+def test_no_pch(tmp_path):
+    assert check_preprocessed(_write(tmp_path, '# 0 "hello.c"\n# 1 "/usr/include/stdio.h" 1\ntypedef int x;\n')) == (False, None)
+
+def _manifest(**costs):
+    return dict({"key": "k", "prefix": ["#include <stdio.h>"], "deps": [], "build_s": 0.04, "uses": 2}, **costs)
+
+def test_report_before_measurement():
+    assert "not measured yet" in format_pch(_manifest(), True)
+
+def test_report_never_negative():
+    text = format_pch(_manifest(parse_s=0.002, load_s=0.003, startup_s=0.007, noise_s=0.0005), False)
+    assert "no measurable saving" in text and "-" not in text.split("\n")[-1]
+    assert "8.0 ms saved per compile" in format_pch(_manifest(parse_s=0.011, load_s=0.003, noise_s=0.0005), False)
@@ -0,0 +1,37 @@
+import time
+import threading
+from pipeline import Pipeline, Stage
+
+def _ok(log):
+    return lambda: (log.append(1), {"success": True, "log": ""})[1]
+
+def test_prerequisites_in_order():
+    p = Pipeline([Stage("a", _ok([])), Stage("b", _ok([]), deps=["a"]), Stage("c", _ok([]), deps=["b", "a"])])
+    assert p.prerequisites("c") == ["a", "b"]
+
+def test_target_returns_without_waiting_for_siblings():
+    gate = threading.Event()
+    def slow():
+        gate.wait(5)
+        return {"success": True}
+    p = Pipeline([Stage("src", _ok([])), Stage("fast", _ok([]), deps=["src"], prefetch=True),
+                  Stage("slow", slow, deps=["src"], prefetch=True)])
+    t0 = time.perf_counter()
+    ran, failed, res = p.run("fast")
+    assert failed is None and time.perf_counter() - t0 < 1
+    assert "slow" in p.prefetching
+    gate.set()
+    ran, failed, res = p.run("slow") # Waits for the running sibling instead of starting again
+    assert failed is None and "slow" in p.cache
+
+def test_uncached_stage_runs_every_time():
+    runs = []
+    p = Pipeline([Stage("src", _ok([])), Stage("exec", _ok(runs), deps=["src"], cache=False)])
+    p.run("exec")
+    p.run("exec")
+    assert len(runs) == 2 and "exec" not in p.cache
+
+def test_failed_prerequisite_is_reported():
+    p = Pipeline([Stage("a", lambda: {"success": False, "error": "boom"}), Stage("b", _ok([]), deps=["a"])])
+    ran, failed, res = p.run("b")
+    assert failed == "a" and res["error"] == "boom"
@@ -0,0 +1,32 @@
+import os
+from search_index import SearchIndex, tokenize
+
+def _index(tmp_path, files):
+    for name, text in files.items(): (tmp_path / name).write_text(text)
+    index = SearchIndex(backend=None)  # Text artifacts only: no tools needed
+    index.refresh(str(tmp_path))
+    return index
+
+def test_tokenize():
+    assert tokenize("movl $0x1, -4(%rbp) # main.L2") == ["movl", "$0x1", "4", "rbp", "main.l2"]
+
+def test_and_query_with_prefix_last_word(tmp_path):
+    index = _index(tmp_path, {"hello.c": "int main(void) {\n    printf(\"hi\");\n    return 0;\n}\n",
+                              "hello.s": "main:\n\tcall\tprintf@PLT\n\tmovl\t$0, %eax\n"})
+    hits = index.search("print")
+    assert {(os.path.basename(h["path"]), h["line"]) for h in hits} == {("hello.c", 1), ("hello.s", 1)}
+    assert [h["view"] for h in index.search("call print")] == ["assembly"]
+    assert index.search("return main") == []  # Words on different lines
+    hit = index.search("return")[0]
+    assert hit["offset"] == len("int main(void) {\n    printf(\"hi\");\n") and hit["text"].strip() == "return 0;"
+
+def test_limit_and_refresh(tmp_path):
+    index = _index(tmp_path, {"a.c": "x;\n" * 10, ".hidden.c": "x;\n"})
+    assert len(index.search("x", limit=3)) == 3
+    assert all(".hidden" not in h["path"] for h in index.search("x"))  # Dotfiles are tool state
+    (tmp_path / "a.c").write_text("y;\n")
+    assert index.refresh(str(tmp_path)) == 1
+    assert index.search("x") == [] and len(index.search("y")) == 1
+    os.remove(tmp_path / "a.c")
+    index.refresh(str(tmp_path))
+    assert index.search("y") == []
@@ -0,0 +1,52 @@
+import json
+from timing import parse_time_report, parse_time_trace, group_totals, record_run, load_history
+
+GCC_NEW = """
+Time variable                                   usr           sys          wall           GGC
+ phase setup                        :   0.00 (  0%)   0.00 (  0%)   0.01 (  5%)  1326k ( 53%)
+ phase parsing                      :   0.02 (100%)   0.01 (100%)   0.03 ( 95%)  1165k ( 47%)
+ preprocessing                      :   0.01 ( 50%)   0.01 (100%)   0.02 ( 60%)   428k ( 17%)
+ tree SSA incremental               :   0.01 ( 50%)   0.00 (  0%)   0.01 ( 30%)  1.2M ( 10%)
+ TOTAL                              :   0.02          0.01          0.04         2495k
+"""
+
+GCC_OLD = """Execution times (seconds)
+Time variable                                   usr           sys          wall           GGC
+ phase parsing           :   0.01 (50%) usr   0.00 ( 0%) sys   0.02 (40%) wall    1326 kB (78%) ggc
+ TOTAL                   :   0.02             0.00             0.05               1700 kB
+"""
+
+def test_gcc_report_rows_and_units():
+    rep = parse_time_report(GCC_NEW)
+    names = [r["name"] for r in rep["rows"]]
+    assert names == ["phase setup", "phase parsing", "preprocessing", "tree SSA incremental"]
+    assert rep["rows"][2] == {"name": "preprocessing", "group": "Frontend", "usr": 0.01, "sys": 0.01, "wall": 0.02, "mem_kb": 428.0}
+    assert rep["rows"][3]["group"] == "Optimizer" and rep["rows"][3]["mem_kb"] == 1228.8
+    assert rep["total"]["wall"] == 0.04 and rep["total"]["mem_kb"] == 2495.0
+
+def test_old_gcc_format():
+    rep = parse_time_report(GCC_OLD)
+    assert rep["rows"][0]["group"] == "Phase" and rep["rows"][0]["wall"] == 0.02 and rep["rows"][0]["mem_kb"] == 1326.0
+    assert rep["total"]["wall"] == 0.05
+
+def test_group_totals_skip_phases():
+    totals = group_totals(parse_time_report(GCC_NEW))
+    assert set(totals) == {"Frontend", "Optimizer"} and totals["Frontend"]["wall"] == 0.02
+
+def test_clang_trace(tmp_path):
+    path = tmp_path / "t.json"
+    path.write_text(json.dumps({"traceEvents": [
+        {"ph": "X", "name": "Total ExecuteCompiler", "dur": 40000},
+        {"ph": "X", "name": "Total Frontend", "dur": 30000},
+        {"ph": "X", "name": "Total Source", "dur": 12000},
+        {"ph": "X", "name": "Source", "dur": 5000},
+    ]}))
+    rep = parse_time_trace(str(path))
+    assert rep["total"]["wall"] == 0.04
+    assert [(r["name"], r["group"], r["wall"]) for r in rep["rows"]] == [("Frontend", "Phase", 0.03), ("Source", "Frontend", 0.012)]
+
+def test_history_keeps_previous_run(tmp_path):
+    artifact = str(tmp_path / "hello.s")
+    assert record_run(artifact, {"gcc": parse_time_report(GCC_NEW)}, "h1") is None
+    prev = record_run(artifact, {"gcc": parse_time_report(GCC_OLD)}, "h2")
+    assert prev["source_hash"] == "h1" and len(load_history(artifact)) == 2
@@ -0,0 +1,40 @@
+import math
+import struct
+import numpy as np
+from triage import window_entropy, high_entropy_regions, class_sections, detect_format
+
+def _brute_entropy(data):
+    counts = [data.count(b) for b in set(data)]
+    return -sum(c / len(data) * math.log2(c / len(data)) for c in counts)
+
+def test_window_entropy_matches_brute_force():
+    rng = np.random.default_rng(5)
+    data = np.concatenate((rng.integers(0, 4, 3000), rng.integers(0, 256, 5000))).astype(np.uint8)
+    ent = window_entropy(data, window=1024, step=256, blocks_per_chunk=3)  # Small chunks exercise the carry
+    want = [_brute_entropy(bytes(data[i:i + 1024])) for i in range(0, len(data) - 1024 + 1, 256)]
+    assert np.allclose(ent, want)
+
+def test_short_and_empty_input():
+    assert window_entropy(np.zeros(0, dtype=np.uint8)).size == 0
+    assert np.allclose(window_entropy(np.frombuffer(b"abab", dtype=np.uint8)), [1.0])
+
+def test_high_entropy_regions():
+    ent = np.array([1.0, 7.5, 7.9, 2.0, 7.3])
+    assert high_entropy_regions(ent, step=512, window=2048, threshold=7.2) == [(512, 3072, 7.9), (2048, 4096, 7.3)]
+
+def _class_file():
+    pool = b"\x01\x00\x03abc" + b"\x07\x00\x01" + b"\x05" + bytes(8)  # utf8, class, long (two slots)
+    method = struct.pack(">HHHH", 9, 1, 1, 1) + struct.pack(">HI", 1, 6) + bytes(6)  # One 6-byte attribute
+    return (b"\xca\xfe\xba\xbe" + struct.pack(">HHH", 0, 52, 5) + pool + struct.pack(">HHHH", 0x21, 2, 2, 0)
+            + struct.pack(">H", 0) + struct.pack(">H", 1) + method + struct.pack(">H", 0))
+
+def test_class_sections_cover_the_file(tmp_path):
+    path = tmp_path / "A.class"
+    data = _class_file()
+    path.write_bytes(data)
+    secs = class_sections(str(path))
+    assert [s["name"] for s in secs] == ["header", "constant_pool", "class_info", "fields", "methods", "attributes"]
+    assert secs[1] == {"name": "constant_pool", "size": 6 + 3 + 9, "offset": 10, "contents": True}
+    assert all(a["offset"] + a["size"] == b["offset"] for a, b in zip(secs, secs[1:]))
+    assert secs[-1]["offset"] + secs[-1]["size"] == len(data)
+    assert detect_format(str(path)) == "class"
@@ -0,0 +1,143 @@
+import os
+import re
+import json
+import time
+
+# Compiler phase timing: parses gcc -ftime-report and clang -ftime-trace output into
+# rows of {"name", "group", "usr", "sys", "wall", "mem_kb"} (seconds / KB).
+# Runs are kept next to the assembly (hello.s.timing.json) so builds can be compared.
+
+HISTORY = 10  # Runs kept per artifact
+
+# gcc >= 10: " phase parsing   :   0.01 ( 50%)   0.00 (  0%)   0.02 ( 40%)  1326k ( 78%)"
+# gcc <  10: " phase parsing   :   0.01 (50%) usr   0.00 ( 0%) sys   0.02 (40%) wall    1326 kB (78%) ggc"
+_ROW_RE = re.compile(r"^\s*(.+?)\s+:\s+(.*)$")
+_VAL_RE = re.compile(r"(\d+(?:\.\d+)?)\s*([kMG]B?)?\s*(?:\(\s*\d+%\))?")
+
+# Time-variable name prefixes -> compiler part
+_GROUPS = (
+    ("Frontend", ("preprocessing", "lexical", "parser", "name lookup", "template", "overload", "constant expression", "c++ ")),
+    ("RTL", ("expand", "rtl", "cse", "combiner", "register", "integrated ra", "lra", "reload", "scheduling", "if-conversion",
+             "peephole", "jump", "forward prop", "dead store", "loop init", "shorten branches", "machine dep")),
+    ("Codegen", ("final", "symout", "variable output", "assembl", "initialize rtl")),
+    ("Optimizer", ("tree ", "ipa ", "early inlining", "inline", "alias", "callgraph", "cfg", "dominance", "ssa", "out of ssa", "into ssa", "dead code",
+                   "loop", "vector", "pure const", "df ")),
+)
+
+def _group(name):
+    low = name.lower()
+    if low.startswith("phase "): return "Phase"
+    if low == "total": return "Total"
+    for group, prefixes in _GROUPS:
+        if low.startswith(prefixes): return group
+    return "Other"
+
+def _mem_kb(value, unit):
+    unit = (unit or "").upper()
+    if unit.startswith("M"): return value * 1024
+    if unit.startswith("G"): return value * 1024 * 1024
+    if unit.startswith("K"): return value
+    return value / 1024  # Bare byte counts
+
+def parse_time_report(text):
+    # -> {"rows": [...], "total": row or None}
+    rows, total = [], None
+    in_table = False
+    for line in text.splitlines():
+        if line.startswith("Time variable"):
+            in_table = True
+            continue
+        m = _ROW_RE.match(line) if in_table else None
+        if not m: continue
+        vals = [(float(v), u) for v, u in _VAL_RE.findall(m.group(2))]
+        if len(vals) < 3: continue
+        name = m.group(1).strip()
+        row = {"name": name, "group": _group(name), "usr": vals[0][0], "sys": vals[1][0], "wall": vals[2][0],
+               "mem_kb": round(_mem_kb(*vals[3]), 1) if len(vals) > 3 else 0.0}
+        if row["group"] == "Total": total = row
+        else: rows.append(row)
+    return {"rows": rows, "total": total}
+
+def parse_time_trace(path):
+    # clang -ftime-trace JSON: "Total <name>" events hold the aggregated durations (us)
+    with open(path, "r") as f: data = json.load(f)
+    rows, total = [], None
+    for ev in data.get("traceEvents", []):
+        name = ev.get("name", "")
+        if ev.get("ph") != "X" or not name.startswith("Total "): continue
+        name = name[len("Total "):]
+        group = {"Frontend": "Phase", "Backend": "Phase", "ExecuteCompiler": "Total"}.get(name) or _clang_group(name)
+        row = {"name": name, "group": group, "usr": 0.0, "sys": 0.0,
+               "wall": round(ev.get("dur", 0) / 1e6, 6), "mem_kb": 0.0}
+        if group == "Total": total = row
+        else: rows.append(row)
+    rows.sort(key=lambda r: -r["wall"])
+    return {"rows": rows, "total": total}
+
+def _clang_group(name):
+    if name.startswith(("Source", "Parse", "Instantiate", "PerformPendingInstantiations", "CodeGen Function", "Lex")): return "Frontend"
+    if name.startswith(("Optimize", "OptFunction", "OptModule", "RunPass", "RunLoopPass", "ModuleInlinerWrapperPass")) or name.endswith("Pass"): return "Optimizer"
+    if name.startswith(("CodeGenPasses", "Machine", "Emit")): return "Codegen"
+    return "Other"
+
+
+def group_totals(report):
+    # Wall/usr/mem summed per group (phase rows excluded; they overlap the passes)
+    totals = {}
+    for r in report["rows"]:
+        if r["group"] == "Phase": continue
+        t = totals.setdefault(r["group"], {"usr": 0.0, "sys": 0.0, "wall": 0.0, "mem_kb": 0.0})
+        for k in t: t[k] += r[k]
+    return totals
+
+
+# --- Storage ---
+def timing_path(artifact):
+    return artifact + ".timing.json"
+
+def load_history(artifact):
+    try:
+        with open(timing_path(artifact), "r") as f: return json.load(f).get("runs", [])
+    except (OSError, ValueError):
+        return []
+
+def record_run(artifact, reports, source_hash=None, flags=""):
+    # Appends this run; returns the previous one (or None) for comparison
+    runs = load_history(artifact)
+    previous = runs[-1] if runs else None
+    runs.append({"time": time.strftime("%Y-%m-%d %H:%M:%S"), "source_hash": source_hash, "flags": flags, "reports": reports})
+    tmp = timing_path(artifact) + ".tmp"
+    with open(tmp, "w") as f: json.dump({"runs": runs[-HISTORY:]}, f)
+    os.replace(tmp, timing_path(artifact))
+    return previous
+
+
+# --- Display ---
+def format_timing(reports, previous=None, limit=25):
+    # reports: {"gcc": report, "clang": report}; previous: a stored run
+    lines = []
+    for tool, rep in reports.items():
+        prev = {r["name"]: r for r in (previous or {}).get("reports", {}).get(tool, {}).get("rows", [])}
+        tot = rep["total"]
+        lines.append(f"== {tool} ==" + (f"  total wall {tot['wall']:.3f}s, mem {tot['mem_kb']:.0f}k" if tot else ""))
+        if previous and tot and previous.get("reports", {}).get(tool, {}).get("total"):
+            was = previous["reports"][tool]["total"]["wall"]
+            lines.append(f"   vs previous run ({previous['time']}): {was:.3f}s -> {tot['wall']:.3f}s ({tot['wall'] - was:+.3f}s)")
+
+        lines.append(f"{'Phase / pass':<34} {'usr':>7} {'sys':>7} {'wall':>7} {'mem(k)':>8} {'delta':>8}")
+        phases = [r for r in rep["rows"] if r["group"] == "Phase"]
+        passes = sorted((r for r in rep["rows"] if r["group"] != "Phase"), key=lambda r: -r["wall"])
+        for r in phases + [None] + passes[:limit]:
+            if r is None:
+                lines.append("-" * 78)
+                continue
+            delta = f"{r['wall'] - prev[r['name']]['wall']:+.3f}" if r["name"] in prev else ""
+            label = r["name"] if r["group"] == "Phase" else f"[{r['group'][:5]}] {r['name']}"
+            lines.append(f"{label[:34]:<34} {r['usr']:>7.3f} {r['sys']:>7.3f} {r['wall']:>7.3f} {r['mem_kb']:>8.0f} {delta:>8}")
+        if len(passes) > limit: lines.append(f"... {len(passes) - limit} more pass(es)")
+
+        lines.append("By part:")
+        for group, t in sorted(group_totals(rep).items(), key=lambda kv: -kv[1]["wall"]):
+            lines.append(f"  {group:<12} wall {t['wall']:.3f}s  usr {t['usr']:.3f}s  mem {t['mem_kb']:.0f}k")
+        lines.append("")
+    return "\n".join(lines)
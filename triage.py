@@ -0,0 +1,239 @@
+import os
+import sys
+import json
+import time
+import heapq
+import struct
+import hashlib
+import argparse
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from backend import CompilerBackend
+from bindiff import SectionMap
+
+# Headless triage of a whole folder of binaries: strings, section sizes and
+# sliding-window entropy per file, streamed to a JSON-lines report.
+#   python triage.py <dir> -o report.jsonl [-j N]
+
+MAGICS = {b"\x7fELF": "elf", b"MZ": "pe", b"\xca\xfe\xba\xbe": "class",
+          b"\xcf\xfa\xed\xfe": "macho", b"\xfe\xed\xfa\xcf": "macho"}
+WINDOW = 2048           # Entropy window (bytes)
+STEP = 512              # Window stride (bytes)
+PACKED_ENTROPY = 7.2    # bits/byte; compressed or encrypted data sits close to 8
+SAMPLE_STRINGS = 50     # Strings kept per file in the report (all are counted)
+
+def detect_format(path):
+    with open(path, "rb") as f: head = f.read(4)
+    for magic, fmt in MAGICS.items():
+        if head.startswith(magic): return fmt
+    return None
+
+
+# --- Entropy ---
+def window_entropy(data, window=WINDOW, step=STEP, blocks_per_chunk=8192):
+    # Shannon entropy (bits/byte) of every window, advancing by step.
+    # Per-block byte histograms come from one bincount per chunk; a window is a
+    # difference of cumulative block histograms, so there is no per-byte Python work.
+    k = max(window // step, 1)
+    window = k * step
+    n_blocks = len(data) // step
+    if n_blocks < k:
+        return np.array([_entropy(np.bincount(data, minlength=256)[None, :])[0]]) if len(data) else np.zeros(0)
+
+    out = []
+    carry = np.zeros((0, 256), dtype=np.int64)  # Last k-1 block histograms of the previous chunk
+    for b0 in range(0, n_blocks, blocks_per_chunk):
+        b1 = min(b0 + blocks_per_chunk, n_blocks)
+        chunk = np.asarray(data[b0 * step:b1 * step])
+        keys = np.repeat(np.arange(b1 - b0, dtype=np.int64) * 256, step) + chunk
+        hist = np.concatenate((carry, np.bincount(keys, minlength=(b1 - b0) * 256).reshape(-1, 256)))
+        if len(hist) >= k:
+            cs = np.concatenate((np.zeros((1, 256), dtype=np.int64), np.cumsum(hist, axis=0)))
+            out.append(_entropy(cs[k:] - cs[:-k]))
+        carry = hist[-(k - 1):] if k > 1 else hist[:0]
+    return np.concatenate(out)
+
+def _entropy(counts):
+    p = counts / counts.sum(axis=1, keepdims=True)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return -np.where(p > 0, p * np.log2(p), 0.0).sum(axis=1)
+
+def high_entropy_regions(ent, step=STEP, window=WINDOW, threshold=PACKED_ENTROPY):
+    # Consecutive windows over threshold -> [(start, end, peak)] byte ranges
+    hot = np.flatnonzero(ent >= threshold)
+    if not len(hot): return []
+    breaks = np.flatnonzero(np.diff(hot) > 1)
+    firsts = hot[np.concatenate(([0], breaks + 1))]
+    lasts = hot[np.concatenate((breaks, [len(hot) - 1]))]
+    return [(int(a) * step, int(b) * step + window, float(ent[a:b + 1].max())) for a, b in zip(firsts, lasts)]
+
+
+# --- Sections ---
+def class_sections(path):
+    # Class file layout as pseudo-sections (same shape as backend.section_table rows)
+    with open(path, "rb") as f: data = f.read()
+    pos = 10
+    sections = [{"name": "header", "size": 10, "offset": 0}]
+
+    count = struct.unpack_from(">H", data, 8)[0]
+    i = 1
+    while i < count:
+        tag = data[pos]
+        if tag == 1: pos += 3 + struct.unpack_from(">H", data, pos + 1)[0]
+        elif tag in (5, 6): pos += 9; i += 1  # long/double take two slots
+        elif tag in (3, 4, 9, 10, 11, 12, 17, 18): pos += 5
+        elif tag in (7, 8, 16, 19, 20): pos += 3
+        elif tag == 15: pos += 4
+        else: raise ValueError(f"Bad constant pool tag {tag} at {pos:#x}")
+        i += 1
+    sections.append({"name": "constant_pool", "size": pos - 10, "offset": 10})
+
+    start = pos
+    pos += 6
+    pos += 2 + 2 * struct.unpack_from(">H", data, pos)[0]
+    sections.append({"name": "class_info", "size": pos - start, "offset": start})
+
+    def members(pos):
+        n = struct.unpack_from(">H", data, pos)[0]
+        pos += 2
+        for _ in range(n): pos = attributes(pos + 6)
+        return pos
+
+    def attributes(pos):
+        n = struct.unpack_from(">H", data, pos)[0]
+        pos += 2
+        for _ in range(n): pos += 6 + struct.unpack_from(">I", data, pos + 2)[0]
+        return pos
+
+    for name, walk in (("fields", members), ("methods", members), ("attributes", attributes)):
+        start, pos = pos, walk(pos)
+        sections.append({"name": name, "size": pos - start, "offset": start})
+    for s in sections: s["contents"] = True
+    return sections
+
+
+# --- Per-file worker ---
+_backend = None
+
+def triage_file(path):
+    global _backend
+    if _backend is None: _backend = CompilerBackend()  # One per worker process
+    try:
+        fmt = detect_format(path)
+        size = os.path.getsize(path)
+        rec = {"file": path, "format": fmt, "size": size}
+
+        h = hashlib.sha1()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""): h.update(chunk)
+        rec["sha1"] = h.hexdigest()
+
+        sections = class_sections(path) if fmt == "class" else _backend.section_table(path)
+        rec["sections"] = [{"name": s["name"], "offset": s["offset"], "size": s["size"]} for s in sections if s["contents"]]
+
+        # Same strings as the Recon step (printable ASCII runs of 4+)
+        count, sample = 0, []
+        for off, text in _backend.iter_strings(path):
+            count += 1
+            if len(sample) < SAMPLE_STRINGS: sample.append([off, text])
+        rec["strings"] = {"count": count, "sample": sample}
+
+        data = np.memmap(path, dtype=np.uint8, mode="r") if size else np.zeros(0, dtype=np.uint8)
+        ent = window_entropy(data)
+        smap = SectionMap(sections)
+        regions = [{"start": a, "end": min(b, size), "max": round(m, 3), "section": smap.lookup(a)}
+                   for a, b, m in high_entropy_regions(ent)]
+        rec["entropy"] = {"mean": round(float(ent.mean()), 3) if len(ent) else 0.0,
+                          "max": round(float(ent.max()), 3) if len(ent) else 0.0,
+                          "window": WINDOW, "step": STEP, "high": regions}
+        # Flag when a quarter or more of the file looks compressed/encrypted
+        rec["packed"] = sum(r["end"] - r["start"] for r in regions) >= size / 4 if size else False
+        return rec
+    except Exception as e:
+        return {"file": path, "error": str(e)}
+
+
+# --- Driver ---
+def iter_binaries(root):
+    # Lazily walks root; yields paths whose magic bytes look like a binary
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames.sort()
+        for name in sorted(filenames):
+            path = os.path.join(dirpath, name)
+            try:
+                if os.path.isfile(path) and detect_format(path): yield path
+            except OSError:
+                continue
+
+def triage_dir(root, workers=None, max_pending=None):
+    # Yields one record per binary as soon as it is done. At most max_pending files
+    # are in flight, so memory stays flat however many files the corpus holds.
+    workers = workers or os.cpu_count() or 1
+    max_pending = max_pending or workers * 4
+    paths = iter_binaries(root)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = set()
+        exhausted = False
+        while pending or not exhausted:
+            while not exhausted and len(pending) < max_pending:
+                path = next(paths, None)
+                if path is None: exhausted = True
+                else: pending.add(pool.submit(triage_file, path))
+            if not pending: break
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for fut in done: yield fut.result()
+
+
+class Summary:
+    # Running totals only; per-file records are never kept
+    def __init__(self, top=10):
+        self.files = self.errors = self.packed = self.bytes = self.strings = 0
+        self.formats = {}
+        self.top = top
+        self.hottest = []  # Min-heap of (mean entropy, file)
+
+    def add(self, rec):
+        self.files += 1
+        if "error" in rec:
+            self.errors += 1
+            return
+        self.bytes += rec["size"]
+        self.strings += rec["strings"]["count"]
+        self.formats[rec["format"]] = self.formats.get(rec["format"], 0) + 1
+        if rec["packed"]: self.packed += 1
+        item = (rec["entropy"]["mean"], rec["file"])
+        if len(self.hottest) < self.top: heapq.heappush(self.hottest, item)
+        else: heapq.heappushpop(self.hottest, item)
+
+    def to_dict(self, elapsed):
+        return {"files": self.files, "errors": self.errors, "packed": self.packed, "bytes": self.bytes,
+                "strings": self.strings, "formats": self.formats, "seconds": round(elapsed, 2),
+                "highest_entropy": [{"file": f, "mean": e} for e, f in sorted(self.hottest, reverse=True)]}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Triage a directory of executables and .class files.")
+    parser.add_argument("directory")
+    parser.add_argument("-o", "--output", default="triage.jsonl", help="JSON-lines report (one record per file + a summary line)")
+    parser.add_argument("-j", "--jobs", type=int, default=None, help="Worker processes")
+    args = parser.parse_args(argv)
+
+    start = time.time()
+    summary = Summary()
+    with open(args.output, "w") as out:
+        for rec in triage_dir(args.directory, args.jobs):
+            out.write(json.dumps(rec) + "\n")
+            out.flush()
+            summary.add(rec)
+            if "error" in rec: print(f"[FAIL] {rec['file']}: {rec['error']}")
+            else: print(f"[OK]   {rec['file']}: {rec['format']}, {rec['size']} bytes, entropy {rec['entropy']['mean']:.2f}"
+                        f"{' (packed?)' if rec['packed'] else ''}")
+        result = summary.to_dict(time.time() - start)
+        out.write(json.dumps({"summary": result}) + "\n")
+
+    print(f"\n{result['files']} file(s), {result['errors']} error(s), {result['packed']} likely packed, "
+          f"{result['seconds']}s -> {args.output}")
+    return 1 if result["errors"] else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,10 +1,45 @@
+import copy
 import customtkinter as ctk
 import tkinter as tk
 from pygments import lex
 from pygments.lexers import CLexer, GasLexer
 
+# Token colours for the code panes
+HIGHLIGHT_TAGS = {
+    "Token.Keyword": "#ffb86c",
+    "Token.Keyword.Type": "#8be9fd",
+    "Token.Name.Function": "#50fa7b",
+    "Token.Literal.String": "#f1fa8c",
+    "Token.Comment": "#6272a4",
+    "Token.Operator": "#ff79c6",
+    "Token.Punctuation": "#f8f8f2",
+    "Token.Number": "#bd93f9",
+}
+
+def highlight_runs(code, lexer):
+    # Lex once into [[tag, length], ...] runs (tag None = plain text).
+    # Pure data, so it can be computed off the UI thread and stored in a session.
+    # The lexer must not strip or add newlines: the runs slice the original text.
+    lexer = copy.copy(lexer)
+    lexer.stripnl = lexer.ensurenl = lexer.stripall = False
+    runs = []
+    for token_type, value in lex(code, lexer):
+        tag = str(token_type)
+        # Simple fallback tagging
+        while tag and tag not in HIGHLIGHT_TAGS:
+            if "." in tag: tag = tag.rsplit(".", 1)[0]
+            else: tag = None
+        if runs and runs[-1][0] == tag: runs[-1][1] += len(value)
+        else: runs.append([tag, len(value)])
+    if not runs_fit(runs, code): return [[None, len(code)]] if code else []  # Never cut or pad the text
+    return runs
+
+def runs_fit(runs, code):
+    # Runs are only usable on the exact text they were computed for
+    return sum(length for _, length in runs) == len(code)
+
 class Sidebar(ctk.CTkFrame):
-    def __init__(self, master, step_callback, save_callback, break_callback, reset_callback, lang_callback):
+    def __init__(self, master, step_callback, save_callback, break_callback, reset_callback, lang_callback, jump_callback=None, live_callback=None, timing_callback=None, bench_callback=None, link_callback=None):
         super().__init__(master, width=204, corner_radius=0)
         self.grid(row=0, column=0, rowspan=4, sticky="nsew")
         self.grid_rowconfigure(20, weight=1)
@@ -21,10 +56,12 @@ class Sidebar(ctk.CTkFrame):
         self.header_comp = ctk.CTkLabel(self, text="COMPILATION", font=ctk.CTkFont(size=12, weight="bold"), text_color="gray70")
         self.header_comp.grid(row=2, column=0, padx=10, pady=(10, 0), sticky="w")
 
-        # Dynamic Buttons (Pool of 12 max buttons)
+        # Dynamic Buttons (Pool of 12 max buttons). Clickable when a jump callback is given
         self.buttons = []
         for i in range(12):
-            btn = ctk.CTkButton(self, text=f"Step {i}", fg_color="transparent", border_width=1, anchor="w", state="disabled")
+            btn = ctk.CTkButton(self, text=f"Step {i}", fg_color="transparent", border_width=1, anchor="w",
+                                state="normal" if jump_callback else "disabled",
+                                command=(lambda i=i: jump_callback(i)) if jump_callback else None)
             self.buttons.append(btn)
         
         # RE Header (Position varies)
@@ -36,6 +73,18 @@ class Sidebar(ctk.CTkFrame):
         self.btn_break = ctk.CTkButton(self, text="BREAK IT! (Error)", command=break_callback, fg_color="#C62828", hover_color="#B71C1C")
         self.btn_restore = ctk.CTkButton(self, text="RESTORE CODE", command=reset_callback, fg_color="#0288D1", hover_color="#0277BD") # Using reset_callback for now (acts as restore)
         self.btn_reset = ctk.CTkButton(self, text="RESET SIM", command=reset_callback, fg_color="transparent", border_width=1, text_color="silver")
+        self.live_var = ctk.BooleanVar(value=False)
+        self.sw_live = ctk.CTkSwitch(self, text="Live Check", variable=self.live_var,
+                                     command=(lambda: live_callback(self.live_var.get())) if live_callback else None)
+        self.timing_var = ctk.BooleanVar(value=False)
+        self.sw_timing = ctk.CTkSwitch(self, text="Phase Timing", variable=self.timing_var,
+                                       command=(lambda: timing_callback(self.timing_var.get())) if timing_callback else None)
+        self.bench_var = ctk.BooleanVar(value=False)
+        self.sw_bench = ctk.CTkSwitch(self, text="Benchmark Run", variable=self.bench_var,
+                                      command=(lambda: bench_callback(self.bench_var.get())) if bench_callback else None)
+        self.link_var = ctk.BooleanVar(value=False)
+        self.sw_link = ctk.CTkSwitch(self, text="Link Analysis", variable=self.link_var,
+                                     command=(lambda: link_callback(self.link_var.get())) if link_callback else None)
 
         # Initial Grid for controls (Fixed at bottom logic handled by refresh)
         self.current_lang = "C"
@@ -77,6 +126,15 @@ class Sidebar(ctk.CTkFrame):
         self.btn_break.grid(row=current_row + 3, column=0, padx=20, pady=5)
         self.btn_restore.grid(row=current_row + 4, column=0, padx=20, pady=5)
         self.btn_reset.grid(row=current_row + 5, column=0, padx=20, pady=20)
+        self.sw_live.grid(row=current_row + 6, column=0, padx=20, pady=5)
+        self.sw_bench.grid(row=current_row + 8, column=0, padx=20, pady=5)
+        # C-only options
+        if language == "C":
+            self.sw_timing.grid(row=current_row + 7, column=0, padx=20, pady=5)
+            self.sw_link.grid(row=current_row + 9, column=0, padx=20, pady=5)
+        else:
+            self.sw_timing.grid_forget()
+            self.sw_link.grid_forget()
     
     def highlight(self, index):
         for i, btn in enumerate(self.buttons):
@@ -120,7 +178,7 @@ class Console(ctk.CTkFrame):
 
 
 class EditorArea(ctk.CTkFrame):
-    def __init__(self, master):
+    def __init__(self, master, search_callback=None):
         super().__init__(master, corner_radius=0)
         # self.grid(row=0, column=1, sticky="nsew", padx=10, pady=10) # Handled by PanedWindow
         self.grid_rowconfigure(1, weight=1)
@@ -130,6 +188,12 @@ class EditorArea(ctk.CTkFrame):
         self.header = ctk.CTkLabel(self, text="Welcome", font=ctk.CTkFont(size=24, weight="bold"))
         self.header.grid(row=0, column=0, pady=(10, 5), sticky="w", padx=20)
 
+        # Global Search (all artifacts). Enter = search / jump to next hit
+        self.search_entry = ctk.CTkEntry(self, width=280, placeholder_text="Search artifacts (Enter)")
+        self.search_entry.grid(row=0, column=0, pady=(10, 5), sticky="e", padx=20)
+        if search_callback:
+            self.search_entry.bind("<Return>", lambda e: search_callback(self.search_entry.get()))
+
         # Paned Window
         self.paned = tk.PanedWindow(self, orient=tk.VERTICAL, sashwidth=6, bg="#2b2b2b", sashrelief="flat")
         self.paned.grid(row=1, column=0, sticky="nsew", padx=10, pady=(0, 10))
@@ -174,35 +238,68 @@ class EditorArea(ctk.CTkFrame):
 
     def _setup_highlighting_tags(self):
         for tb in [self.txt_left._textbox, self.txt_right._textbox]:
-            tb.tag_config("Token.Keyword", foreground="#ffb86c")        
-            tb.tag_config("Token.Keyword.Type", foreground="#8be9fd")   
-            tb.tag_config("Token.Name.Function", foreground="#50fa7b")  
-            tb.tag_config("Token.Literal.String", foreground="#f1fa8c") 
-            tb.tag_config("Token.Comment", foreground="#6272a4")        
-            tb.tag_config("Token.Operator", foreground="#ff79c6")       
-            tb.tag_config("Token.Punctuation", foreground="#f8f8f2")    
-            tb.tag_config("Token.Number", foreground="#bd93f9")         
-
-    def apply_highlighting(self, ctk_textbox, code, lexer):
+            for tag, color in HIGHLIGHT_TAGS.items():
+                tb.tag_config(tag, foreground=color)
+            tb.tag_config("search_hit", background="#44475a")
+            tb.tag_config("diag_error", underline=True, foreground="#ff5555")
+            tb.tag_config("diag_warning", underline=True, foreground="#f1fa8c")
+            tb.tag_config("diff_byte", background="#6d2a35", foreground="#ffffff")
+            tb.tag_config("map_hit", background="#264f78")
+        self.expl_box._textbox.tag_config("search_hit", background="#44475a") # Search hit list
+
+    def apply_highlighting(self, ctk_textbox, code, lexer, runs=None):
         ctk_textbox.configure(state="normal")
         ctk_textbox.delete("0.0", "end")
-        if not lexer:
+        if runs is not None and not runs_fit(runs, code): runs = None  # Stale runs (older session)
+        if runs is None and lexer: runs = highlight_runs(code, lexer)
+        if not runs:
             ctk_textbox.insert("0.0", code)
         else:
-            tokens = lex(code, lexer)
-            for token_type, value in tokens:
-                tag = str(token_type)
-                # Simple fallback tagging
-                while tag and not ctk_textbox._textbox.tag_names().__contains__(tag):
-                    if "." in tag: tag = tag.rsplit(".", 1)[0]
-                    else: tag = None
-                ctk_textbox.insert("end", value, tag if tag else ())
+            pos = 0
+            for tag, length in runs:
+                ctk_textbox.insert("end", code[pos:pos + length], tag if tag else ())
+                pos += length
         ctk_textbox.configure(state="disabled")
 
-    def set_content(self, left_text, right_text, left_title="Input", right_title="Output", left_lexer=None, right_lexer=None, left_editable=False):
+    def set_content(self, left_text, right_text, left_title="Input", right_title="Output", left_lexer=None, right_lexer=None, left_editable=False, left_runs=None, right_runs=None, left_marks=None, right_marks=None):
         self.lbl_left.configure(text=left_title)
-        self.apply_highlighting(self.txt_left, left_text, left_lexer)
+        self.apply_highlighting(self.txt_left, left_text, left_lexer, left_runs)
+        if left_marks: self.mark_spans(self.txt_left, left_marks)
         if left_editable: self.txt_left.configure(state="normal")
         
         self.lbl_right.configure(text=right_title)
-        self.apply_highlighting(self.txt_right, right_text, right_lexer)
+        self.apply_highlighting(self.txt_right, right_text, right_lexer, right_runs)
+        if right_marks: self.mark_spans(self.txt_right, right_marks)
+
+    def mark_spans(self, ctk_textbox, marks, tag="diff_byte"):
+        # marks: [line, col_start, col_end] with 0-based lines (e.g. changed bytes in a hex view)
+        tb = ctk_textbox._textbox
+        tb.tag_remove(tag, "1.0", "end")
+        for line, c0, c1 in marks:
+            tb.tag_add(tag, f"{line + 1}.{c0}", f"{line + 1}.{c1}")
+
+    def highlight_line(self, ctk_textbox, line_no, tag="search_hit"):
+        # line_no is 0-based; Tk text indices are 1-based
+        tb = ctk_textbox._textbox
+        tb.tag_remove(tag, "1.0", "end")
+        tb.tag_add(tag, f"{line_no + 1}.0", f"{line_no + 1}.end")
+        tb.see(f"{line_no + 1}.0")
+
+    def highlight_lines(self, ctk_textbox, line_nos, tag="map_hit"):
+        # Several 0-based lines at once (source <-> disassembly mapping)
+        tb = ctk_textbox._textbox
+        tb.tag_remove(tag, "1.0", "end")
+        for n in line_nos:
+            tb.tag_add(tag, f"{n + 1}.0", f"{n + 1}.end")
+        if line_nos: tb.see(f"{min(line_nos) + 1}.0")
+
+    def mark_diagnostics(self, diags):
+        # Underline diagnostic ranges in the source editor (line/col are 1-based)
+        tb = self.txt_left._textbox
+        tb.tag_remove("diag_error", "1.0", "end")
+        tb.tag_remove("diag_warning", "1.0", "end")
+        for d in diags:
+            if d["line"] is None: continue  # Not in this file (e.g. an included header)
+            tag = "diag_error" if d["kind"] == "error" else "diag_warning"
+            end_col = max(d["end_col"], d["col"] + 1)
+            tb.tag_add(tag, f"{d['line']}.{d['col'] - 1}", f"{d['line']}.{end_col - 1}")